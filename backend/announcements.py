@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the expiry scheduler sleeps, so announcements
+# created by other workers are still expired on time.
+ANNOUNCEMENT_EXPIRY_POLL_SECONDS = float(os.environ.get('ANNOUNCEMENT_EXPIRY_POLL_SECONDS', '300'))
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def parse_expiry(value) -> Optional[datetime]:
+    """Parse an ``expires_at`` value from the admin form ("2025-06-30" or a
+    full ISO timestamp) into an aware UTC datetime; blank means no expiry."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    try:
+        return _as_utc(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="expires_at must be an ISO date or datetime")
+
+
+def visible_announcements_query(now: datetime) -> dict:
+    """Active announcements that have not expired yet (index: active_expires_at)."""
+    return {"active": True, "$or": [{"expires_at": None}, {"expires_at": {"$gt": now}}]}
+
+
+async def migrate_announcement_dates(db) -> int:
+    """Convert string created_at/expires_at values left by older releases to
+    BSON dates, so the expiry predicate and index see every row."""
+    migrated = 0
+    cursor = db.announcements.find(
+        {"$or": [{"expires_at": {"$type": "string"}}, {"created_at": {"$type": "string"}}]},
+        {"_id": 1, "created_at": 1, "expires_at": 1},
+    )
+    async for doc in cursor:
+        update = {}
+        for field in ("created_at", "expires_at"):
+            if isinstance(doc.get(field), str):
+                try:
+                    update[field] = parse_expiry(doc[field])
+                except HTTPException:
+                    logger.warning(f"Unparseable announcement {field} {doc[field]!r}; clearing it")
+                    update[field] = None
+        await db.announcements.update_one({"_id": doc["_id"]}, {"$set": update})
+        migrated += 1
+    if migrated:
+        logger.info(f"Migrated dates on {migrated} announcement(s)")
+    return migrated
+
+
+class AnnouncementExpiry:
+    """Deactivates announcements exactly when they expire.
+
+    Sleeps until the earliest upcoming ``expires_at`` (bounded by
+    ANNOUNCEMENT_EXPIRY_POLL_SECONDS), then flips expired rows to inactive
+    with an ``archived_at`` stamp and calls ``on_expired(count, boundary)``
+    so cached responses are dropped at the boundary. ``on_expired`` also
+    runs, with a count of 0, when another worker archived the rows first,
+    since this worker's caches still hold them; ``boundary`` is then the
+    expiry that passed (None when this worker archived rows itself). Admin
+    writes call wake() so a new or edited expiry is picked up immediately.
+    """
+
+    def __init__(self, db, on_expired: Callable[[int, Optional[datetime]], Awaitable[None]],
+                 poll_seconds: float = ANNOUNCEMENT_EXPIRY_POLL_SECONDS):
+        self.db = db
+        self.on_expired = on_expired
+        self.poll_seconds = poll_seconds
+        self.next_expiry: Optional[datetime] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def expire_due(self) -> int:
+        now = datetime.now(timezone.utc)
+        result = await self.db.announcements.update_many(
+            {"active": True, "expires_at": {"$lte": now}},
+            {"$set": {"active": False, "archived_at": now}},
+        )
+        if result.modified_count:
+            logger.info(f"Archived {result.modified_count} expired announcement(s)")
+        if result.modified_count:
+            await self.on_expired(result.modified_count, None)
+        elif self.next_expiry is not None and now >= self.next_expiry:
+            await self.on_expired(0, self.next_expiry)
+        return result.modified_count
+
+    def cache_ttl(self, default: float) -> float:
+        """Lifetime for cached announcement data: ``default``, cut short at the
+        next expiry. Zero or less means the data should not be cached."""
+        if self.next_expiry is None:
+            return default
+        return min(default, (self.next_expiry - datetime.now(timezone.utc)).total_seconds())
+
+    async def _next_expiry(self) -> Optional[datetime]:
+        upcoming = await self.db.announcements.find_one(
+            {"active": True, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"_id": 0, "expires_at": 1},
+            sort=[("expires_at", 1)],
+        )
+        return _as_utc(upcoming["expires_at"]) if upcoming else None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.expire_due()
+                self.next_expiry = await self._next_expiry()
+            except Exception as e:
+                logger.error(f"Announcement expiry check failed: {e}")
+                self.next_expiry = None
+            delay = self.poll_seconds
+            if self.next_expiry is not None:
+                delay = min(delay, max(0.0, (self.next_expiry - datetime.now(timezone.utc)).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
@@ -0,0 +1,265 @@
+"""Per-route latency and throughput of the FastAPI app, in process.
+
+Drives the ASGI ``app`` through httpx's ASGITransport with the in-memory
+storage backend (STORAGE_BACKEND=memory), so the full middleware stack,
+handlers, caches and serializers run without a network or a MongoDB server.
+For each collection size the database is filled with synthetic documents,
+the app's startup hooks run, and every route in ROUTES is requested
+``--requests`` times (after ``--warmup`` untimed requests) by ``--concurrency``
+concurrent clients.
+
+Results are printed as a table and can be saved as a JSON baseline and
+compared against a previous one; run both on the same machine. The memory
+backend has no indexes, so queries MongoDB answers from an index scan the
+collection here: read large-dataset numbers as relative, not as production
+latency.
+
+Usage:
+    python benchmarks/bench_endpoints.py [--docs 100 10000 100000] [--requests 200]
+        [--routes blog_list blog_detail] [--save benchmarks/baselines/main.json]
+        [--compare benchmarks/baselines/main.json] [--threshold 0.10]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["STORAGE_BACKEND"] = "memory"
+# Set (empty) before server loads backend/.env, which never overrides the
+# environment, so a developer's Cloudinary credentials are not picked up
+for name in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+    os.environ[name] = ""
+# Configured first so server's INFO basicConfig is a no-op: a log line per
+# request (httpx logs each one) would be timed along with the request
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+from storage import MemoryClient  # noqa: E402
+
+PARAGRAPH = ("Artificial Intelligence continues to reshape the enterprise landscape in unprecedented ways. "
+             "From predictive analytics to automated decision-making, AI is becoming the cornerstone of modern "
+             "business operations. ")
+ORIGIN = "http://localhost:3000"
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "bench-password"
+
+# name -> (method, path, headers, admin). Paths may use {slug}, filled per
+# dataset, and {seq}, a per-request counter that defeats the HTTP body cache
+# (the plain variants measure cache hits).
+ROUTES = {
+    "health": ("GET", "/health", {}, False),
+    "blog_list": ("GET", "/api/blog", {}, False),
+    "blog_list_uncached": ("GET", "/api/blog?nocache={seq}", {}, False),
+    "blog_list_summary": ("GET", "/api/blog?view=summary", {}, False),
+    "blog_list_cors": ("GET", "/api/blog", {"Origin": ORIGIN}, False),
+    "blog_detail": ("GET", "/api/blog/{slug}", {}, False),
+    "blog_detail_uncached": ("GET", "/api/blog/{slug}?nocache={seq}", {}, False),
+    "cors_preflight": ("OPTIONS", "/api/blog", {"Origin": ORIGIN, "Access-Control-Request-Method": "GET"}, False),
+    "services": ("GET", "/api/services", {}, False),
+    "jobs": ("GET", "/api/jobs", {}, False),
+    "search": ("GET", "/api/search?q=enterprise+analytics", {}, False),
+    "admin_blog_page": ("GET", "/api/admin/blog?limit=50", {}, True),
+    "admin_subscribers_page": ("GET", "/api/admin/subscribers?limit=100", {}, True),
+    "admin_contacts_page": ("GET", "/api/admin/contacts?limit=100", {}, True),
+    "admin_dashboard_stats": ("GET", "/api/admin/dashboard/stats", {}, True),
+}
+
+
+def _dates(count: int) -> List[datetime]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [start + timedelta(minutes=i) for i in range(count)]
+
+
+def synthetic_data(count: int) -> Dict[str, List[dict]]:
+    dates = _dates(count)
+    return {
+        "blog_posts": [
+            {
+                "id": str(uuid.uuid4()), "slug": f"post-{i}", "title": f"Enterprise analytics post {i}",
+                "excerpt": PARAGRAPH[:120], "content": PARAGRAPH * 4,
+                "featured_image": "https://images.example.com/p.jpg", "gallery_images": [], "post_type": "blog",
+                "published_date": dates[i].isoformat(), "author": "Author", "category": "AI & Innovation",
+                "readTime": "8 min read", "tags": ["AI", "Enterprise"], "published": True,
+            }
+            for i in range(count)
+        ],
+        "subscribers": [
+            {"id": str(uuid.uuid4()), "email": f"user{i}@example.com", "subscribed_at": dates[i], "active": i % 10 != 0}
+            for i in range(count)
+        ],
+        "contacts": [
+            {
+                "id": str(uuid.uuid4()), "name": f"Contact {i}", "email": f"contact{i}@example.com",
+                "company": "Example Inc", "phone": "555-0100", "message": PARAGRAPH[:200],
+                "service": "Cloud Services", "created_at": dates[i], "read": i % 3 == 0,
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+async def _prepare(count: int) -> None:
+    """Point the app at a fresh in-memory database holding ``count`` synthetic
+    documents per large collection, then run its startup hooks."""
+    server.init_database(MemoryClient()[server.db_name])
+    for collection, docs in synthetic_data(count).items():
+        await server.db[collection].insert_many(docs)
+    admin = server.AdminUser(email=ADMIN_EMAIL, password_hash=server.hash_password(ADMIN_PASSWORD), name="Bench")
+    await server.db.admin_users.insert_one(admin.model_dump())
+    await server.startup_event()
+
+
+async def _stop_background_tasks() -> None:
+    """Stop what startup_event() started, so the next dataset can rerun it.
+    (The full shutdown hook also closes the password pool, so it runs once.)"""
+    if server.search_refresh_task is not None:
+        server.search_refresh_task.cancel()
+    server.announcement_expiry.stop()
+    await asyncio.sleep(0)
+
+
+async def _admin_headers(client: httpx.AsyncClient) -> dict:
+    response = await client.post("/api/admin/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _measure(client: httpx.AsyncClient, method: str, path: str, headers: dict, requests: int,
+                   warmup: int, concurrency: int) -> dict:
+    sequence = itertools.count()
+    url = (lambda: path.format(seq=next(sequence))) if "{seq}" in path else (lambda: path)
+    for _ in range(warmup):
+        response = await client.request(method, url(), headers=headers)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+    size = 0
+
+    async def worker():
+        nonlocal size
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.request(method, url(), headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            size = len(response.content)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "rps": requests / elapsed,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "bytes": size,
+    }
+
+
+async def run(sizes: List[int], routes: List[str], requests: int, warmup: int, concurrency: int) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=server.app)
+    try:
+        for count in sizes:
+            await _prepare(count)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                admin = await _admin_headers(client)
+                for name in routes:
+                    method, path, headers, needs_admin = ROUTES[name]
+                    path = path.replace("{slug}", f"post-{count // 2}")
+                    headers = {**headers, **admin} if needs_admin else headers
+                    stats = await _measure(client, method, path, headers, requests, warmup, concurrency)
+                    results[f"{name}@{count}"] = {"route": name, "docs": count, **stats}
+                    _print_row(name, count, stats)
+            await _stop_background_tasks()
+    finally:
+        await server.app.router.shutdown()
+    return results
+
+
+def _print_header() -> None:
+    print(f"{'route':<26}{'docs':>8}{'req/s':>10}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'bytes':>10}")
+
+
+def _print_row(name: str, count: int, stats: dict) -> None:
+    print(f"{name:<26}{count:>8}{stats['rps']:>10.0f}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>9.2f}"
+          f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['bytes']:>10}")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> int:
+    """Print p50/p95 changes against ``baseline``; returns the regression count."""
+    print(f"\n{'route':<26}{'docs':>8}{'p50 base':>10}{'p50 now':>9}{'change':>9}{'p95 base':>10}{'p95 now':>9}{'change':>9}")
+    regressions = 0
+    for key, now in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        changes = [now[metric] / base[metric] - 1 for metric in ("p50_ms", "p95_ms")]
+        flag = "  REGRESSION" if changes[0] > threshold else ""
+        regressions += bool(flag)
+        print(f"{now['route']:<26}{now['docs']:>8}{base['p50_ms']:>10.2f}{now['p50_ms']:>9.2f}{changes[0]:>+9.0%}"
+              f"{base['p95_ms']:>10.2f}{now['p95_ms']:>9.2f}{changes[1]:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--routes", nargs="+", choices=sorted(ROUTES), default=list(ROUTES))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="p50 slowdown counted as a regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    _print_header()
+    results = asyncio.run(run(args.docs, args.routes, args.requests, args.warmup, args.concurrency))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps({
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "fast_json": os.environ.get("FAST_JSON", "false"),
+            },
+            "results": results,
+        }, indent=2))
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
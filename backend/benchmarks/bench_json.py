@@ -0,0 +1,95 @@
+"""CPU cost of serializing list responses: response_model vs FAST_JSON.
+
+Runs the same work FastAPI does for a ``response_model=List[...]`` route
+(validate every document, serialize, encode with the stdlib json) against
+the FAST_JSON path (shape the documents, encode with orjson), on synthetic
+documents shaped like the stored ones.
+
+Usage:
+    python benchmarks/bench_json.py [--docs 100 1000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# server.py builds its Motor client at import time; nothing connects here
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from fast_json import TrustedJSONResponse, shape_documents  # noqa: E402
+from server import BlogPost, Subscriber  # noqa: E402
+
+PARAGRAPH = ("Artificial Intelligence continues to reshape the enterprise landscape in unprecedented ways. "
+             "From predictive analytics to automated decision-making, AI is becoming the cornerstone of modern "
+             "business operations. ")
+
+
+def blog_posts(count: int) -> List[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()), "slug": f"post-{i}", "title": f"Post {i}", "excerpt": PARAGRAPH[:120],
+            "content": PARAGRAPH * 12, "featured_image": "https://images.example.com/p.jpg",
+            "gallery_images": [], "post_type": "blog", "published_date": "2025-01-15", "author": "Author",
+            "category": "AI & Innovation", "readTime": "8 min read", "tags": ["AI", "Enterprise"],
+            "published": True,
+        }
+        for i in range(count)
+    ]
+
+
+def subscribers(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return [
+        {"id": str(uuid.uuid4()), "email": f"user{i}@example.com", "subscribed_at": now, "active": True}
+        for i in range(count)
+    ]
+
+
+async def _default_path(field, docs) -> bytes:
+    content = await serialize_response(field=field, response_content=docs)
+    return JSONResponse(content).body
+
+
+def _fast_path(model, docs) -> bytes:
+    return TrustedJSONResponse(shape_documents(model, docs)).body
+
+
+def _cpu_ms(fn, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    cases = [("/api/blog", BlogPost, blog_posts), ("/api/admin/subscribers", Subscriber, subscribers)]
+    print(f"{'route':<24}{'docs':>6}{'response_model ms':>20}{'FAST_JSON ms':>15}{'saved':>8}")
+    for route, model, factory in cases:
+        field = create_response_field(name=f"Response_{model.__name__}", type_=List[model])
+        for count in args.docs:
+            docs = factory(count)
+            assert json.loads(loop.run_until_complete(_default_path(field, docs))) == json.loads(_fast_path(model, docs))
+            default_ms = _cpu_ms(lambda: loop.run_until_complete(_default_path(field, docs)), args.repeat)
+            fast_ms = _cpu_ms(lambda: _fast_path(model, docs), args.repeat)
+            print(f"{route:<24}{count:>6}{default_ms:>20.2f}{fast_ms:>15.2f}{1 - fast_ms / default_ms:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
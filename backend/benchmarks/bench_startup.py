@@ -0,0 +1,199 @@
+"""Cold-start cost of a worker: importing the app and serving its first request.
+
+Each run starts a fresh interpreter (``--runs`` times) with the in-memory
+storage backend (STORAGE_BACKEND=memory) and measures:
+
+- import_ms: ``import server``
+- factory_ms: ``server.create_app()``, which opens the database client
+- startup_ms: the startup hooks (indexes, admin bootstrap, search index)
+- first_request_ms / second_request_ms: ``--path`` through httpx's
+  ASGITransport, cold and then warm
+
+Medians are reported. ``--importtime N`` additionally lists the N modules that
+``server`` imports directly with the largest cumulative import time (from
+``python -X importtime``). Results can be saved as a JSON baseline and compared
+against a previous one on the same machine. ``--budget-ms`` fails the run when
+the median import time exceeds it, for use as a CI gate.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--path /api/blog] [--importtime 15]
+        [--save benchmarks/baselines/startup.json] [--compare benchmarks/baselines/startup.json]
+        [--threshold 0.10] [--budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+METRICS = ("import_ms", "factory_ms", "startup_ms", "first_request_ms", "second_request_ms")
+
+
+def _child(path: str) -> None:
+    """Runs in the fresh interpreter; prints one JSON line of timings."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ["STORAGE_BACKEND"] = "memory"
+    # Imported before timing: the benchmark's own client, not the app's cost
+    import asyncio
+
+    import httpx
+
+    start = time.perf_counter()
+    import server
+    imported = time.perf_counter()
+    app = server.create_app()
+    created = time.perf_counter()
+
+    async def serve() -> Tuple[float, float, float]:
+        begin = time.perf_counter()
+        await app.router.startup()
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            first_start = time.perf_counter()
+            response = await client.get(path)
+            first = time.perf_counter() - first_start
+            response.raise_for_status()
+            second_start = time.perf_counter()
+            await client.get(path)
+            second = time.perf_counter() - second_start
+        await app.router.shutdown()
+        return started - begin, first, second
+
+    startup, first, second = asyncio.run(serve())
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "factory_ms": (created - imported) * 1000,
+        "startup_ms": startup * 1000,
+        "first_request_ms": first * 1000,
+        "second_request_ms": second * 1000,
+    }))
+
+
+def _child_env() -> dict:
+    return {**os.environ, "STORAGE_BACKEND": "memory"}
+
+
+def measure(runs: int, path: str) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", "--path", path],
+            capture_output=True, text=True, cwd=BACKEND_DIR, env=_child_env(),
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"startup run failed:\n{result.stderr[-2000:]}")
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        for metric in METRICS:
+            samples[metric].append(timings[metric])
+    return samples
+
+
+def import_profile(top: int) -> List[Tuple[str, float, float]]:
+    """(module, self ms, cumulative ms) for the slowest direct imports of server."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        capture_output=True, text=True, cwd=BACKEND_DIR, env=_child_env(),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        # After the separator's space, modules imported by server itself are
+        # indented by exactly two spaces
+        name = name[1:]
+        if name.startswith("  ") and not name.startswith("   "):
+            rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, dict]:
+    return {
+        metric: {"median": statistics.median(values), "min": min(values), "max": max(values)}
+        for metric, values in samples.items()
+    }
+
+
+def _print_summary(summary: Dict[str, dict]) -> None:
+    print(f"{'phase':<20}{'median ms':>11}{'min ms':>10}{'max ms':>10}")
+    for metric, stats in summary.items():
+        print(f"{metric:<20}{stats['median']:>11.1f}{stats['min']:>10.1f}{stats['max']:>10.1f}")
+
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> int:
+    """Print median changes against ``baseline``; returns the regression count."""
+    print(f"\n{'phase':<20}{'base ms':>10}{'now ms':>10}{'change':>9}")
+    regressions = 0
+    for metric, now in summary.items():
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        change = now["median"] / base["median"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressions += bool(flag)
+        print(f"{metric:<20}{base['median']:>10.1f}{now['median']:>10.1f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/api/blog", help="route requested after startup")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="list the N slowest direct imports of server")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="median slowdown counted as a regression (default 0.10 = 10%%)")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median import time exceeds this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.path)
+        return
+
+    summary = summarize(measure(args.runs, args.path))
+    _print_summary(summary)
+
+    if args.importtime:
+        print(f"\n{'module':<32}{'self ms':>10}{'cumulative ms':>15}")
+        for name, self_ms, cumulative_ms in import_profile(args.importtime):
+            print(f"{name:<32}{self_ms:>10.1f}{cumulative_ms:>15.1f}")
+
+    failed = False
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps({
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "runs": args.runs,
+                "path": args.path,
+            },
+            "results": summary,
+        }, indent=2))
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        failed |= bool(compare(summary, baseline, args.threshold))
+    if args.budget_ms is not None and summary["import_ms"]["median"] > args.budget_ms:
+        print(f"\nImport time {summary['import_ms']['median']:.1f} ms exceeds the {args.budget_ms:g} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Largest batch a single bulk request may carry
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', '500'))
+
+
+def unique_ids(ids: List[str]) -> List[str]:
+    """Drop repeated ids, keeping the first occurrence's position."""
+    return list(dict.fromkeys(ids))
+
+
+async def _execute(collection, ops: list, op_ids: List[str], results: Dict[str, dict]) -> Tuple[int, int, int]:
+    """Run ``ops`` as one unordered bulk_write and mark failed items.
+
+    Returns (matched, modified, deleted) as reported by the server.
+    """
+    if not ops:
+        return 0, 0, 0
+    try:
+        outcome = await collection.bulk_write(ops, ordered=False)
+        details = outcome.bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+        for error in details.get("writeErrors", []):
+            results[op_ids[error["index"]]] = {"status": "failed", "detail": error.get("errmsg")}
+    return details.get("nMatched", 0), details.get("nModified", 0), details.get("nRemoved", 0)
+
+
+def _summary(ids: List[str], results: Dict[str, dict], **counts) -> dict:
+    return {**counts, "results": [{"id": doc_id, **results[doc_id]} for doc_id in ids]}
+
+
+async def bulk_update(collection, updates: Dict[str, dict]) -> dict:
+    """Apply ``{"$set": fields}`` to each id in ``updates`` with one bulk_write.
+
+    The documents are read first (one ``$in`` query) so every item gets its
+    own result: ``updated``, ``unchanged`` (already had those values, no write
+    issued), ``not_found`` or ``failed``.
+    """
+    ids = list(updates)
+    fields = {"_id": 0, "id": 1}
+    for values in updates.values():
+        fields.update({field: 1 for field in values})
+    existing = {doc["id"]: doc async for doc in collection.find({"id": {"$in": ids}}, fields)}
+
+    ops, op_ids, results = [], [], {}
+    for doc_id, values in updates.items():
+        doc = existing.get(doc_id)
+        if doc is None:
+            results[doc_id] = {"status": "not_found"}
+        elif all(doc.get(field) == value for field, value in values.items()):
+            results[doc_id] = {"status": "unchanged"}
+        else:
+            ops.append(UpdateOne({"id": doc_id}, {"$set": values}))
+            op_ids.append(doc_id)
+            results[doc_id] = {"status": "updated"}
+    _, modified, _ = await _execute(collection, ops, op_ids, results)
+    return _summary(ids, results, matched=len(existing), modified=modified)
+
+
+async def bulk_delete(collection, ids: List[str], projection: Optional[dict] = None) -> Tuple[dict, List[dict]]:
+    """Delete each id, reporting what this request actually removed.
+
+    A bulk_write only reports how many documents went in total, so a delete
+    that lost a race with another request could not be told apart from one
+    that won it. Each id is instead removed with its own
+    ``find_one_and_delete`` (issued concurrently): an item is ``deleted`` only
+    if that call returned the document, and the returned documents (read
+    with ``projection``) are what callers adjust counters with. Other items
+    are ``not_found`` or ``failed``.
+    """
+    async def delete(doc_id):
+        try:
+            return await collection.find_one_and_delete({"id": doc_id}, projection=projection or {"_id": 0, "id": 1})
+        except PyMongoError as e:
+            return e
+
+    outcomes = await asyncio.gather(*(delete(doc_id) for doc_id in ids))
+    results, removed = {}, []
+    for doc_id, outcome in zip(ids, outcomes):
+        if isinstance(outcome, PyMongoError):
+            results[doc_id] = {"status": "failed", "detail": str(outcome)}
+        elif outcome is None:
+            results[doc_id] = {"status": "not_found"}
+        else:
+            results[doc_id] = {"status": "deleted"}
+            removed.append(outcome)
+    return _summary(ids, results, matched=len(removed), deleted=len(removed)), removed
@@ -0,0 +1,249 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Public content changes a few times a week, so a short TTL mostly bounds how
+# long other workers keep serving data after an admin write on this one.
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '60'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+
+
+class ResponseCache:
+    """TTL + LRU cache for query results, keyed by (collection, query key)."""
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL_SECONDS, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection: str, key: Hashable) -> Optional[Any]:
+        entry_key = (collection, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[entry_key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        return value
+
+    def set(self, collection: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        entry_key = (collection, key)
+        self._entries[entry_key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, collection: str, key: Hashable) -> None:
+        self._entries.pop((collection, key), None)
+
+    def invalidate(self, collection: str) -> None:
+        """Drop every cached query for a collection."""
+        for entry_key in [k for k in self._entries if k[0] == collection]:
+            del self._entries[entry_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def query_key(query: dict, sort: Optional[list] = None, limit: int = 100,
+              projection: Optional[dict] = None) -> Hashable:
+    """Build a hashable cache key for a find() call."""
+    return (repr(sorted(query.items())), repr(sort), limit, repr(sorted((projection or {}).items())))
+
+
+# ===================== HTTP VALIDATORS =====================
+
+HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', '60'))
+HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', '300'))
+# How often each worker re-reads the persisted content versions, bounding how
+# long another worker's write goes unnoticed here
+CONTENT_VERSIONS_REFRESH_SECONDS = float(os.environ.get('CONTENT_VERSIONS_REFRESH_SECONDS', '2'))
+
+
+def source_fingerprint(root: Path) -> str:
+    """Hash of the Python sources under ``root`` (not recursive)."""
+    digest = hashlib.sha1()
+    for path in sorted(root.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+# Identifies the deployed code. A deploy can change response bodies without
+# any content write (fallback content, projections, new fields), so it is part
+# of every validator. Deploys may set BUILD_ID, e.g. to the git commit;
+# otherwise the backend sources are hashed, which every worker agrees on.
+BUILD_ID = os.environ.get('BUILD_ID') or source_fingerprint(Path(__file__).resolve().parent)
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return 0.0
+    return (value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value).timestamp()
+
+
+async def bump_content_version(db, collection: str,
+                               unless_since: Optional[datetime] = None) -> Optional[Tuple[int, float]]:
+    """Record a write to ``collection``; returns its new (version, modified at).
+
+    With ``unless_since``, the version is left alone (and None returned) if it
+    was already bumped at or after that time, so workers reacting to the same
+    event bump it once between them.
+    """
+    query: Dict[str, Any] = {"_id": collection}
+    if unless_since is not None:
+        query["$or"] = [{"updated_at": {"$lt": unless_since}}, {"updated_at": None}]
+    try:
+        doc = await db.content_versions.find_one_and_update(
+            query,
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # The guard did not match an existing version, so the upsert collided with it
+        return None
+    return doc["version"], _timestamp(doc["updated_at"])
+
+
+class ContentVersions:
+    """Per-collection content versions, persisted in the content_versions
+    collection ({_id: collection, version, updated_at}).
+
+    Writes bump them through bump(), so every worker, before and after a
+    restart, derives the same validators for the same content. Reads use a
+    local copy re-read every ``refresh_seconds``; ``on_change`` is called
+    with each collection whose version moved on since the last read, so
+    per-worker caches drop data that another worker changed.
+    """
+
+    def __init__(self, db, refresh_seconds: float = CONTENT_VERSIONS_REFRESH_SECONDS,
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.db = db
+        self.refresh_seconds = refresh_seconds
+        self.on_change = on_change
+        # collection -> (version, modified at)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._loaded_at: Optional[float] = None
+
+    async def bump(self, collection: str, unless_since: Optional[datetime] = None) -> Optional[int]:
+        """Bump ``collection``'s version (see bump_content_version). When
+        ``unless_since`` finds it already bumped, the local copy is re-read
+        instead and None is returned."""
+        bumped = await bump_content_version(self.db, collection, unless_since)
+        if bumped is None:
+            await self.refresh()
+            return None
+        version, modified = bumped
+        self._merge(collection, version, modified)
+        return version
+
+    async def refresh(self) -> None:
+        # Nothing can have been cached from a collection before the first read
+        notify = self._loaded_at is not None
+        self._loaded_at = time.monotonic()
+        async for doc in self.db.content_versions.find({}, {"version": 1, "updated_at": 1}):
+            self._merge(doc["_id"], doc["version"], _timestamp(doc.get("updated_at")), notify)
+
+    def _merge(self, collection: str, version: int, modified: float, notify: bool = False) -> None:
+        # A refresh that started before a local bump must not roll it back
+        current = self._versions.get(collection)
+        if current is not None and current[0] >= version:
+            return
+        self._versions[collection] = (version, modified)
+        if notify and self.on_change is not None:
+            self.on_change(collection)
+
+    def clear(self) -> None:
+        """Forget the local copy; the next snapshot re-reads the versions."""
+        self._versions.clear()
+        self._loaded_at = None
+
+    def current(self, collections: Iterable[str]) -> Tuple[int, ...]:
+        """The local copy of the versions, without re-reading them."""
+        return tuple(self._versions.get(c, (0, 0.0))[0] for c in collections)
+
+    async def snapshot(self, collections: Tuple[str, ...]) -> Tuple[Tuple[int, ...], float]:
+        """(versions, latest modification timestamp) of ``collections``."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            await self.refresh()
+        entries = [self._versions.get(c, (0, 0.0)) for c in collections]
+        return tuple(version for version, _ in entries), max((modified for _, modified in entries), default=0.0)
+
+
+class HttpCachePolicy:
+    """Caching policy for a public GET route.
+
+    ``collections`` lists the collections the route reads; a write to any of
+    them makes previously issued validators stale.
+    """
+
+    def __init__(self, collections: Tuple[str, ...], max_age: int = HTTP_CACHE_MAX_AGE,
+                 stale_while_revalidate: int = HTTP_CACHE_STALE_WHILE_REVALIDATE):
+        self.collections = collections
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.cache_control = f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+class CachedBody:
+    __slots__ = ("versions", "etag", "last_modified", "body", "media_type")
+
+    def __init__(self, versions: Tuple[int, ...], etag: str, last_modified: float, body: bytes, media_type: str):
+        self.versions = versions
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.media_type = media_type
+
+
+def make_etag(key: str, versions: Tuple[int, ...], build: str = BUILD_ID) -> str:
+    """Validator for the response at ``key`` built from content ``versions``
+    by the code identified by ``build``. It changes when a collection the
+    route reads is written or a new build is deployed, and needs neither the
+    body nor any per-worker state to compute."""
+    return '"' + hashlib.sha1(f"{build}|{key}|{versions!r}".encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match (RFC 9110 13.1.2)
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: float) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
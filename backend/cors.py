@@ -0,0 +1,139 @@
+import os
+from typing import Iterable, List, Tuple
+
+# How long browsers may reuse a preflight result. Chromium caps this at 7200.
+CORS_MAX_AGE = int(os.environ.get('CORS_MAX_AGE', '7200'))
+
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH")
+CORS_ALLOW_HEADERS = ("Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With",
+                      "If-None-Match", "If-Modified-Since", "X-Profile")
+CORS_EXPOSE_HEADERS = ("Content-Disposition", "Content-Length", "Content-Type", "ETag", "Last-Modified",
+                       "X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated", "X-Profile-Id")
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def _header(name: str, value: str) -> Tuple[bytes, bytes]:
+    return name.lower().encode("latin-1"), value.encode("latin-1")
+
+
+class CORSLayer:
+    """Single CORS implementation for the app (pure ASGI).
+
+    Origins are matched against a frozenset; every header value except the
+    echoed origin is encoded once at startup. Preflight requests are answered
+    here, without reaching the router, and carry Access-Control-Max-Age so
+    browsers cache them. A "*" entry in ``origins`` allows any origin.
+
+    Every other response carries Vary: Origin, including those to requests
+    without an allowed Origin, so a shared cache never serves a response
+    stored for one origin (or for none) to another. The exception is a
+    literal "*" grant, which is then sent on every response instead.
+    """
+
+    def __init__(
+        self,
+        app,
+        origins: Iterable[str],
+        allow_credentials: bool = True,
+        allow_methods: Iterable[str] = CORS_ALLOW_METHODS,
+        allow_headers: Iterable[str] = CORS_ALLOW_HEADERS,
+        expose_headers: Iterable[str] = CORS_EXPOSE_HEADERS,
+        max_age: int = CORS_MAX_AGE,
+    ):
+        self.app = app
+        origins = [o.rstrip("/") for o in origins]
+        self.allow_all = "*" in origins
+        self.origins = frozenset(o for o in origins if o != "*")
+        self.allow_credentials = allow_credentials
+        # Without credentials a wildcard grant can be a literal "*", which
+        # does not vary by origin and so stays cacheable by shared caches.
+        self.literal_wildcard = self.allow_all and not allow_credentials
+
+        common: Headers = []
+        if allow_credentials:
+            common.append(_header("Access-Control-Allow-Credentials", "true"))
+        self.simple_headers = common + [_header("Access-Control-Expose-Headers", ", ".join(expose_headers))]
+        self.preflight_headers = common + [
+            _header("Access-Control-Allow-Methods", ", ".join(allow_methods)),
+            _header("Access-Control-Max-Age", str(max_age)),
+            (b"content-length", b"0"),
+        ]
+        self.allow_headers_value = ", ".join(allow_headers).encode("latin-1")
+        # For responses without a CORS grant (never needed with a literal "*")
+        self.vary_only: Headers = [(b"vary", b"Origin")]
+
+    def _allowed(self, origin: str) -> bool:
+        return self.allow_all or origin in self.origins
+
+    def _origin_headers(self, origin: bytes) -> Headers:
+        if self.literal_wildcard:
+            return [(b"access-control-allow-origin", b"*")]
+        return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        allowed = origin is not None and self._allowed(origin.decode("latin-1"))
+        if origin is not None and scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, origin, allowed, request_headers)
+            return
+
+        if allowed or self.literal_wildcard:
+            extra = self._origin_headers(origin) + self.simple_headers
+        else:
+            extra = self.vary_only
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = _merge_vary(list(message.get("headers", [])), extra)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, send, origin: bytes, allowed: bool, request_headers) -> None:
+        if not allowed:
+            body = b"Disallowed CORS origin"
+            await send({"type": "http.response.start", "status": 400, "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode()),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+            return
+        # A wildcard configuration accepts whatever headers the browser asks for
+        allow_headers = request_headers if self.allow_all and request_headers else self.allow_headers_value
+        headers = self._origin_headers(origin) + self.preflight_headers + [
+            (b"access-control-allow-headers", allow_headers),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def _merge_vary(headers: Headers, extra: Headers) -> Headers:
+    """Append ``extra`` to ``headers``, folding Vary values into one header."""
+    vary_values = [value for name, value in extra if name == b"vary"]
+    if not vary_values:
+        return headers + extra
+    merged = []
+    existing_vary = None
+    for name, value in headers:
+        if name == b"vary":
+            existing_vary = value if existing_vary is None else existing_vary + b", " + value
+        else:
+            merged.append((name, value))
+    vary = vary_values[0]
+    if existing_vary is not None and b"origin" not in existing_vary.lower():
+        vary = existing_vary + b", " + vary
+    elif existing_vary is not None:
+        vary = existing_vary
+    return merged + [(name, value) for name, value in extra if name != b"vary"] + [(b"vary", vary)]
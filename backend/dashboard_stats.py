@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATS_RECONCILE_SECONDS = float(os.environ.get('STATS_RECONCILE_SECONDS', '300'))
+STATS_DOC_ID = "dashboard"
+
+# Dashboard counter -> (collection, equality filter). The filters only use
+# plain equality so a document can be matched against them in Python.
+DASHBOARD_COUNTERS: Dict[str, Tuple[str, dict]] = {
+    "blog_posts": ("blog_posts", {}),
+    "services": ("services", {}),
+    "partners": ("partners", {}),
+    "total_jobs": ("jobs", {}),
+    "active_jobs": ("jobs", {"active": True}),
+    "total_applications": ("job_applications", {}),
+    "new_applications": ("job_applications", {"status": "new"}),
+    "total_contacts": ("contacts", {}),
+    "unread_contacts": ("contacts", {"read": False}),
+    "active_announcements": ("announcements", {"active": True}),
+    "testimonials": ("testimonials", {}),
+    "subscribers": ("subscribers", {}),
+}
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    return all(doc.get(field) == value for field, value in query.items())
+
+
+class DashboardStats:
+    """Materialized dashboard counters kept in a single stats document.
+
+    Inserts and deletes adjust the counters with $inc; updates that can move
+    a document in or out of a filtered counter recount just those counters.
+    The whole document is reconciled against a concurrent recount when it is
+    older than STATS_RECONCILE_SECONDS, which also corrects drift from writes
+    made outside the API.
+    """
+
+    def __init__(self, db, reconcile_seconds: float = STATS_RECONCILE_SECONDS):
+        self.db = db
+        self.reconcile_seconds = reconcile_seconds
+        self._reconciling: Optional[asyncio.Task] = None
+
+    @property
+    def _stats(self):
+        return self.db.dashboard_stats
+
+    def projection(self, collection: str) -> dict:
+        """Fields a deleted document must carry for record_delete()."""
+        fields = {"_id": 0, "id": 1}
+        for counter_collection, query in DASHBOARD_COUNTERS.values():
+            if counter_collection == collection:
+                fields.update({field: 1 for field in query})
+        return fields
+
+    async def _count(self, names) -> Dict[str, int]:
+        counts = await asyncio.gather(*[
+            self.db[DASHBOARD_COUNTERS[name][0]].count_documents(DASHBOARD_COUNTERS[name][1])
+            for name in names
+        ])
+        return dict(zip(names, counts))
+
+    async def reconcile(self) -> Dict[str, int]:
+        counters = await self._count(list(DASHBOARD_COUNTERS))
+        await self._stats.update_one(
+            {"_id": STATS_DOC_ID},
+            {"$set": {"counters": counters, "reconciled_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        return counters
+
+    def _reconcile_in_background(self) -> None:
+        if self._reconciling is None or self._reconciling.done():
+            self._reconciling = asyncio.ensure_future(self._safe(self.reconcile()))
+
+    async def read(self) -> Dict[str, int]:
+        doc = await self._stats.find_one({"_id": STATS_DOC_ID})
+        if doc is None or set(doc.get("counters", {})) != set(DASHBOARD_COUNTERS):
+            return await self.reconcile()
+        reconciled_at = doc.get("reconciled_at")
+        if reconciled_at is not None:
+            if reconciled_at.tzinfo is None:
+                reconciled_at = reconciled_at.replace(tzinfo=timezone.utc)
+            age = (datetime.now(timezone.utc) - reconciled_at).total_seconds()
+            if age > self.reconcile_seconds:
+                self._reconcile_in_background()
+        return doc["counters"]
+
+    async def _increment(self, collection: str, docs, sign: int) -> None:
+        deltas = {}
+        for name, (counter_collection, query) in DASHBOARD_COUNTERS.items():
+            if counter_collection == collection:
+                matched = sum(1 for doc in docs if _matches(doc, query))
+                if matched:
+                    deltas[f"counters.{name}"] = sign * matched
+        if deltas:
+            # No upsert: a missing document is rebuilt by reconcile() on next read
+            await self._stats.update_one({"_id": STATS_DOC_ID}, {"$inc": deltas})
+
+    async def record_insert(self, collection: str, doc: dict) -> None:
+        await self._safe(self._increment(collection, [doc], 1))
+
+    async def record_delete(self, collection: str, doc: dict) -> None:
+        await self._safe(self._increment(collection, [doc], -1))
+
+    async def record_delete_many(self, collection: str, docs) -> None:
+        """Adjust the counters for a batch of deleted documents in one write."""
+        await self._safe(self._increment(collection, docs, -1))
+
+    async def record_update(self, collection: str) -> None:
+        """Recount the filtered counters over ``collection`` after an update."""
+        names = [name for name, (counter_collection, query) in DASHBOARD_COUNTERS.items()
+                 if counter_collection == collection and query]
+        if names:
+            await self._safe(self._set_counts(names))
+
+    async def _set_counts(self, names) -> None:
+        counts = await self._count(names)
+        await self._stats.update_one(
+            {"_id": STATS_DOC_ID},
+            {"$set": {f"counters.{name}": value for name, value in counts.items()}},
+        )
+
+    @staticmethod
+    async def _safe(job):
+        # Counters must never fail the write that triggered them
+        try:
+            return await job
+        except Exception as e:
+            logger.error(f"Dashboard stats update failed: {e}")
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Documents fetched per cursor batch, and rows per streamed chunk
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Spreadsheet apps evaluate cells starting with these; exported fields come
+# from public forms, so such cells are prefixed with a quote.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def date_range_query(field: str, since: Optional[datetime], until: Optional[datetime]) -> dict:
+    """``since <= field < until``, matching both BSON dates and the ISO strings
+    some collections store."""
+    if since is None and until is None:
+        return {}
+    as_date, as_string = {}, {}
+    if since is not None:
+        as_date["$gte"] = _as_utc(since)
+        as_string["$gte"] = _as_utc(since).isoformat()
+    if until is not None:
+        as_date["$lt"] = _as_utc(until)
+        as_string["$lt"] = _as_utc(until).isoformat()
+    return {"$or": [{field: as_date}, {field: as_string}]}
+
+
+def _csv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+    if isinstance(value, (list, tuple)):
+        value = "; ".join(str(v) for v in value)
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return str(value)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _ndjson_line(row: dict) -> bytes:
+    if orjson is not None:
+        # orjson encodes datetimes itself; NAIVE_UTC gives them the offset _json_default adds
+        return orjson.dumps(row, default=_json_default, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NAIVE_UTC)
+    return (json.dumps(row, default=_json_default) + "\n").encode("utf-8")
+
+
+async def _stream(cursor, columns: Sequence[str], fmt: str) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        rows = 0
+        async for doc in cursor:
+            writer.writerow([_csv_cell(doc.get(column)) for column in columns])
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+    else:
+        chunk: List[bytes] = []
+        async for doc in cursor:
+            chunk.append(_ndjson_line({column: doc.get(column) for column in columns}))
+            if len(chunk) >= EXPORT_BATCH_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+        if chunk:
+            yield b"".join(chunk)
+
+
+def export_response(collection, query: dict, columns: Sequence[str], sort: list, fmt: str,
+                    name: str) -> StreamingResponse:
+    """Stream every document matching ``query`` as CSV or NDJSON.
+
+    The Motor cursor is read in EXPORT_BATCH_SIZE batches and rows are
+    flushed per batch, so memory stays flat regardless of collection size.
+    """
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    projection = {"_id": 0, **{column: 1 for column in columns}}
+    cursor = collection.find(query, projection).sort(sort).batch_size(EXPORT_BATCH_SIZE)
+    filename = f"{name}_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.{fmt}"
+    return StreamingResponse(
+        _stream(cursor, columns, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
@@ -0,0 +1,117 @@
+import logging
+import os
+import typing
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: the fast path stays off without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: serialize trusted list responses with orjson instead of validating
+# every document through its response_model first.
+FAST_JSON = os.environ.get('FAST_JSON', 'false').lower() == 'true'
+if FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON is enabled but orjson is not installed; using the default serializer")
+    FAST_JSON = False
+
+# Headers of the injected Response that describe its (empty) body
+_BODY_HEADERS = {b"content-length", b"content-type"}
+
+# (output key, input keys, default factory or None, field is a datetime)
+FieldPlan = Tuple[str, Tuple[str, ...], Optional[Any], bool]
+_plans: Dict[Type[BaseModel], List[FieldPlan]] = {}
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """orjson response whose datetimes match Pydantic's output (UTC as "Z")."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def _is_datetime(annotation) -> bool:
+    if annotation is datetime:
+        return True
+    return any(arg is datetime for arg in typing.get_args(annotation))
+
+
+def _plan(model: Type[BaseModel]) -> List[FieldPlan]:
+    plan = _plans.get(model)
+    if plan is None:
+        by_name = model.model_config.get("populate_by_name", False)
+        plan = []
+        for name, field in model.model_fields.items():
+            if field.alias:
+                sources = (field.alias, name) if by_name else (field.alias,)
+            else:
+                sources = (name,)
+            default = None if field.is_required() else field
+            plan.append((field.alias or name, sources, default, _is_datetime(field.annotation)))
+        _plans[model] = plan
+    return plan
+
+
+def shape_documents(model: Type[BaseModel], docs: Iterable[dict], fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
+    """Project documents onto ``model``'s fields and aliases, as the
+    response_model would, without validating them.
+
+    Missing optional fields get their defaults, unknown keys (``_id``, legacy
+    fields) are dropped and ISO strings in datetime fields are parsed so they
+    serialize like Pydantic's output. Values are otherwise trusted as stored.
+    ``fields`` limits the output to those response keys.
+    """
+    plan = _plan(model)
+    if fields is not None:
+        plan = [entry for entry in plan if entry[0] in fields]
+    shaped = []
+    for doc in docs:
+        out = {}
+        for key, sources, default, is_datetime in plan:
+            for source in sources:
+                if source in doc:
+                    value = doc[source]
+                    if is_datetime and isinstance(value, str):
+                        value = datetime.fromisoformat(value)
+                    out[key] = value
+                    break
+            else:
+                if default is not None:
+                    out[key] = default.get_default(call_default_factory=True)
+        shaped.append(out)
+    return shaped
+
+
+def document_response(model: Type[BaseModel], docs: List[dict], response: Optional[Response] = None,
+                      fields: Optional[Tuple[str, ...]] = None):
+    """Return ``docs`` for a ``response_model=List[model]`` route.
+
+    With FAST_JSON off (and no ``fields`` selection) the documents are
+    returned unchanged and FastAPI validates and encodes them. Otherwise they
+    are shaped and serialized here; FastAPI passes Response objects through
+    untouched, so the route's declared response_model (and the OpenAPI schema)
+    stay the same. Partial documents from a ``fields`` selection always take
+    this path, since they would not validate against the full model. Headers
+    set on the injected ``response`` are carried over.
+    """
+    if not FAST_JSON and fields is None:
+        return docs
+    shaped = shape_documents(model, docs, fields)
+    if orjson is not None:
+        fast = TrustedJSONResponse(shaped)
+    else:
+        # Pydantic's encoder, so UTC datetimes end in "Z" as they do on the slow path
+        fast = JSONResponse(to_jsonable_python(shaped))
+    if response is not None:
+        fast.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers if name not in _BODY_HEADERS
+        )
+    return fast
@@ -0,0 +1,170 @@
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Case-insensitive comparison, so "Jane@Example.com" and "jane@example.com"
+# collide on the unique email index.
+EMAIL_COLLATION = {"locale": "en", "strength": 2}
+
+
+def _unique_id() -> IndexModel:
+    return IndexModel([("id", ASCENDING)], name="id_unique", unique=True)
+
+
+# Archived (expired) announcements are deleted by a TTL index after this many
+# days; unset keeps them indefinitely.
+ANNOUNCEMENT_ARCHIVE_TTL_DAYS = os.environ.get('ANNOUNCEMENT_ARCHIVE_TTL_DAYS')
+
+
+def _announcement_archive_ttl() -> List[IndexModel]:
+    if not ANNOUNCEMENT_ARCHIVE_TTL_DAYS:
+        return []
+    return [IndexModel([("archived_at", ASCENDING)], name="archived_at_ttl",
+                       expireAfterSeconds=int(float(ANNOUNCEMENT_ARCHIVE_TTL_DAYS) * 86400))]
+
+
+# Declarative index registry: collection -> indexes the route queries rely on.
+# ensure_indexes() applies it idempotently; create_indexes is a no-op for
+# indexes that already exist with the same options.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "admin_users": [
+        _unique_id(),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "services": [_unique_id()],
+    "case_studies": [_unique_id()],
+    "team_members": [_unique_id()],
+    "testimonials": [_unique_id()],
+    "blog_posts": [
+        _unique_id(),
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True,
+                   partialFilterExpression={"slug": {"$type": "string"}}),
+        IndexModel([("published_date", DESCENDING), ("id", DESCENDING)], name="published_date_id"),
+    ],
+    "contacts": [
+        _unique_id(),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+        IndexModel([("read", ASCENDING)], name="read"),
+    ],
+    "subscribers": [
+        _unique_id(),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True, collation=EMAIL_COLLATION),
+        IndexModel([("subscribed_at", DESCENDING), ("id", DESCENDING)], name="subscribed_at_id"),
+    ],
+    "announcements": [
+        _unique_id(),
+        IndexModel([("active", ASCENDING), ("expires_at", ASCENDING)], name="active_expires_at"),
+        *_announcement_archive_ttl(),
+    ],
+    "partners": [
+        _unique_id(),
+        IndexModel([("priority", ASCENDING)], name="priority"),
+    ],
+    "jobs": [
+        _unique_id(),
+        IndexModel([("active", ASCENDING), ("created_at", DESCENDING)], name="active_created_at"),
+    ],
+    "job_applications": [
+        _unique_id(),
+        IndexModel([("status", ASCENDING), ("applied_at", DESCENDING)], name="status_applied_at"),
+        IndexModel([("applied_at", DESCENDING), ("id", DESCENDING)], name="applied_at_id"),
+        IndexModel([("job_id", ASCENDING), ("applied_at", DESCENDING)], name="job_id_applied_at"),
+    ],
+    "uploads": [_unique_id()],
+}
+
+# Representative query shape for each route, used by index_usage_report().
+ROUTE_QUERIES = [
+    {"route": "GET /api/services", "collection": "services", "filter": {}},
+    {"route": "GET /api/services/{service_id}", "collection": "services", "filter": {"id": "x"}},
+    {"route": "GET /api/blog/{blog_id}", "collection": "blog_posts",
+     "filter": {"$or": [{"id": "x"}, {"slug": "x"}]}},
+    {"route": "GET /api/jobs", "collection": "jobs", "filter": {"active": True}, "sort": {"created_at": -1}},
+    {"route": "GET /api/partners", "collection": "partners", "filter": {}, "sort": {"priority": 1}},
+    {"route": "GET /api/announcements", "collection": "announcements",
+     "filter": {"active": True, "$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime(2000, 1, 1)}}]}},
+    {"route": "POST /api/newsletter/subscribe", "collection": "subscribers",
+     "filter": {"email": "x@example.com"}, "collation": EMAIL_COLLATION},
+    {"route": "POST /api/admin/login", "collection": "admin_users", "filter": {"email": "x@example.com"}},
+    {"route": "PUT /api/admin/*/{id}", "collection": "blog_posts", "filter": {"id": "x"}},
+    {"route": "GET /api/admin/blog", "collection": "blog_posts", "filter": {},
+     "sort": {"published_date": -1, "id": -1}},
+    {"route": "GET /api/admin/contacts", "collection": "contacts", "filter": {},
+     "sort": {"timestamp": -1, "id": -1}},
+    {"route": "GET /api/admin/subscribers", "collection": "subscribers", "filter": {},
+     "sort": {"subscribed_at": -1, "id": -1}},
+    {"route": "GET /api/admin/jobs", "collection": "jobs", "filter": {}, "sort": {"created_at": -1}},
+    {"route": "GET /api/admin/job-applications", "collection": "job_applications", "filter": {},
+     "sort": {"applied_at": -1, "id": -1}},
+    {"route": "GET /api/admin/job-applications?status=", "collection": "job_applications",
+     "filter": {"status": "new"}, "sort": {"applied_at": -1, "id": -1}},
+]
+
+# Full scans of these are expected: the routes return the whole collection.
+_UNFILTERED_OK = {"services", "case_studies", "team_members", "testimonials", "partners"}
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create every index in INDEX_REGISTRY, returning the names per collection.
+
+    A failing index (for example a unique index over existing duplicates) is
+    logged and skipped so the remaining indexes are still created.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection, indexes in INDEX_REGISTRY.items():
+        for index in indexes:
+            try:
+                name = await db[collection].create_indexes([index])
+                created.setdefault(collection, []).extend(name)
+            except OperationFailure as e:
+                logger.warning(f"Could not create index {index.document['name']} on {collection}: {e}")
+    return created
+
+
+def plan_stages(plan: dict) -> List[str]:
+    stages = [plan.get("stage", "")]
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(plan_stages(child))
+    return stages
+
+
+def plan_indexes(plan: dict) -> List[str]:
+    """Names of the indexes a winning plan reads."""
+    names = [plan["indexName"]] if plan.get("indexName") else []
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            names.extend(plan_indexes(plan[key]))
+    for child in plan.get("inputStages", []):
+        names.extend(plan_indexes(child))
+    return names
+
+
+async def index_usage_report(db) -> List[dict]:
+    """Run explain() for every ROUTE_QUERIES entry and flag collection scans."""
+    report = []
+    for query in ROUTE_QUERIES:
+        find = {"find": query["collection"], "filter": query["filter"]}
+        if query.get("sort"):
+            find["sort"] = query["sort"]
+        if query.get("collation"):
+            find["collation"] = query["collation"]
+        entry = {"route": query["route"], "collection": query["collection"]}
+        try:
+            explained = await db.command({"explain": find, "verbosity": "queryPlanner"})
+            stages = plan_stages(explained["queryPlanner"]["winningPlan"])
+            entry["stages"] = [s for s in stages if s]
+            entry["collscan"] = "COLLSCAN" in stages
+            entry["expected"] = entry["collscan"] and not query["filter"] and query["collection"] in _UNFILTERED_OK
+        except (OperationFailure, KeyError) as e:
+            entry["error"] = str(e)
+        report.append(entry)
+    return report
@@ -0,0 +1,105 @@
+"""Management commands for the Trine Solutions backend.
+
+Usage:
+    python manage.py indexes ensure
+    python manage.py indexes report
+    python manage.py seed [mock] [services] [--dry-run] [--overwrite] [--force]
+"""
+import asyncio
+import os
+from pathlib import Path
+from typing import List
+
+import typer
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from indexes import ensure_indexes, index_usage_report
+from seeding import DATASETS, SeedRefused, seed_database
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+cli = typer.Typer(help="Trine Solutions backend management commands")
+indexes_cli = typer.Typer(help="Manage MongoDB indexes")
+cli.add_typer(indexes_cli, name="indexes")
+
+
+def _database():
+    mongo_url = os.environ.get('MONGO_URL')
+    if not mongo_url:
+        typer.echo("Error: MONGO_URL environment variable not set.", err=True)
+        raise typer.Exit(code=1)
+    client = AsyncIOMotorClient(mongo_url)
+    return client, client[os.environ.get('DB_NAME', 'trine_solutions')]
+
+
+def _run(command):
+    client, db = _database()
+    try:
+        return asyncio.run(command(db))
+    finally:
+        client.close()
+
+
+@indexes_cli.command("ensure")
+def indexes_ensure():
+    """Create all registered indexes (safe to run repeatedly)."""
+    created = _run(ensure_indexes)
+    for collection, names in sorted(created.items()):
+        typer.echo(f"{collection}: {', '.join(names)}")
+
+
+@indexes_cli.command("report")
+def indexes_report():
+    """Explain every route query and flag any that still scan the collection."""
+    report = _run(index_usage_report)
+    problems = 0
+    for entry in report:
+        if "error" in entry:
+            status = "ERROR"
+            detail = entry["error"]
+        elif entry["collscan"] and not entry["expected"]:
+            status = "COLLSCAN"
+            detail = " > ".join(entry["stages"])
+            problems += 1
+        else:
+            status = "ok"
+            detail = " > ".join(entry["stages"])
+        typer.echo(f"[{status:>8}] {entry['route']} ({entry['collection']}): {detail}")
+    if problems:
+        raise typer.Exit(code=1)
+
+
+@cli.command("seed")
+def seed(
+    datasets: List[str] = typer.Argument(None, help=f"Datasets to seed: {', '.join(DATASETS)} (default: mock)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change without writing"),
+    overwrite: bool = typer.Option(False, "--overwrite", help="Also reset fields edited since the last seed"),
+    force: bool = typer.Option(False, "--force", help="Add demo content to collections holding other data"),
+):
+    """Insert missing seed documents and fill in missing fields (safe to run repeatedly)."""
+    datasets = datasets or ["mock"]
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown:
+        typer.echo(f"Error: unknown dataset(s) {', '.join(unknown)}; choose from {', '.join(DATASETS)}", err=True)
+        raise typer.Exit(code=1)
+    seeds = [seed for name in datasets for seed in DATASETS[name]()]
+    try:
+        plans = _run(lambda db: seed_database(db, seeds, dry_run=dry_run, overwrite=overwrite, force=force))
+    except SeedRefused as e:
+        typer.echo(f"Error: not seeding demo content, {e}; rerun with --force to add it anyway", err=True)
+        raise typer.Exit(code=1)
+    inserted, updated = ("would insert", "would update") if dry_run else ("inserted", "updated")
+    for plan in plans:
+        typer.echo(f"{plan.seed.collection}: {len(plan.inserts)} {inserted}, {len(plan.updates)} {updated}, "
+                   f"{plan.unchanged} unchanged")
+        for doc, changes in plan.updates:
+            key = ", ".join(str(doc[field]) for field in plan.seed.key)
+            typer.echo(f"    {key}: {', '.join(sorted(changes))}")
+        if plan.kept:
+            typer.echo(f"    {len(plan.kept)} edited since seeding and kept; --overwrite resets them")
+
+
+if __name__ == "__main__":
+    cli()
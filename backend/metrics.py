@@ -0,0 +1,259 @@
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+# /metrics must be read with METRICS_TOKEN as a bearer token. Serving it
+# without one has to be opted into with METRICS_ALLOW_ANONYMOUS (local
+# scraping); otherwise the endpoint and the instrumentation behind it are off.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_ALLOW_ANONYMOUS = os.environ.get('METRICS_ALLOW_ANONYMOUS', 'false').lower() == 'true'
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+if METRICS_ENABLED and not (METRICS_TOKEN or METRICS_ALLOW_ANONYMOUS):
+    logger.warning("Metrics disabled: set METRICS_TOKEN (or METRICS_ALLOW_ANONYMOUS=true) to serve /metrics")
+    METRICS_ENABLED = False
+# How often the event-loop lag probe wakes up, in seconds
+METRICS_LOOP_LAG_INTERVAL = float(os.environ.get('METRICS_LOOP_LAG_INTERVAL', '1'))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        # Updated from request handlers and from pymongo's monitoring threads
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = HTTP_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items())
+        lines = self._header()
+        names = self.label_names + ("le",)
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            base = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests_total = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests handled, by route template and status.", ("method", "route", "status")))
+http_request_duration = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.", ("method", "route"),
+    HTTP_BUCKETS))
+http_requests_in_flight = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("method",)))
+mongo_command_duration = REGISTRY.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round trips as measured by the driver.",
+    ("command", "collection"), MONGO_BUCKETS))
+mongo_command_errors = REGISTRY.register(Counter(
+    "mongodb_command_errors_total", "MongoDB commands that failed.", ("command", "collection")))
+event_loop_lag = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer; high values mean blocking work on the loop.",
+    (), LOOP_LAG_BUCKETS))
+process_start_time = REGISTRY.register(Gauge(
+    "process_start_time_seconds", "Start time of the process since the Unix epoch."))
+process_start_time.set(time.time())
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, so label values stay bounded.
+
+    FastAPI records the route in the scope while routing; responses produced
+    before routing (cached bodies, CORS preflights) are matched here instead.
+    """
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match != Match.NONE:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Counts, times and tracks in-flight HTTP requests (pure ASGI)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            route = route_template(scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration.observe(elapsed, method, route)
+
+
+def _command_collection(event: monitoring.CommandStartedEvent) -> str:
+    if event.command_name == "getMore":
+        target = event.command.get("collection")
+    else:
+        target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else "none"
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener (passed to the Motor client) recording command
+    durations and failures per command name and collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = _command_collection(event)
+
+    def _finished(self, event) -> str:
+        with self._lock:
+            return self._collections.pop((event.connection_id, event.request_id), "none")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._finished(event)
+        mongo_command_duration.observe(event.duration_micros / 1e6, event.command_name, collection)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._finished(event)
+        mongo_command_duration.observe(event.duration_micros / 1e6, event.command_name, collection)
+        mongo_command_errors.inc(event.command_name, collection)
+
+
+async def monitor_event_loop(interval: float = METRICS_LOOP_LAG_INTERVAL) -> None:
+    """Record how far past its deadline each ``interval`` sleep wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(loop.time() - start - interval, 0.0))
@@ -0,0 +1,87 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+# Filtered totals are counted up to this many documents and reported as
+# estimated beyond it, so the count never costs more than a bounded scan.
+PAGINATION_COUNT_LIMIT = int(os.environ.get('PAGINATION_COUNT_LIMIT', '10000'))
+PAGINATION_MAX_LIMIT = 1000
+
+
+def encode_cursor(value: Any, doc_id: str) -> str:
+    if isinstance(value, datetime):
+        payload = {"t": "d", "v": value.isoformat(), "id": doc_id}
+    else:
+        payload = {"t": "s" if isinstance(value, str) else "n", "v": value, "id": doc_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = payload["v"]
+        if payload["t"] == "d":
+            value = datetime.fromisoformat(value)
+        return value, payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_filter(field: str, value: Any, doc_id: str) -> dict:
+    """Documents strictly after (value, doc_id) in descending (field, id) order.
+
+    Some collections hold a mix of BSON dates and ISO strings for the same
+    field. Mongo sorts dates above strings and strings above null/missing,
+    and range operators only compare within one type, so the lower type
+    brackets are added explicitly.
+    """
+    if value is None:
+        return {field: None, "id": {"$lt": doc_id}}
+    clauses: List[dict] = [
+        {field: {"$lt": value}},
+        {field: value, "id": {"$lt": doc_id}},
+    ]
+    if isinstance(value, datetime):
+        clauses.append({field: {"$type": "string"}})
+    clauses.append({field: None})
+    return {"$or": clauses}
+
+
+async def paginate(collection, query: dict, sort_field: str, limit: int, after: Optional[str],
+                   response: Response, projection: Optional[dict] = None) -> list:
+    """Fetch one keyset page sorted by (sort_field, id) descending.
+
+    The next-page cursor is returned in ``X-Next-Cursor``. The first page also
+    carries ``X-Total-Count``, with ``X-Total-Count-Estimated`` set when the
+    figure is not exact.
+    """
+    page_query = query
+    if after:
+        value, doc_id = decode_cursor(after)
+        page_query = {"$and": [query, keyset_filter(sort_field, value, doc_id)]} if query else keyset_filter(sort_field, value, doc_id)
+
+    docs = await collection.find(page_query, projection or {"_id": 0}) \
+        .sort([(sort_field, -1), ("id", -1)]) \
+        .to_list(limit + 1)
+
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.get(sort_field), last["id"])
+
+    if not after:
+        if query:
+            total = await collection.count_documents(query, limit=PAGINATION_COUNT_LIMIT)
+            estimated = total >= PAGINATION_COUNT_LIMIT
+        else:
+            total = await collection.estimated_document_count()
+            estimated = True
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Count-Estimated"] = "true" if estimated else "false"
+    return docs
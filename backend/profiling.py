@@ -0,0 +1,205 @@
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from pymongo import monitoring
+
+from metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# Requests sending PROFILE_HEADER with an admin bearer token are profiled;
+# PROFILE_SAMPLE_RATE additionally profiles that fraction of all requests.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'true').lower() == 'true'
+PROFILE_HEADER = os.environ.get('PROFILE_HEADER', 'X-Profile')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+# Profiles kept; the oldest are dropped first
+PROFILE_BUFFER_SIZE = int(os.environ.get('PROFILE_BUFFER_SIZE', '20'))
+
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Per-request MongoDB totals, filled by the command listener. Motor runs
+# pymongo in a thread pool with a copy of the caller's context, so the
+# listener sees the object the middleware set.
+_current_profile: ContextVar[Optional["_MongoTotals"]] = ContextVar("current_profile", default=None)
+
+
+class _MongoTotals:
+    __slots__ = ("commands", "seconds")
+
+    def __init__(self):
+        self.commands = 0
+        self.seconds = 0.0
+
+
+class MongoProfileListener(monitoring.CommandListener):
+    """Adds each command's driver round trip to the profiled request, if any."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._add(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._add(event)
+
+    def _add(self, event) -> None:
+        totals = _current_profile.get()
+        if totals is not None:
+            totals.commands += 1
+            totals.seconds += event.duration_micros / 1e6
+
+
+def top_functions(stats_data: bytes, limit: int = 30, sort: str = "cumulative") -> List[dict]:
+    """The ``limit`` most expensive functions of a stored profile."""
+    stats = pstats.Stats(_LoadedProfile(stats_data), stream=io.StringIO())
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, calls, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            "function": f"{filename}:{line}({name})" if line else name,
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        })
+    return rows
+
+
+class _LoadedProfile:
+    # pstats.Stats accepts any object with create_stats() and a stats dict
+    def __init__(self, stats_data: bytes):
+        self.stats = marshal.loads(stats_data)
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """The most recent request profiles, as pstats dumps plus a summary."""
+
+    def __init__(self, capacity: int = PROFILE_BUFFER_SIZE):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def add(self, summary: dict, stats_data: bytes) -> None:
+        with self._lock:
+            self._profiles[summary["id"]] = (summary, stats_data)
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def summaries(self) -> List[dict]:
+        """Stored profiles, newest first."""
+        with self._lock:
+            return [dict(summary) for summary, _ in reversed(self._profiles.values())]
+
+    def get(self, profile_id: str) -> Optional[tuple]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under cProfile (pure ASGI).
+
+    A request is profiled when it carries PROFILE_HEADER and ``authorize``
+    accepts it (the admin bearer token check), or when it falls into the
+    ``sample_rate`` fraction. Every other request costs one header lookup.
+
+    cProfile traces the event loop thread, so one request is profiled at a
+    time and requests arriving meanwhile run unprofiled. Interleaved work of
+    concurrent requests still appears in the profile. Each profile records:
+    - wall_ms: wall-clock time of the request
+    - cpu_ms: CPU time of the event loop thread
+    - await_ms: wall_ms minus cpu_ms, time spent waiting on I/O and threads
+    - mongo_ms: summed MongoDB round trips, from MongoProfileListener
+    The profile id is returned in the X-Profile-Id response header.
+    """
+
+    def __init__(self, app, store: ProfileStore, authorize: Callable[[dict], Awaitable[bool]],
+                 header: str = PROFILE_HEADER, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.header = header.lower().encode("latin-1")
+        self.sample_rate = sample_rate
+        self._active = False
+
+    async def _trigger(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == self.header and value not in (b"", b"0"):
+                return "header" if await self.authorize(scope) else None
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        trigger = await self._trigger(scope)
+        if trigger is None or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (PROFILE_ID_HEADER, profile_id.encode("latin-1"))]}
+            await send(message)
+
+        totals = _MongoTotals()
+        token = _current_profile.set(totals)
+        profiler = cProfile.Profile()
+        self._active = True
+        started_at = datetime.now(timezone.utc)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            self._active = False
+            _current_profile.reset(token)
+            profiler.create_stats()
+            self.store.add({
+                "id": profile_id,
+                "at": started_at.isoformat(),
+                "trigger": trigger,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status": status_code,
+                "wall_ms": round(wall * 1000, 2),
+                "cpu_ms": round(cpu * 1000, 2),
+                "await_ms": round(max(wall - cpu, 0.0) * 1000, 2),
+                "mongo_ms": round(totals.seconds * 1000, 2),
+                "mongo_commands": totals.commands,
+            }, marshal.dumps(profiler.stats))
+            logger.info(f"Profiled {scope['method']} {scope['path']} ({trigger}): {wall * 1000:.1f} ms, id {profile_id}")
@@ -0,0 +1,70 @@
+from typing import Dict, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+LIST_VIEWS = ("full", "summary")
+
+
+def response_keys(model: Type[BaseModel]) -> Dict[str, str]:
+    """Response key (alias or name) -> attribute name for each model field."""
+    return {field.alias or name: name for name, field in model.model_fields.items()}
+
+
+def select_fields(model: Type[BaseModel], fields: Optional[str], view: Optional[str],
+                  summary: Optional[Tuple[str, ...]] = None) -> Optional[Tuple[str, ...]]:
+    """Resolve the ``fields=``/``view=`` query parameters of a list route.
+
+    Returns the response keys to include, or None for the full documents.
+    ``fields`` (comma separated) wins over ``view``; ``id`` is always kept.
+    ``summary`` lists the keys (aliases) ``view=summary`` serves, by default
+    every field.
+    """
+    keys = response_keys(model)
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in keys]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(keys)}",
+            )
+    elif view in (None, "full"):
+        return None
+    elif view == "summary":
+        requested = list(summary or keys)
+    else:
+        raise HTTPException(status_code=400, detail=f"view must be one of: {', '.join(LIST_VIEWS)}")
+    if "id" in keys and "id" not in requested:
+        requested.insert(0, "id")
+    return tuple(dict.fromkeys(requested))
+
+
+def mongo_projection(model: Type[BaseModel], selected: Optional[Tuple[str, ...]], *extra: str) -> dict:
+    """Projection that loads only ``selected`` (plus ``extra`` stored fields,
+    e.g. a pagination sort key). Aliased fields load under both names since
+    documents may be stored with either."""
+    if selected is None:
+        return {"_id": 0}
+    keys = response_keys(model)
+    projection = {"_id": 0}
+    for key in selected:
+        projection[key] = 1
+        projection[keys[key]] = 1
+    for field in extra:
+        projection[field] = 1
+    return projection
+
+
+def list_view(model: Type[BaseModel], summary: Optional[Tuple[str, ...]] = None):
+    """Dependency adding ``fields`` and ``view`` query parameters to a list
+    route; resolves to the selected response keys (None for full documents).
+    ``summary`` is passed on to select_fields()."""
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+        view: Optional[str] = Query(None, description="full (default) or summary"),
+    ) -> Optional[Tuple[str, ...]]:
+        return select_fields(model, fields, view, summary)
+
+    return dependency
@@ -0,0 +1,392 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import os
+import re
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How often each worker checks whether another worker (or a seed run) changed
+# a searched collection; only then is its index rebuilt
+SEARCH_REFRESH_SECONDS = float(os.environ.get('SEARCH_REFRESH_SECONDS', '60'))
+# Per collection; documents beyond it are left out of the index
+SEARCH_MAX_DOCUMENTS = int(os.environ.get('SEARCH_MAX_DOCUMENTS', '10000'))
+
+# collection -> result type, eligibility filter and per-field weights.
+# Fields may hold strings or lists of strings.
+SEARCH_SOURCES = {
+    "blog_posts": {
+        "type": "blog",
+        "filter": {"published": {"$ne": False}},
+        "weights": {"title": 5.0, "tags": 4.0, "excerpt": 2.0, "category": 2.0, "content": 1.0},
+        "snippet_fields": ("excerpt", "content"),
+    },
+    "services": {
+        "type": "service",
+        "filter": {},
+        "weights": {"title": 5.0, "capabilities": 2.5, "description": 2.0, "tools": 1.5, "fullDescription": 1.0},
+        "snippet_fields": ("description", "fullDescription"),
+    },
+    "case_studies": {
+        "type": "case_study",
+        "filter": {},
+        "weights": {"title": 5.0, "industry": 3.0, "technologies": 2.0, "challenge": 1.0, "solution": 1.0,
+                    "results": 1.0},
+        "snippet_fields": ("challenge", "solution", "results"),
+    },
+    "jobs": {
+        "type": "job",
+        "filter": {"active": True},
+        "weights": {"title": 5.0, "department": 3.0, "location": 2.0, "description": 1.0, "requirements": 1.0,
+                    "responsibilities": 1.0},
+        "snippet_fields": ("description",),
+    },
+}
+
+SEARCH_TYPES = {source["type"]: collection for collection, source in SEARCH_SOURCES.items()}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to was were will with".split()
+)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+SNIPPET_RADIUS = 80
+# Prefix matching of the last query term: minimum length and how many
+# vocabulary terms it may expand to (the most widely used ones win).
+PREFIX_MIN_LENGTH = 3
+PREFIX_MAX_EXPANSIONS = 8
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _field_text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+def _eligible(doc: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if isinstance(condition, dict) and "$ne" in condition:
+            if doc.get(field) == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class SearchIndex:
+    """In-process inverted index over the public content collections.
+
+    Postings map a term to the weighted term frequency of every document that
+    contains it, so a query only touches the documents matching its terms.
+    Scoring is BM25 over field-weighted term frequencies.
+
+    Full rebuilds (rebuild_index) tokenize into a fresh index in a worker
+    thread and then take over its contents in one step; writes applied to
+    this index in the meantime are recorded and replayed on top.
+    """
+
+    # Everything a rebuild replaces
+    _STATE = ("_postings", "_doc_terms", "_doc_lengths", "_docs", "_vocabulary", "_vocabulary_dirty",
+              "_total_length", "_norms", "_norms_dirty", "_fallback")
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Tuple[str, str], float]] = defaultdict(dict)
+        self._doc_terms: Dict[Tuple[str, str], List[str]] = {}
+        self._doc_lengths: Dict[Tuple[str, str], float] = {}
+        self._docs: Dict[Tuple[str, str], dict] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._total_length = 0.0
+        # BM25 length normalisation per document, recomputed after writes
+        self._norms: Dict[Tuple[str, str], float] = {}
+        self._norms_dirty = True
+        # Collections currently indexed from their DEFAULT_* fallback content
+        self._fallback: Set[str] = set()
+        self.ready = False
+        # Set when another worker changed a searched collection
+        self.stale = False
+        # (collection, doc id, document or None for a removal) while rebuilding
+        self._journal: Optional[List[Tuple[str, str, Optional[dict]]]] = None
+        self._rebuild: Optional[asyncio.Future] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def index_document(self, collection: str, doc: dict) -> None:
+        """Add or replace a document; documents that no longer qualify
+        (unpublished posts, inactive jobs) are removed."""
+        if self._journal is not None and doc.get("id"):
+            self._journal.append((collection, str(doc["id"]), doc))
+        self._index_document(collection, doc)
+
+    def remove_document(self, collection: str, doc_id: str) -> None:
+        if self._journal is not None:
+            self._journal.append((collection, str(doc_id), None))
+        self._remove_document(collection, doc_id)
+
+    def _index_document(self, collection: str, doc: dict) -> None:
+        source = SEARCH_SOURCES.get(collection)
+        if source is None or not doc.get("id"):
+            return
+        if collection in self._fallback:
+            # First real document: the public routes stop serving the defaults
+            self.replace_collection(collection, [])
+        key = (collection, str(doc["id"]))
+        self._remove_document(collection, key[1])
+        if not _eligible(doc, source["filter"]):
+            return
+
+        frequencies: Dict[str, float] = defaultdict(float)
+        length = 0.0
+        for field, weight in source["weights"].items():
+            tokens = tokenize(_field_text(doc.get(field)))
+            length += weight * len(tokens)
+            for token in tokens:
+                frequencies[token] += weight
+        for term, frequency in frequencies.items():
+            if term not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[term][key] = frequency
+
+        self._doc_terms[key] = list(frequencies)
+        self._doc_lengths[key] = length
+        self._total_length += length
+        self._norms_dirty = True
+        self._docs[key] = {
+            "type": source["type"],
+            "id": key[1],
+            "slug": doc.get("slug"),
+            "title": doc.get("title", ""),
+            "snippet_text": [_field_text(doc.get(f)) for f in source["snippet_fields"]],
+        }
+
+    def _remove_document(self, collection: str, doc_id: str) -> None:
+        key = (collection, str(doc_id))
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+                    self._vocabulary_dirty = True
+        self._total_length -= self._doc_lengths.pop(key, 0.0)
+        self._docs.pop(key, None)
+        self._norms_dirty = True
+
+    def replace_collection(self, collection: str, docs: Iterable[dict], fallback: bool = False) -> None:
+        self._fallback.discard(collection)
+        for key in [k for k in self._docs if k[0] == collection]:
+            self._remove_document(collection, key[1])
+        for doc in docs:
+            self._index_document(collection, doc)
+        if fallback:
+            self._fallback.add(collection)
+
+    def _adopt(self, built: "SearchIndex") -> None:
+        """Take over ``built``'s contents, then replay the writes recorded
+        since the rebuild started. Runs without awaiting, so searches see
+        either the old index or the complete new one."""
+        for name in self._STATE:
+            setattr(self, name, getattr(built, name))
+        journal, self._journal = self._journal or [], None
+        for collection, doc_id, doc in journal:
+            if doc is None:
+                self._remove_document(collection, doc_id)
+            else:
+                self._index_document(collection, doc)
+        self.ready = True
+
+    def _expand(self, term: str) -> List[str]:
+        """The term itself plus vocabulary terms starting with it (for
+        search-as-you-type)."""
+        if len(term) < PREFIX_MIN_LENGTH:
+            return [term]
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff", start)
+        candidates = [t for t in self._vocabulary[start:end] if t != term]
+        longer = heapq.nlargest(PREFIX_MAX_EXPANSIONS, candidates, key=lambda t: len(self._postings[t]))
+        return [term] + longer
+
+    def _length_norms(self) -> Dict[Tuple[str, str], float]:
+        if self._norms_dirty:
+            avg_length = (self._total_length / len(self._docs)) or 1.0
+            self._norms = {key: _K1 * (1 - _B + _B * length / avg_length)
+                           for key, length in self._doc_lengths.items()}
+            self._norms_dirty = False
+        return self._norms
+
+    def search(self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20) -> Tuple[int, List[dict]]:
+        terms = tokenize(query)
+        if not terms or not self._docs:
+            return 0, []
+        collections = None
+        if types:
+            collections = {SEARCH_TYPES[t] for t in types if t in SEARCH_TYPES}
+
+        doc_count = len(self._docs)
+        norms = self._length_norms()
+        scores: Dict[Tuple[str, str], float] = defaultdict(float)
+        matched_terms: List[str] = []
+        for position, term in enumerate(terms):
+            # The last term is treated as a prefix while the user is typing
+            expansions = self._expand(term) if position == len(terms) - 1 else [term]
+            for expanded in expansions:
+                postings = self._postings.get(expanded)
+                if not postings:
+                    continue
+                matched_terms.append(expanded)
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                boost = idf * (_K1 + 1)
+                for key, frequency in postings.items():
+                    if collections is None or key[0] in collections:
+                        scores[key] += boost * frequency / (frequency + norms[key])
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = []
+        for key, score in top:
+            doc = self._docs[key]
+            snippet, highlights = make_snippet(doc["snippet_text"], matched_terms)
+            results.append({
+                "type": doc["type"],
+                "id": doc["id"],
+                "slug": doc["slug"],
+                "title": doc["title"],
+                "snippet": snippet,
+                "highlights": highlights,
+                "score": round(score, 4),
+            })
+        return len(scores), results
+
+
+def make_snippet(texts: List[str], terms: List[str]) -> Tuple[str, List[List[int]]]:
+    """Cut a window around the first matched term and return it together
+    with [start, end) offsets of every matched term inside the window."""
+    if not terms:
+        return next((t for t in texts if t), "")[:2 * SNIPPET_RADIUS], []
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True)) + r")",
+                         re.IGNORECASE)
+    for text in texts:
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = max(0, match.start() - SNIPPET_RADIUS)
+        end = min(len(text), match.end() + SNIPPET_RADIUS)
+        if start > 0:
+            space = text.find(" ", start)
+            start = space + 1 if 0 <= space < match.start() else start
+        if end < len(text):
+            space = text.rfind(" ", match.end(), end)
+            end = space if space > 0 else end
+        window = text[start:end]
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        highlights = [[m.start() + len(prefix), m.end() + len(prefix)] for m in pattern.finditer(window)]
+        return prefix + window + suffix, highlights
+    return next((t for t in texts if t), "")[:2 * SNIPPET_RADIUS], []
+
+
+async def load_collection(db, collection: str) -> List[dict]:
+    source = SEARCH_SOURCES[collection]
+    fields = {field: 1 for field in source["weights"]}
+    fields.update({"_id": 0, "id": 1, "slug": 1, "published": 1, "active": 1})
+    docs = await db[collection].find(source["filter"], fields).to_list(SEARCH_MAX_DOCUMENTS)
+    if len(docs) >= SEARCH_MAX_DOCUMENTS:
+        logger.warning(f"Search index holds only the first {SEARCH_MAX_DOCUMENTS} documents of {collection}; "
+                       f"raise SEARCH_MAX_DOCUMENTS to index the rest")
+    return docs
+
+
+async def load_sources(db, fallbacks: Optional[Dict[str, List[dict]]] = None) -> Dict[str, Tuple[List[dict], bool]]:
+    """collection -> (documents to index, whether they are fallback content).
+    Like the public list routes, a collection with no documents at all is
+    indexed from ``fallbacks``; one holding only ineligible documents (e.g.
+    unpublished posts) indexes nothing."""
+    sources = {}
+    for collection in SEARCH_SOURCES:
+        docs = await load_collection(db, collection)
+        if docs:
+            sources[collection] = (docs, False)
+        elif collection in (fallbacks or {}) and await db[collection].find_one({}, {"_id": 1}) is None:
+            sources[collection] = (fallbacks[collection], True)
+        else:
+            sources[collection] = ([], False)
+    return sources
+
+
+def build_index(sources: Dict[str, Tuple[List[dict], bool]]) -> SearchIndex:
+    index = SearchIndex()
+    for collection, (docs, fallback) in sources.items():
+        index.replace_collection(collection, docs, fallback=fallback)
+    return index
+
+
+async def rebuild_index(index: SearchIndex, db, fallbacks: Optional[Dict[str, List[dict]]] = None) -> None:
+    """Reload every source collection into ``index``.
+
+    Callers arriving while a rebuild runs wait for that one instead of
+    starting their own; if the index was marked stale meanwhile, it runs
+    once more before they return.
+    """
+    if index._rebuild is None:
+        index._rebuild = asyncio.ensure_future(_rebuild(index, db, fallbacks))
+    await asyncio.shield(index._rebuild)
+
+
+async def _rebuild(index: SearchIndex, db, fallbacks: Optional[Dict[str, List[dict]]]) -> None:
+    try:
+        while True:
+            index.stale = False
+            index._journal = []
+            try:
+                sources = await load_sources(db, fallbacks)
+                # Tokenizing thousands of documents would stall the event loop
+                built = await asyncio.to_thread(build_index, sources)
+            except BaseException:
+                index._journal = None
+                raise
+            index._adopt(built)
+            if not index.stale:
+                return
+    finally:
+        index._rebuild = None
+
+
+async def refresh_periodically(index: SearchIndex, db, fallbacks: Optional[Dict[str, List[dict]]] = None,
+                               check_changes: Optional[Callable[[], Awaitable[None]]] = None,
+                               interval: float = SEARCH_REFRESH_SECONDS) -> None:
+    """Build the index, then keep it current.
+
+    Writes through this worker's API update the index per document. Every
+    ``interval`` seconds ``check_changes`` is awaited; it marks the index
+    stale when another worker wrote a searched collection, and only then is
+    the index rebuilt.
+    """
+    while True:
+        if check_changes is not None:
+            try:
+                await check_changes()
+            except Exception as e:
+                logger.error(f"Search index change check failed: {e}")
+        try:
+            if not index.ready or index.stale:
+                await rebuild_index(index, db, fallbacks)
+        except Exception as e:
+            logger.error(f"Search index rebuild failed: {e}")
+        await asyncio.sleep(interval)
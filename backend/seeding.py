@@ -0,0 +1,492 @@
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import UpdateOne
+
+from caching import bump_content_version
+from dashboard_stats import DashboardStats
+
+
+def _slug(title: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SeedRefused(Exception):
+    """Demo content was about to be mixed into collections holding real data."""
+
+    def __init__(self, collections: List[str]):
+        super().__init__(f"{', '.join(collections)} already hold other documents")
+        self.collections = collections
+
+
+class SeedCollection:
+    """Seed documents for one collection.
+
+    ``key`` names the fields identifying a seed document, so reruns find it
+    instead of inserting a copy. A rerun only adds the fields a stored seed
+    document is missing, so edits made through the admin screens survive;
+    seeding with ``overwrite`` resets every field that differs as well.
+    ``on_insert(doc)`` returns the fields set only when a document is first
+    inserted (generated ids and timestamps, and workflow state such as read
+    flags). ``prepare(db)``, if given, runs just before the collection is
+    compared, after the collections seeded before it were written. ``demo``
+    content is refused for a collection holding documents of its own.
+    """
+
+    def __init__(self, collection: str, key: Sequence[str], documents: List[dict],
+                 on_insert: Optional[Callable[[dict], dict]] = None,
+                 prepare: Optional[Callable[..., Awaitable[None]]] = None, demo: bool = False):
+        self.collection = collection
+        self.key = tuple(key)
+        self.documents = documents
+        self.on_insert = on_insert or (lambda doc: {})
+        self.prepare = prepare
+        self.demo = demo
+
+    def identity(self, doc: dict) -> Tuple:
+        return tuple(doc.get(field) for field in self.key)
+
+    def query(self) -> dict:
+        """Matches the stored copies of the seed documents."""
+        if len(self.key) == 1:
+            return {self.key[0]: {"$in": [doc[self.key[0]] for doc in self.documents]}}
+        return {"$or": [{field: doc[field] for field in self.key} for doc in self.documents]}
+
+
+class SeedPlan:
+    """What seeding one collection would change."""
+
+    def __init__(self, seed: SeedCollection):
+        self.seed = seed
+        self.inserts: List[dict] = []
+        # (seed document, {field: new value}) for documents to update
+        self.updates: List[Tuple[dict, dict]] = []
+        # (seed document, fields left as stored) for documents that differ
+        # but were kept, without ``overwrite``
+        self.kept: List[Tuple[dict, List[str]]] = []
+        self.unchanged = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserts or self.updates)
+
+    def operations(self) -> List[UpdateOne]:
+        ops = []
+        for doc in self.inserts:
+            # An upsert rather than an insert, so concurrent runs stay idempotent
+            ops.append(UpdateOne(
+                {field: doc[field] for field in self.seed.key},
+                {"$setOnInsert": {**self.seed.on_insert(doc), **doc}},
+                upsert=True,
+            ))
+        for doc, changes in self.updates:
+            ops.append(UpdateOne({field: doc[field] for field in self.seed.key}, {"$set": changes}))
+        return ops
+
+
+async def plan_collection(db, seed: SeedCollection, overwrite: bool = False) -> SeedPlan:
+    """Compare ``seed`` with the stored documents, with one query."""
+    plan = SeedPlan(seed)
+    projection = {"_id": 0, **{field: 1 for doc in seed.documents for field in doc}}
+    existing = {
+        seed.identity(doc): doc
+        for doc in await db[seed.collection].find(seed.query(), projection).to_list(len(seed.documents) * 2)
+    }
+    for doc in seed.documents:
+        stored = existing.get(seed.identity(doc))
+        if stored is None:
+            plan.inserts.append(doc)
+            continue
+        missing = {field: value for field, value in doc.items() if field not in stored}
+        differing = {field: value for field, value in doc.items() if field in stored and stored[field] != value}
+        changes = {**missing, **differing} if overwrite else missing
+        if changes:
+            plan.updates.append((doc, changes))
+        if differing and not overwrite:
+            plan.kept.append((doc, sorted(differing)))
+        if not changes and not differing:
+            plan.unchanged += 1
+    return plan
+
+
+async def check_demo_targets(db, seeds: List[SeedCollection]) -> None:
+    """Raise SeedRefused if a demo seed's collection holds any document that
+    is not one of the seed documents of this run."""
+    refused = []
+    for name in dict.fromkeys(seed.collection for seed in seeds if seed.demo):
+        collection = db[name]
+        seeded = 0
+        for seed in seeds:
+            if seed.collection == name:
+                seeded += await collection.count_documents(seed.query())
+        if await collection.count_documents({}) > seeded:
+            refused.append(name)
+    if refused:
+        raise SeedRefused(refused)
+
+
+async def seed_database(db, seeds: List[SeedCollection], dry_run: bool = False, overwrite: bool = False,
+                        force: bool = False) -> List[SeedPlan]:
+    """Insert missing seed documents and fill in missing fields, one unordered
+    bulk write per collection; ``overwrite`` also resets fields that differ.
+    Demo seeds raise SeedRefused, before anything is written, when their
+    collections already hold other documents, unless ``force`` is set. With
+    ``dry_run`` nothing is written.
+    """
+    if not force:
+        await check_demo_targets(db, seeds)
+    plans = []
+    for seed in seeds:
+        if seed.prepare is not None:
+            await seed.prepare(db)
+        plan = await plan_collection(db, seed, overwrite)
+        plans.append(plan)
+        if plan.changed and not dry_run:
+            await db[seed.collection].bulk_write(plan.operations(), ordered=False)
+            # Running workers pick the change up and stop answering 304 for it
+            await bump_content_version(db, seed.collection)
+    if not dry_run and any(plan.changed for plan in plans):
+        await DashboardStats(db).reconcile()
+    return plans
+
+
+# ===================== MOCK CONTENT =====================
+
+# Demo content for the admin CRUD screens, formerly inserted at every startup
+
+MOCK_BLOG_POSTS = [
+    {
+        "slug": _slug("Transforming Finance with AI-Driven Insights"),
+        "title": "Transforming Finance with AI-Driven Insights",
+        "excerpt": "How intelligent automation delivers real-time visibility for enterprise finance teams.",
+        "content": (
+            "Discover how Trine Solutions partnered with a global financial institution to modernize "
+            "their finance operations with AI-driven forecasting, anomaly detection, and intelligent "
+            "automation. The engagement delivered a 60% reduction in manual reconciliations and a 3x "
+            "improvement in forecasting accuracy across regions."
+        ),
+        "featured_image": "https://images.unsplash.com/photo-1556740749-887f6717d7e4?auto=format&fit=crop&w=1200&q=80",
+        "gallery_images": [
+            "https://images.unsplash.com/photo-1520607162513-77705c0f0d4a?auto=format&fit=crop&w=1200&q=80",
+            "https://images.unsplash.com/photo-1485827404703-89b55fcc595e?auto=format&fit=crop&w=1200&q=80"
+        ],
+        "post_type": "blog",
+        "author": "Priya Natarajan",
+        "category": "Digital Transformation",
+        "readTime": "7 min read",
+        "tags": ["AI", "Automation", "Finance"],
+        "published": True
+    },
+    {
+        "slug": _slug("Zero Trust Security for Distributed Workforces"),
+        "title": "Zero Trust Security for Distributed Workforces",
+        "excerpt": "A practical roadmap to securing hybrid workplaces without slowing productivity.",
+        "content": (
+            "We break down the five foundational pillars for implementing Zero Trust at scale, lessons learned "
+            "from enterprise rollouts, and the tooling ecosystem we recommend for rapid deployment."
+        ),
+        "featured_image": "https://images.unsplash.com/photo-1535223289827-42f1e9919769?auto=format&fit=crop&w=1200&q=80",
+        "gallery_images": [],
+        "post_type": "blog",
+        "author": "Luis Hernandez",
+        "category": "Cybersecurity",
+        "readTime": "5 min read",
+        "tags": ["Security", "Zero Trust", "Policy"],
+        "published": True
+    }
+]
+
+# Keyed by id like the service catalog, with ids of their own
+MOCK_SERVICES = [
+    {
+        "id": "cloud-native-engineering",
+        "title": "Cloud Native Engineering",
+        "description": "Design, build, and operate resilient cloud-native applications with modern DevOps tooling.",
+        "icon": "Cloud",
+        "capabilities": ["Cloud Architecture", "Container Platforms", "DevSecOps"],
+        "tools": ["AWS", "Azure", "Kubernetes", "Terraform"],
+        "image": "https://images.unsplash.com/photo-1544197150-b99a580bb7a8?w=800",
+        "fullDescription": "Our Cloud Native Engineering services help organizations design, build, and operate resilient cloud-native applications using modern DevOps tooling. We specialize in containerization, microservices architecture, and infrastructure as code to deliver scalable, maintainable solutions."
+    },
+    {
+        "id": "enterprise-ai-acceleration",
+        "title": "Enterprise AI Acceleration",
+        "description": "Bring AI from experimentation to production with governed MLOps and responsible AI frameworks.",
+        "icon": "Cpu",
+        "capabilities": ["Model Strategy", "MLOps", "Responsible AI"],
+        "tools": ["Azure ML", "Vertex AI", "Databricks"],
+        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
+        "fullDescription": "Accelerate your AI journey from experimentation to production with our Enterprise AI services. We implement governed MLOps pipelines and responsible AI frameworks that ensure your machine learning models are scalable, ethical, and deliver real business value."
+    }
+]
+
+MOCK_PARTNERS = [
+    {
+        "name": "Microsoft",
+        "logo_url": "https://logos-world.net/wp-content/uploads/2020/04/Microsoft-Logo-700x394.png",
+        "website": "https://www.microsoft.com",
+        "priority": 1
+    },
+    {
+        "name": "Google Cloud",
+        "logo_url": "https://logos-world.net/wp-content/uploads/2020/09/Google-Cloud-Logo.png",
+        "website": "https://cloud.google.com",
+        "priority": 2
+    }
+]
+
+MOCK_JOBS = [
+    {
+        "title": "Lead Cloud Architect",
+        "department": "Cloud & DevOps",
+        "location": "Remote - North America",
+        "type": "Full-time",
+        "salary": "$150k - $180k USD",
+        "description": "Own the architecture for large-scale cloud transformations across AWS and Azure.",
+        "requirements": [
+            "10+ years in enterprise architecture",
+            "Hands-on with AWS and Azure landing zones",
+            "Strong understanding of security and compliance"
+        ],
+        "responsibilities": [
+            "Design target cloud architectures",
+            "Coach client engineering teams",
+            "Drive roadmap and migration execution"
+        ],
+        "benefits": ["401k match", "Unlimited PTO", "Wellness stipend"],
+        "active": True
+    },
+    {
+        "title": "Senior Data Scientist",
+        "department": "Data & AI",
+        "location": "Toronto, Canada",
+        "type": "Hybrid",
+        "salary": "$130k - $160k CAD",
+        "description": "Build production-grade ML models that power intelligent insights for Fortune 500 clients.",
+        "requirements": [
+            "7+ years in applied data science",
+            "Experience with time-series forecasting",
+            "Comfortable with Python, SQL, and ML Ops"
+        ],
+        "responsibilities": [
+            "Collaborate with product and domain experts",
+            "Ship models into production using best practices",
+            "Monitor drift and continually improve accuracy"
+        ],
+        "benefits": ["Equity program", "Learning budget", "Comprehensive healthcare"],
+        "active": True
+    }
+]
+
+# Each applicant applies to the mock job of the same position
+MOCK_APPLICATIONS = [
+    {
+        "job_title": "Lead Cloud Architect",
+        "name": "Aisha Khan",
+        "email": "aisha.khan@example.com",
+        "phone": "+1-555-0188",
+        "resume_url": "https://res.cloudinary.com/demo/resume/aisha-khan.pdf",
+        "cover_letter": "Excited about scaling enterprise cloud practices with Trine Solutions.",
+        "linkedin_url": "https://www.linkedin.com/in/aishakhan-cloud",
+        "portfolio_url": "https://aishakhan.dev"
+    },
+    {
+        "job_title": "Senior Data Scientist",
+        "name": "Mateo Silva",
+        "email": "mateo.silva@example.com",
+        "phone": "+1-555-0274",
+        "resume_url": "https://res.cloudinary.com/demo/resume/mateo-silva.pdf",
+        "cover_letter": "Data storytelling and production ML are my core strengths.",
+        "linkedin_url": "https://www.linkedin.com/in/mateosilva",
+        "portfolio_url": "https://mateo.ai"
+    }
+]
+
+MOCK_TESTIMONIALS = [
+    {
+        "name": "Samantha Lee",
+        "role": "VP Technology",
+        "company": "GlobalFin",
+        "content": "Trine Solutions transformed our data operations. Their partnership mentality and execution excellence are unmatched.",
+        "avatar": "https://images.unsplash.com/photo-1544723795-3fb6469f5b39?auto=format&fit=crop&w=200&q=80",
+        "image": None,
+        "rating": 5
+    },
+    {
+        "name": "David Chen",
+        "role": "Head of Infrastructure",
+        "company": "InnovateX",
+        "content": "From strategy to delivery, the Trine team helped us launch a secure multi-cloud platform in record time.",
+        "avatar": "https://images.unsplash.com/photo-1502764613149-7f1d229e230f?auto=format&fit=crop&w=200&q=80",
+        "image": None,
+        "rating": 5
+    }
+]
+
+MOCK_ANNOUNCEMENTS = [
+    {
+        "title": "Trine Solutions named Azure Advanced Specialization Partner",
+        "content": "Proud to be recognized for our cloud modernization expertise across regulated industries.",
+        "type": "success"
+    },
+    {
+        "title": "Join us at the CloudNative Summit 2025",
+        "content": "Our CTO is speaking on secure platform engineering. Visit booth #218 for live demos.",
+        "type": "info"
+    }
+]
+
+MOCK_CONTACTS = [
+    {
+        "name": "Evelyn Baker",
+        "email": "evelyn.baker@enterpriseco.com",
+        "company": "Enterprise Co",
+        "message": "Interested in a discovery workshop focused on modernizing our compliance reporting workflows."
+    }
+]
+
+
+def _new_id(doc: dict) -> dict:
+    return {"id": str(uuid.uuid4())}
+
+
+def mock_content() -> List[SeedCollection]:
+    # Applications reference the stored ids of the mock jobs, which are
+    # looked up once the jobs collection has been seeded
+    job_ids: Dict[str, str] = {}
+
+    async def load_job_ids(db) -> None:
+        jobs = await db.jobs.find(
+            {"title": {"$in": [job["title"] for job in MOCK_JOBS]}}, {"_id": 0, "id": 1, "title": 1}
+        ).to_list(None)
+        job_ids.update((job["title"], job["id"]) for job in jobs)
+
+    seeds = [
+        SeedCollection("blog_posts", ("slug",), MOCK_BLOG_POSTS,
+                       lambda doc: {**_new_id(doc), "published_date": _now().strftime("%Y-%m-%d")}),
+        SeedCollection("services", ("id",), MOCK_SERVICES),
+        SeedCollection("partners", ("name",), MOCK_PARTNERS, _new_id),
+        SeedCollection("jobs", ("title",), MOCK_JOBS, lambda doc: {**_new_id(doc), "created_at": _now()}),
+        SeedCollection("job_applications", ("email", "job_title"), MOCK_APPLICATIONS, lambda doc: {
+            **_new_id(doc), "job_id": job_ids.get(doc["job_title"]), "applied_at": _now().isoformat(),
+            "status": "new", "resume_status": "uploaded",
+        }, prepare=load_job_ids),
+        SeedCollection("testimonials", ("name",), MOCK_TESTIMONIALS, _new_id),
+        SeedCollection("announcements", ("title",), MOCK_ANNOUNCEMENTS, lambda doc: {
+            **_new_id(doc), "active": True, "created_at": _now(), "expires_at": None, "archived_at": None,
+        }),
+        SeedCollection("contacts", ("email",), MOCK_CONTACTS,
+                       lambda doc: {**_new_id(doc), "timestamp": _now().isoformat(), "read": False}),
+    ]
+    for seed in seeds:
+        seed.demo = True
+    return seeds
+
+
+# ===================== SERVICE CATALOG =====================
+
+SERVICE_IMAGES = [
+  'https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800',
+  'https://images.unsplash.com/photo-1563986768609-322da13575f3?w=800',
+  'https://images.unsplash.com/photo-1544197150-b99a580bb7a8?w=800',
+  'https://images.unsplash.com/photo-1460925895917-afdab827c52f?w=800',
+  'https://images.unsplash.com/photo-1450101499163-c8848c66ca85?w=800',
+  'https://images.unsplash.com/photo-1581091226825-a6a2a5aee158?w=800',
+]
+
+# The public service catalog (ids "1"-"8"), the "services" dataset
+SERVICE_CATALOG = [
+  {
+    "id": "1",
+    "title": "Software Development",
+    "description": "Custom software solutions tailored to your business needs, from web and mobile apps to enterprise systems.",
+    "icon": "Code2",
+    "capabilities": ["Custom Application Development", "Mobile App Development", "API Integration", "Legacy Modernization"],
+    "tools": ["React", "Node.js", "Python", "Java", ".NET"],
+    "image": SERVICE_IMAGES[0],
+    "fullDescription": "We build robust, scalable, and secure software solutions that drive business growth. Our expert developers leverage the latest technologies to deliver custom applications, mobile apps, and enterprise systems that meet your unique requirements and exceed user expectations."
+  },
+  {
+    "id": "2",
+    "title": "AI/ML",
+    "description": "Harness the power of Artificial Intelligence and Machine Learning to unlock actionable insights and automate processes.",
+    "icon": "Cpu",
+    "capabilities": ["Predictive Analytics", "Natural Language Processing", "Computer Vision", "Recommendation Systems"],
+    "tools": ["TensorFlow", "PyTorch", "Scikit-learn", "OpenCV"],
+    "image": SERVICE_IMAGES[1],
+    "fullDescription": "Transform your data into a strategic asset with our AI and Machine Learning services. We help you build intelligent systems that predict trends, automate complex tasks, and provide deep insights, enabling you to make smarter, data-driven decisions."
+  },
+  {
+    "id": "3",
+    "title": "GenAI",
+    "description": "Leverage Generative AI to create content, code, and designs, revolutionizing creativity and productivity.",
+    "icon": "Sparkles",
+    "capabilities": ["Content Generation", "Code Assistant Implementation", "Conversational AI Agents", "Image & Design Generation"],
+    "tools": ["OpenAI GPT", "Llama", "Midjourney", "LangChain"],
+    "image": SERVICE_IMAGES[2],
+    "fullDescription": "Step into the future of innovation with our Generative AI solutions. We help organizations integrate GenAI to automate content creation, enhance customer interactions with intelligent agents, and accelerate development cycles, unlocking new levels of creativity and efficiency."
+  },
+  {
+    "id": "4",
+    "title": "Cloud & DevOps Solutions",
+    "description": "Accelerate delivery and optimize infrastructure with our comprehensive Cloud and DevOps services.",
+    "icon": "Cloud",
+    "capabilities": ["Cloud Migration & Strategy", "CI/CD Pipeline Automation", "Infrastructure as Code", "Containerization & Orchestration"],
+    "tools": ["AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins"],
+    "image": SERVICE_IMAGES[3],
+    "fullDescription": "Modernize your infrastructure and streamline your development lifecycle. Our Cloud and DevOps experts assist with seamless cloud migrations, automated deployment pipelines, and scalable infrastructure management, ensuring faster time-to-market and higher reliability."
+  },
+  {
+    "id": "5",
+    "title": "Cybersecurity",
+    "description": "Protect your digital assets with robust security strategies, threat detection, and compliance management.",
+    "icon": "Shield",
+    "capabilities": ["Vulnerability Assessments", "Penetration Testing", "Security Operations Center (SOC)", "Compliance Audits"],
+    "tools": ["SIEM", "Firewalls", "Identity & Access Management (IAM)", "Encryption"],
+    "image": SERVICE_IMAGES[4],
+    "fullDescription": "Safeguard your enterprise against evolving cyber threats. Our cybersecurity services provide end-to-end protection, from risk assessments and threat monitoring to incident response and compliance management, ensuring your business remains secure and resilient."
+  },
+  {
+    "id": "6",
+    "title": "ERP Solutions",
+    "description": "Streamline your business operations with integrated Enterprise Resource Planning systems.",
+    "icon": "Layers",
+    "capabilities": ["ERP Implementation", "Module Customization", "System Integration", "Data Migration & Support"],
+    "tools": ["SAP", "Oracle NetSuite", "Microsoft Dynamics 365", "Odoo"],
+    "image": SERVICE_IMAGES[5],
+    "fullDescription": "Optimize your resources and improve operational efficiency with our ERP solutions. We specialize in implementing and customizing ERP systems that integrate finance, HR, supply chain, and customer relations into a unified platform for better visibility and control."
+  },
+  {
+    "id": "7",
+    "title": "Project Management",
+    "description": "Ensure project success with our expert management methodologies, from planning to execution and delivery.",
+    "icon": "Target",
+    "capabilities": ["Agile & Waterfall Methodologies", "Resource Planning", "Risk Management", "Quality Assurance"],
+    "tools": ["Jira", "Asana", "Trello", "Microsoft Project"],
+    "image": SERVICE_IMAGES[0],
+    "fullDescription": "Deliver projects on time and within budget with our professional project management services. Our certified project managers utilize proven methodologies to lead teams, manage risks, and ensure quality deliverables, aligning project outcomes with your strategic business goals."
+  },
+  {
+    "id": "8",
+    "title": "Digital Transformation",
+    "description": "Reimagine your business for the digital age with strategic innovation and technology adoption.",
+    "icon": "Zap",
+    "capabilities": ["Digital Strategy Consulting", "Process Digitization", "Customer Experience Transformation", "Legacy System Modernization"],
+    "tools": ["IoT", "Big Data", "Mobile Technologies", "Cloud Computing"],
+    "image": SERVICE_IMAGES[1],
+    "fullDescription": "Drive sustainable growth and stay competitive by embracing digital transformation. We guide organizations through the adoption of digital technologies to reinvent business models, enhance customer experiences, and improve operational agility."
+  }
+]
+
+
+# Dataset name -> seed collections, for `python manage.py seed`
+DATASETS: Dict[str, Callable[[], List[SeedCollection]]] = {
+    "services": lambda: [SeedCollection("services", ("id",), SERVICE_CATALOG)],
+    "mock": mock_content,
+}
@@ -1,9 +1,12 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request, Response, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request, Response, Form, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import File, UploadFile
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import asyncio
 import os
 import logging
 import re
@@ -15,8 +18,37 @@ from datetime import datetime, timezone, timedelta
 import bcrypt
 from jose import JWTError, jwt
 import secrets
-import cloudinary
-import cloudinary.uploader
+from concurrent.futures import ThreadPoolExecutor
+from announcements import (
+    AnnouncementExpiry, migrate_announcement_dates, parse_expiry, visible_announcements_query,
+)
+from bulk import BULK_MAX_ITEMS, bulk_delete, bulk_update, unique_ids
+from caching import (
+    BUILD_ID, CachedBody, ContentVersions, HttpCachePolicy, ResponseCache, etag_matches, http_date, make_etag,
+    not_modified_since, query_key,
+)
+from cors import CORSLayer
+from indexes import EMAIL_COLLATION, ensure_indexes
+from dashboard_stats import DashboardStats
+from exports import date_range_query, export_response
+from fast_json import document_response
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS_ENABLED, METRICS_TOKEN, REGISTRY as METRICS_REGISTRY,
+    MetricsMiddleware, MongoCommandMetrics, monitor_event_loop,
+)
+from pagination import PAGINATION_MAX_LIMIT, paginate
+from profiling import (
+    PROFILE_HEADER, PROFILE_SAMPLE_RATE, PROFILING_ENABLED, MongoProfileListener, ProfileStore, ProfilingMiddleware,
+    top_functions,
+)
+from projection import list_view, mongo_projection
+from slow_queries import SLOW_QUERY_ENABLED, RequestContextMiddleware, SlowQueryRecorder
+from search import SEARCH_SOURCES, SEARCH_TYPES, SearchIndex, rebuild_index, refresh_periodically
+from storage import STORAGE_BACKEND, open_database
+from uploads import (
+    IMAGE_MAX_BYTES, MULTIPART_OVERHEAD_BYTES, RESUME_MAX_BYTES, UploadGuardMiddleware, build_upload_service,
+    check_upload_folder, check_upload_size, fail_stale_uploads, spool_upload, upload_contents,
+)
 
 def generate_slug(title: str) -> str:
     return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
@@ -31,39 +63,148 @@ logger = logging.getLogger(__name__)
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# Cloudinary configuration
-CLOUDINARY_ENABLED = False
-try:
-    cloudinary_config = {
-        'cloud_name': os.getenv('CLOUDINARY_CLOUD_NAME'),
-        'api_key': os.getenv('CLOUDINARY_API_KEY'),
-        'api_secret': os.getenv('CLOUDINARY_API_SECRET'),
-    }
-    
-    # Check if all required config values are present
-    if all(cloudinary_config.values()):
-        cloudinary.config(
-            cloud_name=cloudinary_config['cloud_name'],
-            api_key=cloudinary_config['api_key'],
-            api_secret=cloudinary_config['api_secret'],
-            secure=True
-        )
-        CLOUDINARY_ENABLED = True
-        print("Cloudinary configured successfully")
-    else:
-        print("Cloudinary not configured: missing environment variables")
-except Exception as e:
-    print(f"Cloudinary configuration error: {e}")
+# Cloudinary configuration. The SDK is imported and configured on the first
+# upload (uploads.py), not here, to keep it off the import path.
+cloudinary_config = {
+    'cloud_name': os.getenv('CLOUDINARY_CLOUD_NAME'),
+    'api_key': os.getenv('CLOUDINARY_API_KEY'),
+    'api_secret': os.getenv('CLOUDINARY_API_SECRET'),
+}
+
+# Check if all required config values are present
+CLOUDINARY_ENABLED = all(cloudinary_config.values())
+if CLOUDINARY_ENABLED:
+    print("Cloudinary enabled (configured on first upload)")
+else:
+    print("Cloudinary not configured: missing environment variables")
 
-# MongoDB connection
-mongo_url = os.environ.get('MONGO_URL')
-if not mongo_url:
-    logger.error("Required database connection environment variable is not set")
-    raise ValueError("Database connection configuration is missing")
+# Resume and image uploads run on a bounded worker pool (see uploads.py)
+upload_service = build_upload_service(cloudinary_config if CLOUDINARY_ENABLED else None)
 
+# Database connection: MongoDB through Motor, or the in-memory backend with
+# STORAGE_BACKEND=memory (see storage.py)
 db_name = os.environ.get('DB_NAME', 'trine_solutions')
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
+# Records slow commands with their query shape and a sampled explain (slow_queries.py)
+slow_query_log = SlowQueryRecorder()
+# Request profiles taken on demand or by sampling (profiling.py)
+profile_store = ProfileStore()
+
+# Opened by init_database(), from create_app() or at startup, so importing
+# this module neither needs MONGO_URL nor builds a client
+client = None
+db = None
+
+def init_database(database=None) -> None:
+    """Open the database client once and hand it to the objects using it.
+
+    ``database`` is an already-open database to switch to instead (tests and
+    benchmarks pass in-memory ones); whatever was cached from the previous
+    one is dropped.
+    """
+    global client, db
+    if database is not None:
+        client, db = database.client, database
+        content_versions.clear()
+        response_cache.clear()
+        http_body_cache.clear()
+        principal_cache.clear()
+        search_index.ready = False
+    elif db is not None:
+        return
+    else:
+        client, db = open_database(
+            STORAGE_BACKEND, os.environ.get('MONGO_URL'), db_name,
+            event_listeners=(
+                ([MongoCommandMetrics()] if METRICS_ENABLED else [])
+                + ([slow_query_log] if SLOW_QUERY_ENABLED else [])
+                + ([MongoProfileListener()] if PROFILING_ENABLED else [])
+            ),
+        )
+    dashboard_stats.db = db
+    announcement_expiry.db = db
+    content_versions.db = db
+
+# ===================== RESPONSE CACHE =====================
+
+# Public content is read on every page view but only changes through the admin
+# CRUD handlers, which call invalidate_content() after each write. Writes on
+# other workers are noticed through the persisted content versions.
+response_cache = ResponseCache()
+
+def on_content_changed(collection: str) -> None:
+    """Another worker (or a seed run) wrote ``collection``."""
+    response_cache.invalidate(collection)
+    if collection in SEARCH_SOURCES:
+        search_index.stale = True
+
+content_versions = ContentVersions(db, on_change=on_content_changed)
+
+async def cached_find(collection: str, query: dict, sort: Optional[list] = None, limit: int = 100,
+                      projection: Optional[dict] = None) -> list:
+    """Read-through cache around find(query, projection).sort(sort).to_list(limit)."""
+    key = query_key(query, sort, limit, projection)
+    docs = response_cache.get(collection, key)
+    if docs is not None:
+        return docs
+    cursor = db[collection].find(query, projection or {"_id": 0})
+    if sort:
+        cursor = cursor.sort(sort)
+    docs = await cursor.to_list(limit)
+    response_cache.set(collection, key, docs)
+    return docs
+
+# Materialized admin dashboard counters (dashboard_stats.py)
+dashboard_stats = DashboardStats(db)
+
+# Site search index (search.py). Admin writes update it per document; it is
+# rebuilt, off the event loop, only when another worker changed its content.
+search_index = SearchIndex()
+search_refresh_task: Optional[asyncio.Task] = None
+# Event-loop lag probe feeding /metrics
+loop_lag_task: Optional[asyncio.Task] = None
+
+async def rebuild_search_index() -> None:
+    await rebuild_index(search_index, db, SEARCH_FALLBACKS)
+
+async def on_announcements_expired(count: int, boundary: Optional[datetime]) -> None:
+    if count:
+        await dashboard_stats.record_update("announcements")
+        await invalidate_content("announcements")
+        return
+    # Another worker archived them and bumped the version: drop this worker's
+    # copy, bumping only if nobody has since the expiry (it may have died first)
+    response_cache.invalidate("announcements")
+    await content_versions.bump("announcements", unless_since=boundary)
+
+# Deactivates announcements at their expires_at (announcements.py)
+announcement_expiry = AnnouncementExpiry(db, on_announcements_expired)
+
+async def invalidate_content(collection: str) -> None:
+    """Called by admin write handlers once a collection has changed."""
+    response_cache.invalidate(collection)
+    await content_versions.bump(collection)
+
+async def update_content(collection: str, doc_id: str, update_data: dict, not_found: str) -> dict:
+    """Apply an admin edit in one round trip and return the updated document.
+
+    Raises 404 with ``not_found`` when no document has ``doc_id``, then
+    refreshes the dashboard counters, response caches and search index.
+    """
+    if update_data:
+        updated = await db[collection].find_one_and_update(
+            {"id": doc_id},
+            {"$set": update_data},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+    else:
+        updated = await db[collection].find_one({"id": doc_id}, {"_id": 0})
+    if updated is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    await dashboard_stats.record_update(collection)
+    await invalidate_content(collection)
+    search_index.index_document(collection, updated)
+    return updated
 
 # JWT Configuration
 # NOTE: In production, JWT_SECRET_KEY should be set as an environment variable
@@ -72,9 +213,19 @@ SECRET_KEY = os.environ.get('JWT_SECRET_KEY', secrets.token_urlsafe(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# Apply the index registry (indexes.py) on boot; deployments that manage
+# indexes out of band can turn this off and run `python manage.py indexes ensure`
+ENSURE_INDEXES_ON_STARTUP = os.environ.get('ENSURE_INDEXES_ON_STARTUP', 'true').lower() == 'true'
+
 # Security
 security = HTTPBearer()
 
+# Authenticated principals are cached briefly so admin polling doesn't cost an
+# admin_users lookup per request. Tokens carry the user's token_version ("ver")
+# and bumping it revokes them: immediately on this worker, within the TTL elsewhere.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', '30'))
+principal_cache = ResponseCache(ttl=PRINCIPAL_CACHE_TTL_SECONDS, max_entries=1024)
+
 # ===================== AUTH HELPERS =====================
 
 def hash_password(password: str) -> str:
@@ -83,6 +234,35 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+# bcrypt takes a few hundred ms per call, so it runs on a dedicated pool (bcrypt
+# releases the GIL) instead of the event loop. PASSWORD_HASH_CONCURRENCY caps the
+# threads; beyond PASSWORD_HASH_MAX_PENDING queued calls, requests get a 503
+# rather than piling up behind a login burst.
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', '2'))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', '32'))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="bcrypt")
+_password_jobs_pending = 0
+
+async def _run_password_job(func, *args):
+    global _password_jobs_pending
+    if _password_jobs_pending >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _password_jobs_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+    finally:
+        _password_jobs_pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_password_job(verify_password, password, hashed)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -107,14 +287,40 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = await db.admin_users.find_one({"id": user_id}, {"_id": 0})
+    token_version = payload.get("ver", 0)
+
+    cached = principal_cache.get("principals", user_id)
+    if cached is not None and cached[0] == token_version:
+        return cached[1]
+
+    user = await db.admin_users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
     if user is None:
         raise credentials_exception
     if not user.get("is_active", True):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User account is disabled")
-    
-    return AdminUserResponse(**user)
+    if user.get("token_version", 0) != token_version:
+        raise credentials_exception
+
+    principal = AdminUserResponse(**user)
+    principal_cache.set("principals", user_id, (token_version, principal))
+    return principal
+
+async def authorize_profiling(scope) -> bool:
+    """Whether a request asking to be profiled carries a valid admin token."""
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    except HTTPException:
+        return False
+    return True
+
+async def revoke_admin_sessions(user_id: str) -> bool:
+    """Invalidate every token issued to a user by bumping its token_version."""
+    result = await db.admin_users.update_one({"id": user_id}, {"$inc": {"token_version": 1}})
+    principal_cache.discard("principals", user_id)
+    return result.matched_count > 0
 
 # Parse CORS origins from environment variable
 cors_origins_raw = os.environ.get('CORS_ORIGINS', '*').strip()
@@ -151,44 +357,121 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Custom CORS middleware to ensure preflight requests are handled correctly
+# ===================== HTTP CACHING =====================
+
+# Per-route Cache-Control policies for the public GET API. Entries are matched
+# on the route template; path parameters match a single segment.
+HTTP_CACHE_POLICIES = {
+    "/api/services": HttpCachePolicy(("services",)),
+    "/api/services/{service_id}": HttpCachePolicy(("services",)),
+    "/api/case-studies": HttpCachePolicy(("case_studies",)),
+    "/api/blog": HttpCachePolicy(("blog_posts",)),
+    "/api/blog/{blog_id}": HttpCachePolicy(("blog_posts",), max_age=300, stale_while_revalidate=3600),
+    "/api/team": HttpCachePolicy(("team_members",), max_age=300, stale_while_revalidate=3600),
+    "/api/testimonials": HttpCachePolicy(("testimonials",), max_age=300, stale_while_revalidate=3600),
+    "/api/partners": HttpCachePolicy(("partners",), max_age=300, stale_while_revalidate=3600),
+    "/api/jobs": HttpCachePolicy(("jobs",)),
+    "/api/announcements": HttpCachePolicy(("announcements",), max_age=30, stale_while_revalidate=60),
+}
+# ETags and Last-Modified derive from the persisted content versions of these
+# collections, so any worker answers a revalidation the same way. Handlers
+# mark responses that must not be reused (error fallbacks) with no-store.
+
+_http_cache_routes = [
+    (re.compile("^" + re.sub(r"\\{[^}]+\\}", "[^/]+", re.escape(template)) + "$"), policy)
+    for template, policy in HTTP_CACHE_POLICIES.items()
+]
+
+# Serialized response bodies, so a repeat request skips Mongo and response_model
+# serialization entirely. Entries are stale once a collection version moves on.
+http_body_cache = ResponseCache()
+
+def match_http_cache_policy(path: str) -> Optional[HttpCachePolicy]:
+    for pattern, policy in _http_cache_routes:
+        if pattern.match(path):
+            return policy
+    return None
+
+def _validator_headers(etag: str, last_modified: float, policy: HttpCachePolicy) -> dict:
+    headers = {"ETag": etag, "Cache-Control": policy.cache_control}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    return bool(last_modified) and not_modified_since(request.headers.get("if-modified-since"), last_modified)
+
 @app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    response = await call_next(request)
-    
-    # Get the origin from the request
-    origin = request.headers.get("origin", "*")
-    
-    # Set CORS headers
-    response.headers["Access-Control-Allow-Origin"] = origin
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept, Origin, X-Requested-With"
-    response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-    
-    return response
+async def conditional_get(request: Request, call_next):
+    if request.method != "GET":
+        return await call_next(request)
+    policy = match_http_cache_policy(request.url.path)
+    if policy is None:
+        return await call_next(request)
+
+    try:
+        versions, last_modified = await content_versions.snapshot(policy.collections)
+    except Exception as e:
+        logger.warning(f"Content versions unavailable, serving {request.url.path} uncached: {e}")
+        return await call_next(request)
+    key = request.url.path + "?" + request.url.query
+    etag = make_etag(key, versions, BUILD_ID)
+    headers = _validator_headers(etag, last_modified, policy)
+    # Revalidations are answered from the versions alone, without the handler
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body_key = (BUILD_ID, key)
+    entry = http_body_cache.get("http", body_key)
+    if entry is not None and entry.versions == versions:
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
 
-# Add CORS middleware BEFORE including routes
+    response = await call_next(request)
+    if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    entry = CachedBody(versions, etag, last_modified, body,
+                       response.headers.get("content-type", "application/json"))
+    # Announcement bodies must not outlive the next expiry
+    ttl = announcement_expiry.cache_ttl(http_body_cache.ttl) if "announcements" in policy.collections else None
+    # Only keep the entry if no admin write landed while the handler was running
+    if (ttl is None or ttl > 0) and content_versions.current(policy.collections) == versions:
+        http_body_cache.set("http", body_key, entry, ttl=ttl)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+# Reject oversized uploads before the multipart parser buffers them
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=allow_credentials,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["*"] if cors_origins == ["*"] else ["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"],
-    expose_headers=["Content-Length", "Content-Type"],
+    UploadGuardMiddleware,
+    limits={
+        "/api/jobs/apply": RESUME_MAX_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/admin/upload-image": IMAGE_MAX_BYTES + MULTIPART_OVERHEAD_BYTES,
+    },
 )
 
-# Handle preflight OPTIONS requests explicitly
-@app.options("/{rest_of_path:path}")
-async def preflight_handler(request: Request):
-    response = Response()
-    origin = request.headers.get("origin", "*")
-    response.headers["Access-Control-Allow-Origin"] = origin
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept, Origin, X-Requested-With"
-    response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-    return response
+# Each add_middleware() call wraps everything registered before it, so the
+# last one registered runs first.
+
+# Single CORS layer (cors.py): answers preflights itself, with Max-Age so
+# browsers cache them, and adds the CORS headers to every other response.
+# Wraps the upload guard and conditional GETs above.
+app.add_middleware(CORSLayer, origins=cors_origins, allow_credentials=allow_credentials)
+
+# cProfile for requests sent with PROFILE_HEADER by an admin, or sampled at
+# PROFILE_SAMPLE_RATE; results are listed under /api/admin/profiles
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, store=profile_store, authorize=authorize_profiling)
+
+# Lets the slow-query log attribute commands to the route that issued them
+if SLOW_QUERY_ENABLED:
+    app.add_middleware(RequestContextMiddleware)
+
+# Request counts and latency per route template for /metrics (metrics.py).
+# Registered last, so it is outermost and its timings include every layer.
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -200,13 +483,18 @@ admin_router = APIRouter(prefix="/api/admin")
 
 @app.on_event("startup")
 async def startup_event():
-    """Create default admin user if none exists"""
+    """Create indexes and the default admin user if none exists"""
+    # No-op when create_app() already opened it; a missing MONGO_URL fails here
+    init_database()
     try:
+        if ENSURE_INDEXES_ON_STARTUP:
+            await ensure_indexes(db)
+
         admin_count = await db.admin_users.count_documents({})
         if admin_count == 0:
             default_admin = AdminUser(
                 email="admin@trinesolutions.com",
-                password_hash=hash_password("Admin@123"),
+                password_hash=await hash_password_async("Admin@123"),
                 name="System Administrator",
                 role="admin",
                 is_active=True
@@ -221,11 +509,24 @@ async def startup_event():
         else:
             print(f"✅ Found {admin_count} admin user(s) in database")
 
-        await seed_mock_content()
+        await migrate_announcement_dates(db)
+        # Deferred uploads interrupted by a crash or redeploy never finish
+        await fail_stale_uploads(db)
     except Exception as e:
         print(f"⚠️  Error during startup: {e}")
         logger.error(f"Startup error: {e}")
 
+    global search_refresh_task, loop_lag_task
+    # Builds the search index in the background; searches arriving first wait for it
+    search_refresh_task = asyncio.ensure_future(
+        refresh_periodically(search_index, db, SEARCH_FALLBACKS, content_versions.refresh)
+    )
+    announcement_expiry.start()
+    if METRICS_ENABLED:
+        loop_lag_task = asyncio.ensure_future(monitor_event_loop())
+    if SLOW_QUERY_ENABLED:
+        slow_query_log.start(db)
+
 # ===================== MODELS =====================
 
 # Admin User Models
@@ -239,6 +540,7 @@ class AdminUser(BaseModel):
     role: str = "admin"
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     is_active: bool = True
+    token_version: int = 0  # Bumped to revoke previously issued tokens
 
 class AdminUserCreate(BaseModel):
     email: str
@@ -401,7 +703,7 @@ class TestimonialCreate(BaseModel):
     image: Optional[str] = None
     rating: int = 5
 
-class Announcement(BaseModel):
+class PublicAnnouncement(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -412,6 +714,9 @@ class Announcement(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     expires_at: Optional[datetime] = None
 
+class Announcement(PublicAnnouncement):
+    archived_at: Optional[datetime] = None  # set when the expiry scheduler deactivates it
+
 class AnnouncementCreate(BaseModel):
     title: str
     content: str
@@ -486,6 +791,7 @@ class JobApplication(BaseModel):
     portfolio_url: Optional[str] = None
     applied_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: str = "new"  # new, reviewing, interview, rejected, accepted
+    resume_status: str = "uploaded"  # pending, uploaded, failed (deferred uploads)
 
 class JobApplicationCreate(BaseModel):
     job_id: str
@@ -497,6 +803,60 @@ class JobApplicationCreate(BaseModel):
     linkedin_url: Optional[str] = None
     portfolio_url: Optional[str] = None
 
+# Bulk Operation Models
+APPLICATION_STATUSES = ["new", "reviewing", "interview", "rejected", "accepted"]
+
+class BulkIds(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkApplicationStatus(BulkIds):
+    status: str
+
+class BulkContactRead(BulkIds):
+    read: bool = True
+
+class BulkItemResult(BaseModel):
+    id: str
+    status: str  # updated, unchanged, deleted, not_found, failed
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    matched: int
+    modified: int = 0
+    deleted: int = 0
+    results: List[BulkItemResult]
+
+# Fields the list pages render, served by ?view=summary (projection.py)
+SUMMARY_FIELDS = {
+    BlogPost: ("id", "slug", "title", "excerpt", "image", "gallery_images", "post_type", "published_date",
+               "author", "category", "readTime", "tags", "published"),
+    Service: ("id", "title", "description", "icon", "capabilities", "tools", "image"),
+    CaseStudy: ("id", "title", "industry", "challenge", "results", "image", "technologies"),
+    Job: ("id", "title", "department", "location", "type", "salary", "description", "active", "created_at"),
+    ContactForm: ("id", "name", "email", "company", "timestamp", "read"),
+    JobApplication: ("id", "job_id", "job_title", "name", "email", "phone", "resume_url", "applied_at", "status",
+                     "resume_status"),
+    TeamMember: ("id", "name", "position", "image"),
+    Testimonial: ("id", "name", "role", "company", "content", "avatar", "rating"),
+    Partner: ("id", "name", "logo_url", "website"),
+    PublicAnnouncement: ("id", "title", "content", "type"),
+}
+
+# Search Models
+class SearchResult(BaseModel):
+    type: str  # blog, service, case_study, job
+    id: str
+    slug: Optional[str] = None
+    title: str
+    snippet: str
+    highlights: List[List[int]] = []  # [start, end) offsets of matches in snippet
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+
 
 # ===================== DEFAULT SERVICES DATA =====================
 
@@ -682,6 +1042,46 @@ DEFAULT_BLOG_POSTS = [
 # Create a dict for quick lookup by ID
 DEFAULT_BLOG_POSTS_BY_ID = {post["id"]: post for post in DEFAULT_BLOG_POSTS}
 
+DEFAULT_CASE_STUDIES = [
+    {
+        "id": "1",
+        "title": "Global Bank Digital Transformation",
+        "industry": "Banking",
+        "challenge": "Legacy systems hindering digital innovation and customer experience",
+        "solution": "Implemented cloud-native architecture with microservices and AI-powered customer insights",
+        "results": "40% reduction in processing time, 65% increase in customer satisfaction, $12M annual savings",
+        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
+        "technologies": ["AWS", "Kubernetes", "React", "Python", "TensorFlow"]
+    },
+    {
+        "id": "2",
+        "title": "Healthcare Data Security Overhaul",
+        "industry": "Healthcare",
+        "challenge": "Protecting sensitive patient data while ensuring HIPAA compliance",
+        "solution": "Deployed zero-trust security architecture with advanced encryption and monitoring",
+        "results": "100% compliance achievement, Zero security breaches, 30% reduction in security incidents",
+        "image": "https://images.unsplash.com/photo-1576091160399-112ba8d25d1d?w=800",
+        "technologies": ["Azure", "Security Operations Center", "Identity Management", "Encryption"]
+    },
+    {
+        "id": "3",
+        "title": "Retail Supply Chain Optimization",
+        "industry": "Retail",
+        "challenge": "Inefficient inventory management leading to stockouts and excess inventory",
+        "solution": "AI-powered predictive analytics and real-time inventory tracking system",
+        "results": "25% reduction in inventory costs, 50% decrease in stockouts, 35% improvement in forecast accuracy",
+        "image": "https://images.unsplash.com/photo-1441986300917-64674bd600d8?w=800",
+        "technologies": ["Machine Learning", "IoT", "Real-time Analytics", "Cloud Integration"]
+    }
+]
+
+# Content the public routes serve while a collection is empty; search indexes it too
+SEARCH_FALLBACKS = {
+    "services": DEFAULT_SERVICES,
+    "blog_posts": DEFAULT_BLOG_POSTS,
+    "case_studies": DEFAULT_CASE_STUDIES,
+}
+
 # ===================== PUBLIC API ROUTES =====================
 
 @api_router.get("/")
@@ -689,11 +1089,11 @@ async def root():
     return {"message": "Trine Solutions API"}
 
 @api_router.get("/services", response_model=List[Service])
-async def get_services():
-    services = await db.services.find({}, {"_id": 0}).to_list(100)
+async def get_services(selected: Optional[tuple] = Depends(list_view(Service, SUMMARY_FIELDS[Service]))):
+    services = await cached_find("services", {}, projection=mongo_projection(Service, selected))
     if not services:
-        return DEFAULT_SERVICES
-    return services
+        return document_response(Service, DEFAULT_SERVICES, fields=selected)
+    return document_response(Service, services, fields=selected)
 
 @api_router.get("/services/{service_id}", response_model=Service)
 async def get_service_by_id(service_id: str):
@@ -706,54 +1106,22 @@ async def get_service_by_id(service_id: str):
     return service
 
 @api_router.get("/case-studies", response_model=List[CaseStudy])
-async def get_case_studies():
-    studies = await db.case_studies.find({}, {"_id": 0}).to_list(100)
+async def get_case_studies(selected: Optional[tuple] = Depends(list_view(CaseStudy, SUMMARY_FIELDS[CaseStudy]))):
+    studies = await cached_find("case_studies", {}, projection=mongo_projection(CaseStudy, selected))
     if not studies:
-        default_studies = [
-            {
-                "id": "1",
-                "title": "Global Bank Digital Transformation",
-                "industry": "Banking",
-                "challenge": "Legacy systems hindering digital innovation and customer experience",
-                "solution": "Implemented cloud-native architecture with microservices and AI-powered customer insights",
-                "results": "40% reduction in processing time, 65% increase in customer satisfaction, $12M annual savings",
-                "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
-                "technologies": ["AWS", "Kubernetes", "React", "Python", "TensorFlow"]
-            },
-            {
-                "id": "2",
-                "title": "Healthcare Data Security Overhaul",
-                "industry": "Healthcare",
-                "challenge": "Protecting sensitive patient data while ensuring HIPAA compliance",
-                "solution": "Deployed zero-trust security architecture with advanced encryption and monitoring",
-                "results": "100% compliance achievement, Zero security breaches, 30% reduction in security incidents",
-                "image": "https://images.unsplash.com/photo-1576091160399-112ba8d25d1d?w=800",
-                "technologies": ["Azure", "Security Operations Center", "Identity Management", "Encryption"]
-            },
-            {
-                "id": "3",
-                "title": "Retail Supply Chain Optimization",
-                "industry": "Retail",
-                "challenge": "Inefficient inventory management leading to stockouts and excess inventory",
-                "solution": "AI-powered predictive analytics and real-time inventory tracking system",
-                "results": "25% reduction in inventory costs, 50% decrease in stockouts, 35% improvement in forecast accuracy",
-                "image": "https://images.unsplash.com/photo-1441986300917-64674bd600d8?w=800",
-                "technologies": ["Machine Learning", "IoT", "Real-time Analytics", "Cloud Integration"]
-            }
-        ]
-        return default_studies
-    return studies
+        return document_response(CaseStudy, DEFAULT_CASE_STUDIES, fields=selected)
+    return document_response(CaseStudy, studies, fields=selected)
 
 @api_router.get("/blog", response_model=List[BlogPost])
-async def get_blog_posts():
-    posts = await db.blog_posts.find({}, {"_id": 0}).to_list(100)
+async def get_blog_posts(selected: Optional[tuple] = Depends(list_view(BlogPost, SUMMARY_FIELDS[BlogPost]))):
+    posts = await cached_find("blog_posts", {}, projection=mongo_projection(BlogPost, selected))
     if not posts:
-        return DEFAULT_BLOG_POSTS
+        return document_response(BlogPost, DEFAULT_BLOG_POSTS, fields=selected)
     # Transform posts to include 'image' field for frontend compatibility
     for post in posts:
         if 'featured_image' in post and 'image' not in post:
             post['image'] = post['featured_image']
-    return posts
+    return document_response(BlogPost, posts, fields=selected)
 
 @api_router.get("/blog/{blog_id}")
 async def get_blog_post(blog_id: str):
@@ -785,6 +1153,28 @@ async def get_blog_post(blog_id: str):
     # Not found
     raise HTTPException(status_code=404, detail="Blog post not found")
 
+@api_router.get("/search", response_model=SearchResponse)
+async def search_content(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    type: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """Ranked search over blog posts, services, case studies and jobs.
+
+    ``type`` may be repeated to restrict results (blog, service, case_study, job).
+    """
+    if type:
+        unknown = [t for t in type if t not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search type: {', '.join(unknown)}")
+    if not search_index.ready:
+        # Waits for the build started at startup rather than starting another
+        await rebuild_search_index()
+    total, results = search_index.search(q, type, limit)
+    response.headers["Cache-Control"] = "public, max-age=60"
+    return SearchResponse(query=q, total=total, results=results)
+
 @api_router.post("/contact", response_model=ContactForm)
 async def create_contact(input: ContactFormCreate):
     contact_dict = input.model_dump()
@@ -794,34 +1184,41 @@ async def create_contact(input: ContactFormCreate):
     doc['timestamp'] = doc['timestamp'].isoformat()
     
     await db.contacts.insert_one(doc)
+    await dashboard_stats.record_insert("contacts", doc)
     return contact_obj
 
 @api_router.post("/newsletter/subscribe", response_model=Subscriber)
 async def subscribe_newsletter(subscriber_data: SubscriberCreate):
-    # Check if email already exists
-    existing = await db.subscribers.find_one({"email": subscriber_data.email})
-    if existing:
-        # If inactive, reactivate
-        if not existing.get("active", True):
-            await db.subscribers.update_one(
-                {"email": subscriber_data.email},
-                {"$set": {"active": True}}
-            )
-            updated = await db.subscribers.find_one({"email": subscriber_data.email}, {"_id": 0})
-            return Subscriber(**updated)
-        # Already subscribed
-        raise HTTPException(status_code=400, detail="Email already subscribed")
-    
-    subscriber = Subscriber(email=subscriber_data.email)
+    # One atomic upsert against the unique, case-insensitive email index:
+    # inserts new subscribers, reactivates inactive ones, and returns the
+    # document as it was before so the three cases can be told apart.
+    subscriber = Subscriber(email=subscriber_data.email.strip().lower())
     doc = subscriber.model_dump()
     doc['subscribed_at'] = doc['subscribed_at'].isoformat()
-    
-    await db.subscribers.insert_one(doc)
-    return subscriber
+    try:
+        before = await db.subscribers.find_one_and_update(
+            {"email": doc["email"]},
+            {"$set": {"active": True}, "$setOnInsert": {k: v for k, v in doc.items() if k != "active"}},
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+            collation=EMAIL_COLLATION,
+        )
+    except DuplicateKeyError:
+        # A concurrent request inserted the same email first
+        raise HTTPException(status_code=400, detail="Email already subscribed")
+
+    if before is None:
+        await dashboard_stats.record_insert("subscribers", doc)
+        return subscriber
+    if before.get("active", True):
+        raise HTTPException(status_code=400, detail="Email already subscribed")
+    # Reactivated
+    return Subscriber(**{**before, "active": True})
 
 @api_router.get("/team", response_model=List[TeamMember])
-async def get_team():
-    team = await db.team_members.find({}, {"_id": 0}).to_list(100)
+async def get_team(selected: Optional[tuple] = Depends(list_view(TeamMember, SUMMARY_FIELDS[TeamMember]))):
+    team = await cached_find("team_members", {}, projection=mongo_projection(TeamMember, selected))
     if not team:
         default_team = [
             {
@@ -853,30 +1250,27 @@ async def get_team():
                 "image": "https://images.unsplash.com/photo-1580489944761-15a19d4ea984?w=400"
             }
         ]
-        return default_team
-    return team
-
-@api_router.get("/announcements", response_model=List[Announcement])
-async def get_announcements():
-    now = datetime.now(timezone.utc)
-    announcements = await db.announcements.find(
-        {"active": True},
-        {"_id": 0}
-    ).to_list(100)
-    # Filter out expired announcements
-    active_announcements = []
-    for ann in announcements:
-        if ann.get("expires_at"):
-            expires = datetime.fromisoformat(ann["expires_at"].replace('Z', '+00:00')) if isinstance(ann["expires_at"], str) else ann["expires_at"]
-            if expires > now:
-                active_announcements.append(ann)
-        else:
-            active_announcements.append(ann)
-    return active_announcements
+        return document_response(TeamMember, default_team, fields=selected)
+    return document_response(TeamMember, team, fields=selected)
+
+@api_router.get("/announcements", response_model=List[PublicAnnouncement])
+async def get_announcements(selected: Optional[tuple] = Depends(list_view(PublicAnnouncement,
+                                                                          SUMMARY_FIELDS[PublicAnnouncement]))):
+    # Expiry is filtered in Mongo; the cached list lives no longer than the
+    # next expiry, and the expiry scheduler also invalidates it at that moment.
+    # It holds full documents; fields=/view= are applied when serializing.
+    announcements = response_cache.get("announcements", "visible")
+    if announcements is None:
+        now = datetime.now(timezone.utc)
+        announcements = await db.announcements.find(visible_announcements_query(now), {"_id": 0}).to_list(100)
+        ttl = announcement_expiry.cache_ttl(response_cache.ttl)
+        if ttl > 0:
+            response_cache.set("announcements", "visible", announcements, ttl=ttl)
+    return document_response(PublicAnnouncement, announcements, fields=selected)
 
 @api_router.get("/testimonials", response_model=List[Testimonial])
-async def get_testimonials():
-    testimonials = await db.testimonials.find({}, {"_id": 0}).to_list(100)
+async def get_testimonials(selected: Optional[tuple] = Depends(list_view(Testimonial, SUMMARY_FIELDS[Testimonial]))):
+    testimonials = await cached_find("testimonials", {}, projection=mongo_projection(Testimonial, selected))
     if not testimonials:
         default_testimonials = [
             {
@@ -920,8 +1314,8 @@ async def get_testimonials():
                 "rating": 5
             }
         ]
-        return default_testimonials
-    return testimonials
+        return document_response(Testimonial, default_testimonials, fields=selected)
+    return document_response(Testimonial, testimonials, fields=selected)
 
 
 # ===================== ADMIN AUTH ROUTES =====================
@@ -942,7 +1336,7 @@ async def admin_register(user_data: AdminUserCreate):
     # Create user with normalized email
     user = AdminUser(
         email=normalized_email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         name=user_data.name,
         role="admin" if admin_count == 0 else "admin",
         is_active=True
@@ -953,7 +1347,7 @@ async def admin_register(user_data: AdminUserCreate):
     await db.admin_users.insert_one(doc)
     
     # Generate token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": user.id, "ver": user.token_version})
     
     return TokenResponse(
         access_token=access_token,
@@ -975,13 +1369,13 @@ async def admin_login(credentials: AdminUserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not verify_password(credentials.password, user["password_hash"]):
+    if not await verify_password_async(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     if not user.get("is_active", True):
         raise HTTPException(status_code=403, detail="Account is disabled")
     
-    access_token = create_access_token(data={"sub": user["id"]})
+    access_token = create_access_token(data={"sub": user["id"], "ver": user.get("token_version", 0)})
     
     return TokenResponse(
         access_token=access_token,
@@ -1004,49 +1398,102 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)):
         is_active=current_user.get("is_active", True)
     )
 
+@admin_router.post("/users/{user_id}/revoke-sessions")
+async def admin_revoke_sessions(user_id: str, current_user: dict = Depends(get_current_user)):
+    if not await revoke_admin_sessions(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "Sessions revoked successfully"}
+
 
 # ===================== ADMIN CRUD ROUTES =====================
 
 # Dashboard Stats
 @admin_router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
-    blog_count = await db.blog_posts.count_documents({})
-    service_count = await db.services.count_documents({})
-    partner_count = await db.partners.count_documents({})
-
-    total_jobs = await db.jobs.count_documents({})
-    active_jobs = await db.jobs.count_documents({"active": True})
+    return await dashboard_stats.read()
 
-    total_applications = await db.job_applications.count_documents({})
-    new_applications = await db.job_applications.count_documents({"status": "new"})
+@admin_router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(default=50, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """Recent MongoDB commands slower than SLOW_QUERY_MS, newest first"""
+    return {
+        "enabled": SLOW_QUERY_ENABLED,
+        "threshold_ms": slow_query_log.threshold_ms,
+        "capacity": slow_query_log.capacity,
+        "entries": slow_query_log.entries(limit),
+    }
 
-    contact_count = await db.contacts.count_documents({})
-    unread_contacts = await db.contacts.count_documents({"read": False})
+@admin_router.delete("/slow-queries")
+async def clear_slow_queries(current_user: dict = Depends(get_current_user)):
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
 
-    announcement_count = await db.announcements.count_documents({"active": True})
-    testimonial_count = await db.testimonials.count_documents({})
-    subscriber_count = await db.subscribers.count_documents({})
-    
+@admin_router.get("/profiles")
+async def get_profiles(current_user: dict = Depends(get_current_user)):
+    """Stored request profiles, newest first"""
     return {
-        "blog_posts": blog_count,
-        "services": service_count,
-        "partners": partner_count,
-        "total_jobs": total_jobs,
-        "active_jobs": active_jobs,
-        "total_applications": total_applications,
-        "new_applications": new_applications,
-        "total_contacts": contact_count,
-        "unread_contacts": unread_contacts,
-        "active_announcements": announcement_count,
-        "testimonials": testimonial_count,
-        "subscribers": subscriber_count
+        "enabled": PROFILING_ENABLED,
+        "header": PROFILE_HEADER,
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "capacity": profile_store.capacity,
+        "profiles": profile_store.summaries(),
     }
 
+@admin_router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    limit: int = Query(default=30, ge=1, le=500),
+    sort: str = Query(default="cumulative", pattern="^(cumulative|tottime|calls)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """A profile's timings and its most expensive functions"""
+    stored = profile_store.get(profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    summary, stats_data = stored
+    return {**summary, "functions": top_functions(stats_data, limit, sort)}
+
+@admin_router.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str, current_user: dict = Depends(get_current_user)):
+    """The raw profile, readable with pstats or snakeviz"""
+    stored = profile_store.get(profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(
+        content=stored[1],
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'},
+    )
+
+@admin_router.delete("/profiles")
+async def clear_profiles(current_user: dict = Depends(get_current_user)):
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
+
 # Blog Posts CRUD
 @admin_router.get("/blog", response_model=List[BlogPost])
-async def admin_get_blog_posts(current_user: dict = Depends(get_current_user)):
-    posts = await db.blog_posts.find({}, {"_id": 0}).to_list(100)
-    return posts
+async def admin_get_blog_posts(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=PAGINATION_MAX_LIMIT),
+    after: Optional[str] = None,
+    post_type: Optional[str] = None,
+    category: Optional[str] = None,
+    published: Optional[bool] = None,
+    selected: Optional[tuple] = Depends(list_view(BlogPost, SUMMARY_FIELDS[BlogPost])),
+    current_user: dict = Depends(get_current_user)
+):
+    query = {}
+    if post_type is not None:
+        query["post_type"] = post_type
+    if category is not None:
+        query["category"] = category
+    if published is not None:
+        query["published"] = published
+    docs = await paginate(db.blog_posts, query, "published_date", limit, after, response,
+                          mongo_projection(BlogPost, selected, "published_date"))
+    return document_response(BlogPost, docs, response, fields=selected)
 
 @admin_router.post("/blog", response_model=BlogPost)
 async def admin_create_blog_post(post_data: BlogPostCreate, current_user: dict = Depends(get_current_user)):
@@ -1056,54 +1503,59 @@ async def admin_create_blog_post(post_data: BlogPostCreate, current_user: dict =
         
     post = BlogPost(**post_dict)
     doc = post.model_dump()
-    await db.blog_posts.insert_one(doc)
+    try:
+        await db.blog_posts.insert_one(doc)
+    except DuplicateKeyError:
+        # slug_unique index (indexes.py)
+        raise HTTPException(status_code=400, detail="Slug already exists")
+    await dashboard_stats.record_insert("blog_posts", doc)
+    await invalidate_content("blog_posts")
+    search_index.index_document("blog_posts", doc)
     return post
 
 @admin_router.put("/blog/{post_id}", response_model=BlogPost)
 async def admin_update_blog_post(post_id: str, post_data: BlogPostCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.blog_posts.find_one({"id": post_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Blog post not found")
-    
     update_data = post_data.model_dump()
     if not update_data.get("slug"):
         update_data["slug"] = generate_slug(update_data["title"])
         
-    await db.blog_posts.update_one({"id": post_id}, {"$set": update_data})
-    
-    updated = await db.blog_posts.find_one({"id": post_id}, {"_id": 0})
+    try:
+        updated = await update_content("blog_posts", post_id, update_data, "Blog post not found")
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Slug already exists")
     return BlogPost(**updated)
 
 @admin_router.delete("/blog/{post_id}")
 async def admin_delete_blog_post(post_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.blog_posts.delete_one({"id": post_id})
-    if result.deleted_count == 0:
+    deleted = await db.blog_posts.find_one_and_delete({"id": post_id}, projection=dashboard_stats.projection("blog_posts"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Blog post not found")
+    await dashboard_stats.record_delete("blog_posts", deleted)
+    await invalidate_content("blog_posts")
+    search_index.remove_document("blog_posts", post_id)
     return {"message": "Blog post deleted successfully"}
 
 # Case Studies CRUD
 @admin_router.get("/case-studies", response_model=List[CaseStudy])
-async def admin_get_case_studies(current_user: dict = Depends(get_current_user)):
-    studies = await db.case_studies.find({}, {"_id": 0}).to_list(100)
-    return studies
+async def admin_get_case_studies(
+    selected: Optional[tuple] = Depends(list_view(CaseStudy, SUMMARY_FIELDS[CaseStudy])),
+    current_user: dict = Depends(get_current_user)
+):
+    studies = await db.case_studies.find({}, mongo_projection(CaseStudy, selected)).to_list(100)
+    return document_response(CaseStudy, studies, fields=selected)
 
 @admin_router.post("/case-studies", response_model=CaseStudy)
 async def admin_create_case_study(study_data: CaseStudyCreate, current_user: dict = Depends(get_current_user)):
     study = CaseStudy(**study_data.model_dump())
     doc = study.model_dump()
     await db.case_studies.insert_one(doc)
+    await invalidate_content("case_studies")
+    search_index.index_document("case_studies", doc)
     return study
 
 @admin_router.put("/case-studies/{study_id}", response_model=CaseStudy)
 async def admin_update_case_study(study_id: str, study_data: CaseStudyCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.case_studies.find_one({"id": study_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Case study not found")
-    
-    update_data = study_data.model_dump()
-    await db.case_studies.update_one({"id": study_id}, {"$set": update_data})
-    
-    updated = await db.case_studies.find_one({"id": study_id}, {"_id": 0})
+    updated = await update_content("case_studies", study_id, study_data.model_dump(), "Case study not found")
     return CaseStudy(**updated)
 
 @admin_router.delete("/case-studies/{study_id}")
@@ -1111,63 +1563,61 @@ async def admin_delete_case_study(study_id: str, current_user: dict = Depends(ge
     result = await db.case_studies.delete_one({"id": study_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Case study not found")
+    await invalidate_content("case_studies")
+    search_index.remove_document("case_studies", study_id)
     return {"message": "Case study deleted successfully"}
 
 # Services CRUD
 @admin_router.get("/services", response_model=List[Service])
-async def admin_get_services(current_user: dict = Depends(get_current_user)):
-    services = await db.services.find({}, {"_id": 0}).to_list(100)
-    return services
+async def admin_get_services(
+    selected: Optional[tuple] = Depends(list_view(Service, SUMMARY_FIELDS[Service])),
+    current_user: dict = Depends(get_current_user)
+):
+    services = await db.services.find({}, mongo_projection(Service, selected)).to_list(100)
+    return document_response(Service, services, fields=selected)
 
 @admin_router.post("/services", response_model=Service)
 async def admin_create_service(service_data: ServiceCreate, current_user: dict = Depends(get_current_user)):
     service = Service(**service_data.model_dump())
     doc = service.model_dump()
     await db.services.insert_one(doc)
+    await dashboard_stats.record_insert("services", doc)
+    await invalidate_content("services")
+    search_index.index_document("services", doc)
     return service
 
 @admin_router.put("/services/{service_id}", response_model=Service)
 async def admin_update_service(service_id: str, service_data: ServiceCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.services.find_one({"id": service_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    update_data = service_data.model_dump()
-    await db.services.update_one({"id": service_id}, {"$set": update_data})
-    
-    updated = await db.services.find_one({"id": service_id}, {"_id": 0})
+    updated = await update_content("services", service_id, service_data.model_dump(), "Service not found")
     return Service(**updated)
 
 @admin_router.delete("/services/{service_id}")
 async def admin_delete_service(service_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.services.delete_one({"id": service_id})
-    if result.deleted_count == 0:
+    deleted = await db.services.find_one_and_delete({"id": service_id}, projection=dashboard_stats.projection("services"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Service not found")
+    await dashboard_stats.record_delete("services", deleted)
+    await invalidate_content("services")
+    search_index.remove_document("services", service_id)
     return {"message": "Service deleted successfully"}
 
 # Team Members CRUD
 @admin_router.get("/team", response_model=List[TeamMember])
 async def admin_get_team(current_user: dict = Depends(get_current_user)):
     team = await db.team_members.find({}, {"_id": 0}).to_list(100)
-    return team
+    return document_response(TeamMember, team)
 
 @admin_router.post("/team", response_model=TeamMember)
 async def admin_create_team_member(member_data: TeamMemberCreate, current_user: dict = Depends(get_current_user)):
     member = TeamMember(**member_data.model_dump())
     doc = member.model_dump()
     await db.team_members.insert_one(doc)
+    await invalidate_content("team_members")
     return member
 
 @admin_router.put("/team/{member_id}", response_model=TeamMember)
 async def admin_update_team_member(member_id: str, member_data: TeamMemberCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.team_members.find_one({"id": member_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Team member not found")
-    
-    update_data = member_data.model_dump()
-    await db.team_members.update_one({"id": member_id}, {"$set": update_data})
-    
-    updated = await db.team_members.find_one({"id": member_id}, {"_id": 0})
+    updated = await update_content("team_members", member_id, member_data.model_dump(), "Team member not found")
     return TeamMember(**updated)
 
 @admin_router.delete("/team/{member_id}")
@@ -1175,78 +1625,148 @@ async def admin_delete_team_member(member_id: str, current_user: dict = Depends(
     result = await db.team_members.delete_one({"id": member_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Team member not found")
+    await invalidate_content("team_members")
     return {"message": "Team member deleted successfully"}
 
 # Testimonials CRUD
 @admin_router.get("/testimonials", response_model=List[Testimonial])
 async def admin_get_testimonials(current_user: dict = Depends(get_current_user)):
     testimonials = await db.testimonials.find({}, {"_id": 0}).to_list(100)
-    return testimonials
+    return document_response(Testimonial, testimonials)
 
 @admin_router.post("/testimonials", response_model=Testimonial)
 async def admin_create_testimonial(testimonial_data: TestimonialCreate, current_user: dict = Depends(get_current_user)):
     testimonial = Testimonial(**testimonial_data.model_dump())
     doc = testimonial.model_dump()
     await db.testimonials.insert_one(doc)
+    await dashboard_stats.record_insert("testimonials", doc)
+    await invalidate_content("testimonials")
     return testimonial
 
 @admin_router.put("/testimonials/{testimonial_id}", response_model=Testimonial)
 async def admin_update_testimonial(testimonial_id: str, testimonial_data: TestimonialCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.testimonials.find_one({"id": testimonial_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Testimonial not found")
-    
-    update_data = testimonial_data.model_dump()
-    await db.testimonials.update_one({"id": testimonial_id}, {"$set": update_data})
-    
-    updated = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
+    updated = await update_content("testimonials", testimonial_id, testimonial_data.model_dump(), "Testimonial not found")
     return Testimonial(**updated)
 
 @admin_router.delete("/testimonials/{testimonial_id}")
 async def admin_delete_testimonial(testimonial_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.testimonials.delete_one({"id": testimonial_id})
-    if result.deleted_count == 0:
+    deleted = await db.testimonials.find_one_and_delete({"id": testimonial_id}, projection=dashboard_stats.projection("testimonials"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    await dashboard_stats.record_delete("testimonials", deleted)
+    await invalidate_content("testimonials")
     return {"message": "Testimonial deleted successfully"}
 
 # Contacts Management
 @admin_router.get("/contacts", response_model=List[ContactForm])
-async def admin_get_contacts(current_user: dict = Depends(get_current_user)):
-    contacts = await db.contacts.find({}, {"_id": 0}).sort("timestamp", -1).to_list(100)
-    return contacts
+async def admin_get_contacts(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=PAGINATION_MAX_LIMIT),
+    after: Optional[str] = None,
+    read: Optional[bool] = None,
+    selected: Optional[tuple] = Depends(list_view(ContactForm, SUMMARY_FIELDS[ContactForm])),
+    current_user: dict = Depends(get_current_user)
+):
+    query = {} if read is None else {"read": read}
+    docs = await paginate(db.contacts, query, "timestamp", limit, after, response,
+                          mongo_projection(ContactForm, selected, "timestamp"))
+    return document_response(ContactForm, docs, response, fields=selected)
+
+@admin_router.get("/contacts/export")
+async def admin_export_contacts(
+    format: str = "csv",
+    read: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream contact submissions as CSV or NDJSON (format=csv|ndjson)."""
+    query = date_range_query("timestamp", since, until)
+    if read is not None:
+        query["read"] = read
+    columns = ["id", "name", "email", "company", "message", "timestamp", "read"]
+    return export_response(db.contacts, query, columns, [("timestamp", -1), ("id", -1)], format, "contacts")
 
 @admin_router.put("/contacts/{contact_id}/read")
 async def admin_mark_contact_read(contact_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.contacts.update_one({"id": contact_id}, {"$set": {"read": True}})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Contact not found")
+    if result.modified_count:
+        await dashboard_stats.record_update("contacts")
     return {"message": "Contact marked as read"}
 
+@admin_router.post("/contacts/bulk-read", response_model=BulkResult)
+async def admin_bulk_mark_contacts_read(data: BulkContactRead, current_user: dict = Depends(get_current_user)):
+    ids = unique_ids(data.ids)
+    result = await bulk_update(db.contacts, {contact_id: {"read": data.read} for contact_id in ids})
+    if result["modified"]:
+        await dashboard_stats.record_update("contacts")
+    return result
+
 @admin_router.delete("/contacts/{contact_id}")
 async def admin_delete_contact(contact_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.contacts.delete_one({"id": contact_id})
-    if result.deleted_count == 0:
+    deleted = await db.contacts.find_one_and_delete({"id": contact_id}, projection=dashboard_stats.projection("contacts"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await dashboard_stats.record_delete("contacts", deleted)
     return {"message": "Contact deleted successfully"}
 
+@admin_router.post("/contacts/bulk-delete", response_model=BulkResult)
+async def admin_bulk_delete_contacts(data: BulkIds, current_user: dict = Depends(get_current_user)):
+    result, deleted = await bulk_delete(db.contacts, unique_ids(data.ids), dashboard_stats.projection("contacts"))
+    await dashboard_stats.record_delete_many("contacts", deleted)
+    return result
+
 # Subscribers Management
 @admin_router.get("/subscribers", response_model=List[Subscriber])
-async def admin_get_subscribers(current_user: dict = Depends(get_current_user)):
-    subscribers = await db.subscribers.find({}, {"_id": 0}).sort("subscribed_at", -1).to_list(1000)
-    return subscribers
+async def admin_get_subscribers(
+    response: Response,
+    limit: int = Query(default=1000, ge=1, le=PAGINATION_MAX_LIMIT),
+    after: Optional[str] = None,
+    active: Optional[bool] = None,
+    selected: Optional[tuple] = Depends(list_view(Subscriber)),
+    current_user: dict = Depends(get_current_user)
+):
+    query = {} if active is None else {"active": active}
+    docs = await paginate(db.subscribers, query, "subscribed_at", limit, after, response,
+                          mongo_projection(Subscriber, selected, "subscribed_at"))
+    return document_response(Subscriber, docs, response, fields=selected)
+
+@admin_router.get("/subscribers/export")
+async def admin_export_subscribers(
+    format: str = "csv",
+    active: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream every matching subscriber as CSV or NDJSON (format=csv|ndjson)."""
+    query = date_range_query("subscribed_at", since, until)
+    if active is not None:
+        query["active"] = active
+    columns = ["id", "email", "subscribed_at", "active"]
+    return export_response(db.subscribers, query, columns, [("subscribed_at", -1), ("id", -1)], format, "subscribers")
 
 @admin_router.delete("/subscribers/{subscriber_id}")
 async def admin_delete_subscriber(subscriber_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.subscribers.delete_one({"id": subscriber_id})
-    if result.deleted_count == 0:
+    deleted = await db.subscribers.find_one_and_delete({"id": subscriber_id}, projection=dashboard_stats.projection("subscribers"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Subscriber not found")
+    await dashboard_stats.record_delete("subscribers", deleted)
     return {"message": "Subscriber deleted successfully"}
 
+@admin_router.post("/subscribers/bulk-delete", response_model=BulkResult)
+async def admin_bulk_delete_subscribers(data: BulkIds, current_user: dict = Depends(get_current_user)):
+    result, deleted = await bulk_delete(db.subscribers, unique_ids(data.ids), dashboard_stats.projection("subscribers"))
+    await dashboard_stats.record_delete_many("subscribers", deleted)
+    return result
+
 # Announcements CRUD
 @admin_router.get("/announcements", response_model=List[Announcement])
 async def admin_get_announcements(current_user: dict = Depends(get_current_user)):
     announcements = await db.announcements.find({}, {"_id": 0}).to_list(100)
-    return announcements
+    return document_response(Announcement, announcements)
 
 @admin_router.post("/announcements", response_model=Announcement)
 async def admin_create_announcement(ann_data: AnnouncementCreate, current_user: dict = Depends(get_current_user)):
@@ -1255,57 +1775,57 @@ async def admin_create_announcement(ann_data: AnnouncementCreate, current_user:
         content=ann_data.content,
         type=ann_data.type,
         active=ann_data.active,
-        expires_at=datetime.fromisoformat(ann_data.expires_at) if ann_data.expires_at else None
+        expires_at=parse_expiry(ann_data.expires_at)
     )
     doc = announcement.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    if doc['expires_at']:
-        doc['expires_at'] = doc['expires_at'].isoformat()
     await db.announcements.insert_one(doc)
+    await dashboard_stats.record_insert("announcements", doc)
+    await invalidate_content("announcements")
+    announcement_expiry.wake()
     return announcement
 
 @admin_router.put("/announcements/{ann_id}", response_model=Announcement)
 async def admin_update_announcement(ann_id: str, ann_data: AnnouncementCreate, current_user: dict = Depends(get_current_user)):
-    existing = await db.announcements.find_one({"id": ann_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Announcement not found")
-    
     update_data = {
         "title": ann_data.title,
         "content": ann_data.content,
         "type": ann_data.type,
         "active": ann_data.active,
-        "expires_at": ann_data.expires_at
+        "expires_at": parse_expiry(ann_data.expires_at),
+        "archived_at": None
     }
-    await db.announcements.update_one({"id": ann_id}, {"$set": update_data})
-    
-    updated = await db.announcements.find_one({"id": ann_id}, {"_id": 0})
+    updated = await update_content("announcements", ann_id, update_data, "Announcement not found")
+    announcement_expiry.wake()
     return Announcement(**updated)
 
 @admin_router.delete("/announcements/{ann_id}")
 async def admin_delete_announcement(ann_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.announcements.delete_one({"id": ann_id})
-    if result.deleted_count == 0:
+    deleted = await db.announcements.find_one_and_delete({"id": ann_id}, projection=dashboard_stats.projection("announcements"))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Announcement not found")
+    await dashboard_stats.record_delete("announcements", deleted)
+    await invalidate_content("announcements")
     return {"message": "Announcement deleted successfully"}
 
 # Partners CRUD
 @api_router.get("/partners", response_model=List[Partner])
-async def get_partners():
+async def get_partners(selected: Optional[tuple] = Depends(list_view(Partner, SUMMARY_FIELDS[Partner]))):
     try:
-        partners = await db.partners.find({}, {"_id": 0}).sort("priority", 1).to_list(100)
+        partners = await cached_find("partners", {}, sort=[("priority", 1)],
+                                     projection=mongo_projection(Partner, selected))
         # Always return actual partners from database, even if empty
-        return partners
+        return document_response(Partner, partners, fields=selected)
     except Exception as e:
-        # If there's an error accessing the database, return empty array
+        # If there's an error accessing the database, return empty array,
+        # marked so that it is neither cached nor given a validator
         logger.error(f"Error fetching partners: {e}")
-        return []
+        return JSONResponse(content=[], headers={"Cache-Control": "no-store"})
 
 @admin_router.get("/partners", response_model=List[Partner])
 async def admin_get_partners(current_user: dict = Depends(get_current_user)):
     try:
         partners = await db.partners.find({}, {"_id": 0}).sort("priority", 1).to_list(100)
-        return partners
+        return document_response(Partner, partners)
     except Exception as e:
         logger.error(f"Error fetching partners for admin: {e}")
         return []
@@ -1317,6 +1837,8 @@ async def admin_create_partner(partner_data: PartnerCreate, current_user: dict =
         partner = Partner(**partner_data.model_dump())
         doc = partner.model_dump()
         await db.partners.insert_one(doc)
+        await dashboard_stats.record_insert("partners", doc)
+        await invalidate_content("partners")
         return partner
     except Exception as e:
         logger.error(f"Error creating partner: {e}")
@@ -1325,14 +1847,8 @@ async def admin_create_partner(partner_data: PartnerCreate, current_user: dict =
 @admin_router.put("/partners/{partner_id}", response_model=Partner)
 async def admin_update_partner(partner_id: str, partner_data: PartnerUpdate, current_user: dict = Depends(get_current_user)):
     try:
-        existing = await db.partners.find_one({"id": partner_id})
-        if not existing:
-            raise HTTPException(status_code=404, detail="Partner not found")
-        
         update_data = {k: v for k, v in partner_data.model_dump().items() if v is not None}
-        await db.partners.update_one({"id": partner_id}, {"$set": update_data})
-        
-        updated = await db.partners.find_one({"id": partner_id}, {"_id": 0})
+        updated = await update_content("partners", partner_id, update_data, "Partner not found")
         return Partner(**updated)
     except HTTPException:
         raise
@@ -1343,9 +1859,11 @@ async def admin_update_partner(partner_id: str, partner_data: PartnerUpdate, cur
 @admin_router.delete("/partners/{partner_id}")
 async def admin_delete_partner(partner_id: str, current_user: dict = Depends(get_current_user)):
     try:
-        result = await db.partners.delete_one({"id": partner_id})
-        if result.deleted_count == 0:
+        deleted = await db.partners.find_one_and_delete({"id": partner_id}, projection=dashboard_stats.projection("partners"))
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Partner not found")
+        await dashboard_stats.record_delete("partners", deleted)
+        await invalidate_content("partners")
         return {"message": "Partner deleted successfully"}
     except HTTPException:
         raise
@@ -1353,17 +1871,27 @@ async def admin_delete_partner(partner_id: str, current_user: dict = Depends(get
         logger.error(f"Error deleting partner: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete partner: {str(e)}")
 
+@admin_router.post("/partners/reorder", response_model=BulkResult)
+async def admin_reorder_partners(data: BulkIds, current_user: dict = Depends(get_current_user)):
+    """Set partner priorities from the order of ``ids`` (first = 1)."""
+    ids = unique_ids(data.ids)
+    result = await bulk_update(db.partners, {partner_id: {"priority": position} for position, partner_id in enumerate(ids, 1)})
+    if result["modified"]:
+        await invalidate_content("partners")
+    return result
+
 # ===================== JOBS/CAREERS ENDPOINTS =====================
 
 # Public endpoints
 @api_router.get("/jobs", response_model=List[Job])
-async def get_active_jobs():
+async def get_active_jobs(selected: Optional[tuple] = Depends(list_view(Job, SUMMARY_FIELDS[Job]))):
     try:
-        jobs = await db.jobs.find({"active": True}, {"_id": 0}).sort("created_at", -1).to_list(100)
-        return jobs
+        jobs = await cached_find("jobs", {"active": True}, sort=[("created_at", -1)],
+                                 projection=mongo_projection(Job, selected))
+        return document_response(Job, jobs, fields=selected)
     except Exception as e:
         logger.error(f"Error fetching jobs: {e}")
-        return []
+        return JSONResponse(content=[], headers={"Cache-Control": "no-store"})
 
 @api_router.post("/jobs/apply")
 async def submit_job_application(
@@ -1378,6 +1906,8 @@ async def submit_job_application(
     resume: UploadFile = File(...)
 ):
     """Submit job application with resume upload to Cloudinary"""
+    contents = None
+    handed_off = False
     try:
         # Validate file type - accept common document MIME types and also check extension
         allowed_content_types = [
@@ -1398,20 +1928,26 @@ async def submit_job_application(
             logger.warning(f"Invalid file upload - content_type: {resume.content_type}, filename: {filename}")
             raise HTTPException(status_code=400, detail="Only PDF, DOC, or DOCX files are allowed")
         
-        # Validate file size (max 5MB)
-        contents = await resume.read()
-        if len(contents) > 5 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size must be less than 5MB")
+        # Reject resumes over RESUME_MAX_BYTES (5MB)
+        check_upload_size(resume, RESUME_MAX_BYTES)
         
+        # Sanitize filename: remove path separators and limit length
+        safe_filename = re.sub(r'[/\\<>:"|?*]', '_', resume.filename or "resume.pdf")[:100]
+        resume_public_id = f"{name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        resume_status = "uploaded"
+
         # Upload resume to Cloudinary
-        if CLOUDINARY_ENABLED:
+        if upload_service is not None and upload_service.deferred:
+            # Accept the application now; the background job fills in resume_url
+            # from a copy of the file, since the request's own is closed with it
+            contents = await spool_upload(resume, RESUME_MAX_BYTES)
+            resume_url = f"pending_upload:{safe_filename}"
+            resume_status = "pending"
+        elif upload_service is not None:
             try:
-                result = cloudinary.uploader.upload(
-                    contents,
-                    folder="resumes",
-                    resource_type="raw",
-                    public_id=f"{name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                )
+                result = await upload_service.upload(upload_contents(resume, RESUME_MAX_BYTES),
+                                                     folder="resumes", resource_type="raw",
+                                                     public_id=resume_public_id)
                 resume_url = result["secure_url"]
             except Exception as e:
                 logger.error(f"Cloudinary upload error: {e}")
@@ -1419,9 +1955,6 @@ async def submit_job_application(
         else:
             # Fallback: Store application with placeholder resume URL when Cloudinary is not configured
             # The application is still saved so recruiters can contact the applicant
-            resume_filename = resume.filename or "resume.pdf"
-            # Sanitize filename: remove path separators and limit length
-            safe_filename = re.sub(r'[/\\<>:"|?*]', '_', resume_filename)[:100]
             resume_url = f"pending_upload:{safe_filename}"
             logger.warning(f"Cloudinary not configured. Application saved with placeholder resume URL for {name}")
         
@@ -1447,11 +1980,19 @@ async def submit_job_application(
             resume_url=resume_url,
             cover_letter=clean_cover_letter,
             linkedin_url=clean_linkedin_url,
-            portfolio_url=clean_portfolio_url
+            portfolio_url=clean_portfolio_url,
+            resume_status=resume_status
         )
         
         doc = application.model_dump()
         await db.job_applications.insert_one(doc)
+        await dashboard_stats.record_insert("job_applications", doc)
+
+        if resume_status == "pending":
+            upload_service.run_in_background(
+                complete_resume_upload(application.id, contents, resume_public_id)
+            )
+            handed_off = True
         
         return {"message": "Application submitted successfully", "application_id": application.id}
     except HTTPException:
@@ -1459,13 +2000,20 @@ async def submit_job_application(
     except Exception as e:
         logger.error(f"Error submitting job application: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to submit application: {str(e)}")
+    finally:
+        # A deferred upload hands the spool to the background job, which closes it
+        if contents is not None and not handed_off:
+            contents.close()
 
 # Admin endpoints
 @admin_router.get("/jobs", response_model=List[Job])
-async def admin_get_all_jobs(current_user: dict = Depends(get_current_user)):
+async def admin_get_all_jobs(
+    selected: Optional[tuple] = Depends(list_view(Job, SUMMARY_FIELDS[Job])),
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        jobs = await db.jobs.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
-        return jobs
+        jobs = await db.jobs.find({}, mongo_projection(Job, selected)).sort("created_at", -1).to_list(100)
+        return document_response(Job, jobs, fields=selected)
     except Exception as e:
         logger.error(f"Error fetching jobs for admin: {e}")
         return []
@@ -1476,6 +2024,9 @@ async def admin_create_job(job_data: JobCreate, current_user: dict = Depends(get
         job = Job(**job_data.model_dump())
         doc = job.model_dump()
         await db.jobs.insert_one(doc)
+        await dashboard_stats.record_insert("jobs", doc)
+        await invalidate_content("jobs")
+        search_index.index_document("jobs", doc)
         return job
     except Exception as e:
         logger.error(f"Error creating job: {e}")
@@ -1484,14 +2035,7 @@ async def admin_create_job(job_data: JobCreate, current_user: dict = Depends(get
 @admin_router.put("/jobs/{job_id}", response_model=Job)
 async def admin_update_job(job_id: str, job_data: JobCreate, current_user: dict = Depends(get_current_user)):
     try:
-        existing = await db.jobs.find_one({"id": job_id})
-        if not existing:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
-        update_data = job_data.model_dump()
-        await db.jobs.update_one({"id": job_id}, {"$set": update_data})
-        
-        updated = await db.jobs.find_one({"id": job_id}, {"_id": 0})
+        updated = await update_content("jobs", job_id, job_data.model_dump(), "Job not found")
         return Job(**updated)
     except HTTPException:
         raise
@@ -1502,9 +2046,12 @@ async def admin_update_job(job_id: str, job_data: JobCreate, current_user: dict
 @admin_router.delete("/jobs/{job_id}")
 async def admin_delete_job(job_id: str, current_user: dict = Depends(get_current_user)):
     try:
-        result = await db.jobs.delete_one({"id": job_id})
-        if result.deleted_count == 0:
+        deleted = await db.jobs.find_one_and_delete({"id": job_id}, projection=dashboard_stats.projection("jobs"))
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Job not found")
+        await dashboard_stats.record_delete("jobs", deleted)
+        await invalidate_content("jobs")
+        search_index.remove_document("jobs", job_id)
         return {"message": "Job deleted successfully"}
     except HTTPException:
         raise
@@ -1513,14 +2060,50 @@ async def admin_delete_job(job_id: str, current_user: dict = Depends(get_current
         raise HTTPException(status_code=500, detail=f"Failed to delete job: {str(e)}")
 
 @admin_router.get("/job-applications", response_model=List[JobApplication])
-async def admin_get_job_applications(current_user: dict = Depends(get_current_user)):
+async def admin_get_job_applications(
+    response: Response,
+    limit: int = Query(default=500, ge=1, le=PAGINATION_MAX_LIMIT),
+    after: Optional[str] = None,
+    job_id: Optional[str] = None,
+    status: Optional[str] = None,
+    selected: Optional[tuple] = Depends(list_view(JobApplication, SUMMARY_FIELDS[JobApplication])),
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        applications = await db.job_applications.find({}, {"_id": 0}).sort("applied_at", -1).to_list(500)
-        return applications
+        query = {}
+        if job_id is not None:
+            query["job_id"] = job_id
+        if status is not None:
+            query["status"] = status
+        docs = await paginate(db.job_applications, query, "applied_at", limit, after, response,
+                              mongo_projection(JobApplication, selected, "applied_at"))
+        return document_response(JobApplication, docs, response, fields=selected)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching job applications: {e}")
         return []
 
+@admin_router.get("/job-applications/export")
+async def admin_export_job_applications(
+    format: str = "csv",
+    job_id: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream job applications as CSV or NDJSON (format=csv|ndjson)."""
+    query = date_range_query("applied_at", since, until)
+    if job_id is not None:
+        query["job_id"] = job_id
+    if status is not None:
+        query["status"] = status
+    columns = ["id", "job_id", "job_title", "name", "email", "phone", "status", "applied_at", "resume_url",
+               "resume_status", "linkedin_url", "portfolio_url", "cover_letter"]
+    return export_response(db.job_applications, query, columns, [("applied_at", -1), ("id", -1)], format,
+                           "job_applications")
+
 @admin_router.put("/job-applications/{application_id}/status")
 async def admin_update_application_status(
     application_id: str,
@@ -1528,9 +2111,8 @@ async def admin_update_application_status(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        valid_statuses = ["new", "reviewing", "interview", "rejected", "accepted"]
-        if status not in valid_statuses:
-            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if status not in APPLICATION_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}")
         
         result = await db.job_applications.update_one(
             {"id": application_id},
@@ -1539,6 +2121,8 @@ async def admin_update_application_status(
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Application not found")
+        if result.modified_count:
+            await dashboard_stats.record_update("job_applications")
         
         return {"message": "Application status updated successfully"}
     except HTTPException:
@@ -1553,9 +2137,10 @@ async def admin_delete_job_application(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        result = await db.job_applications.delete_one({"id": application_id})
-        if result.deleted_count == 0:
+        deleted = await db.job_applications.find_one_and_delete({"id": application_id}, projection=dashboard_stats.projection("job_applications"))
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Application not found")
+        await dashboard_stats.record_delete("job_applications", deleted)
         return {"message": "Application deleted successfully"}
     except HTTPException:
         raise
@@ -1563,23 +2148,91 @@ async def admin_delete_job_application(
         logger.error(f"Error deleting job application: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete application: {str(e)}")
 
+@admin_router.post("/job-applications/bulk-status", response_model=BulkResult)
+async def admin_bulk_update_application_status(data: BulkApplicationStatus, current_user: dict = Depends(get_current_user)):
+    if data.status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}")
+    ids = unique_ids(data.ids)
+    result = await bulk_update(db.job_applications, {application_id: {"status": data.status} for application_id in ids})
+    if result["modified"]:
+        await dashboard_stats.record_update("job_applications")
+    return result
+
+@admin_router.post("/job-applications/bulk-delete", response_model=BulkResult)
+async def admin_bulk_delete_job_applications(data: BulkIds, current_user: dict = Depends(get_current_user)):
+    result, deleted = await bulk_delete(db.job_applications, unique_ids(data.ids), dashboard_stats.projection("job_applications"))
+    await dashboard_stats.record_delete_many("job_applications", deleted)
+    return result
+
+async def complete_resume_upload(application_id: str, contents, public_id: str):
+    """Background half of a deferred resume upload."""
+    try:
+        result = await upload_service.upload(contents, folder="resumes", resource_type="raw", public_id=public_id)
+        update = {"resume_url": result["secure_url"], "resume_status": "uploaded"}
+    except Exception as e:
+        logger.error(f"Deferred resume upload failed for application {application_id}: {e}")
+        update = {"resume_status": "failed"}
+    finally:
+        contents.close()
+    await db.job_applications.update_one({"id": application_id}, {"$set": update})
+
+async def complete_image_upload(upload_id: str, contents, folder: str):
+    """Background half of a deferred image upload."""
+    try:
+        result = await upload_service.upload(contents, folder=folder, resource_type="image")
+        update = {
+            "status": "uploaded",
+            "url": result["secure_url"],
+            "public_id": result["public_id"],
+            "format": result.get("format"),
+            "width": result.get("width"),
+            "height": result.get("height"),
+        }
+    except Exception as e:
+        logger.error(f"Deferred image upload {upload_id} failed: {e}")
+        update = {"status": "failed", "error": str(e)}
+    finally:
+        contents.close()
+    await db.uploads.update_one({"id": upload_id}, {"$set": update})
+
 # Cloudinary Upload Endpoint
 @admin_router.post("/upload-image")
-async def upload_image_to_cloudinary(file: UploadFile = File(...), folder: str = "partners", current_user: dict = Depends(get_current_user)):
+async def upload_image_to_cloudinary(
+    file: UploadFile = File(...),
+    folder: str = "partners",
+    defer: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
     # Check if Cloudinary is enabled
-    if not CLOUDINARY_ENABLED:
+    if upload_service is None:
         raise HTTPException(status_code=404, detail="Cloudinary upload not configured")
+    # The folder becomes part of a storage path
+    check_upload_folder(folder)
     
+    contents = None
+    deferred = False
     try:
-        # Read the file content
-        contents = await file.read()
+        if defer:
+            # Record the upload as pending and return immediately; poll
+            # GET /api/admin/uploads/{upload_id} for the final URL. The
+            # background job reads a copy, as the request's file is closed with it.
+            contents = await spool_upload(file, IMAGE_MAX_BYTES)
+            upload_id = str(uuid.uuid4())
+            await db.uploads.insert_one({
+                "id": upload_id,
+                "status": "pending",
+                "folder": folder,
+                "filename": file.filename,
+                "created_at": datetime.now(timezone.utc),
+            })
+            upload_service.run_in_background(complete_image_upload(upload_id, contents, folder))
+            deferred = True
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED,
+                                content={"upload_id": upload_id, "status": "pending"})
         
-        # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
-            contents,
-            folder=folder,
-            resource_type="image"
-        )
+        # Upload to Cloudinary straight from the parsed, size-checked file
+        result = await upload_service.upload(upload_contents(file, IMAGE_MAX_BYTES), folder=folder,
+                                             resource_type="image")
         
         return {
             "url": result["secure_url"],
@@ -1588,258 +2241,21 @@ async def upload_image_to_cloudinary(file: UploadFile = File(...), folder: str =
             "width": result["width"],
             "height": result["height"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+    finally:
+        if contents is not None and not deferred:
+            contents.close()
 
+@admin_router.get("/uploads/{upload_id}")
+async def admin_get_upload(upload_id: str, current_user: dict = Depends(get_current_user)):
+    upload = await db.uploads.find_one({"id": upload_id}, {"_id": 0})
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
 
-async def seed_mock_content():
-    """Populate the database with mock data for admin CRUD interfaces."""
-    try:
-        seeded_collections: List[str] = []
-
-        if await db.blog_posts.count_documents({}) == 0:
-            sample_blog_posts = [
-                BlogPost(
-                    title="Transforming Finance with AI-Driven Insights",
-                    slug=generate_slug("Transforming Finance with AI-Driven Insights"),
-                    excerpt="How intelligent automation delivers real-time visibility for enterprise finance teams.",
-                    content=(
-                        "Discover how Trine Solutions partnered with a global financial institution to modernize "
-                        "their finance operations with AI-driven forecasting, anomaly detection, and intelligent "
-                        "automation. The engagement delivered a 60% reduction in manual reconciliations and a 3x "
-                        "improvement in forecasting accuracy across regions."
-                    ),
-                    featured_image="https://images.unsplash.com/photo-1556740749-887f6717d7e4?auto=format&fit=crop&w=1200&q=80",
-                    gallery_images=[
-                        "https://images.unsplash.com/photo-1520607162513-77705c0f0d4a?auto=format&fit=crop&w=1200&q=80",
-                        "https://images.unsplash.com/photo-1485827404703-89b55fcc595e?auto=format&fit=crop&w=1200&q=80"
-                    ],
-                    post_type="blog",
-                    author="Priya Natarajan",
-                    category="Digital Transformation",
-                    readTime="7 min read",
-                    tags=["AI", "Automation", "Finance"],
-                    published=True
-                ),
-                BlogPost(
-                    title="Zero Trust Security for Distributed Workforces",
-                    slug=generate_slug("Zero Trust Security for Distributed Workforces"),
-                    excerpt="A practical roadmap to securing hybrid workplaces without slowing productivity.",
-                    content=(
-                        "We break down the five foundational pillars for implementing Zero Trust at scale, lessons learned "
-                        "from enterprise rollouts, and the tooling ecosystem we recommend for rapid deployment."
-                    ),
-                    featured_image="https://images.unsplash.com/photo-1535223289827-42f1e9919769?auto=format&fit=crop&w=1200&q=80",
-                    post_type="blog",
-                    author="Luis Hernandez",
-                    category="Cybersecurity",
-                    readTime="5 min read",
-                    tags=["Security", "Zero Trust", "Policy"],
-                    published=True
-                )
-            ]
-            await db.blog_posts.insert_many([post.model_dump() for post in sample_blog_posts])
-            seeded_collections.append("blog_posts")
-
-        if await db.services.count_documents({}) == 0:
-            sample_services = [
-                Service(
-                    title="Cloud Native Engineering",
-                    description="Design, build, and operate resilient cloud-native applications with modern DevOps tooling.",
-                    icon="Cloud",
-                    capabilities=["Cloud Architecture", "Container Platforms", "DevSecOps"],
-                    tools=["AWS", "Azure", "Kubernetes", "Terraform"],
-                    image="https://images.unsplash.com/photo-1544197150-b99a580bb7a8?w=800",
-                    fullDescription="Our Cloud Native Engineering services help organizations design, build, and operate resilient cloud-native applications using modern DevOps tooling. We specialize in containerization, microservices architecture, and infrastructure as code to deliver scalable, maintainable solutions."
-                ),
-                Service(
-                    title="Enterprise AI Acceleration",
-                    description="Bring AI from experimentation to production with governed MLOps and responsible AI frameworks.",
-                    icon="Cpu",
-                    capabilities=["Model Strategy", "MLOps", "Responsible AI"],
-                    tools=["Azure ML", "Vertex AI", "Databricks"],
-                    image="https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
-                    fullDescription="Accelerate your AI journey from experimentation to production with our Enterprise AI services. We implement governed MLOps pipelines and responsible AI frameworks that ensure your machine learning models are scalable, ethical, and deliver real business value."
-                )
-            ]
-            await db.services.insert_many([service.model_dump() for service in sample_services])
-            seeded_collections.append("services")
-
-        if await db.partners.count_documents({}) == 0:
-            sample_partners = [
-                Partner(
-                    name="Microsoft",
-                    logo_url="https://logos-world.net/wp-content/uploads/2020/04/Microsoft-Logo-700x394.png",
-                    website="https://www.microsoft.com",
-                    priority=1
-                ),
-                Partner(
-                    name="Google Cloud",
-                    logo_url="https://logos-world.net/wp-content/uploads/2020/09/Google-Cloud-Logo.png",
-                    website="https://cloud.google.com",
-                    priority=2
-                )
-            ]
-            await db.partners.insert_many([partner.model_dump() for partner in sample_partners])
-            seeded_collections.append("partners")
-
-        jobs_seeded = False
-        if await db.jobs.count_documents({}) == 0:
-            sample_jobs = [
-                Job(
-                    title="Lead Cloud Architect",
-                    department="Cloud & DevOps",
-                    location="Remote - North America",
-                    type="Full-time",
-                    salary="$150k - $180k USD",
-                    description="Own the architecture for large-scale cloud transformations across AWS and Azure.",
-                    requirements=[
-                        "10+ years in enterprise architecture",
-                        "Hands-on with AWS and Azure landing zones",
-                        "Strong understanding of security and compliance"
-                    ],
-                    responsibilities=[
-                        "Design target cloud architectures",
-                        "Coach client engineering teams",
-                        "Drive roadmap and migration execution"
-                    ],
-                    benefits=["401k match", "Unlimited PTO", "Wellness stipend"],
-                    active=True
-                ),
-                Job(
-                    title="Senior Data Scientist",
-                    department="Data & AI",
-                    location="Toronto, Canada",
-                    type="Hybrid",
-                    salary="$130k - $160k CAD",
-                    description="Build production-grade ML models that power intelligent insights for Fortune 500 clients.",
-                    requirements=[
-                        "7+ years in applied data science",
-                        "Experience with time-series forecasting",
-                        "Comfortable with Python, SQL, and ML Ops"
-                    ],
-                    responsibilities=[
-                        "Collaborate with product and domain experts",
-                        "Ship models into production using best practices",
-                        "Monitor drift and continually improve accuracy"
-                    ],
-                    benefits=["Equity program", "Learning budget", "Comprehensive healthcare"],
-                    active=True
-                )
-            ]
-            job_docs = [job.model_dump() for job in sample_jobs]
-            await db.jobs.insert_many(job_docs)
-            seeded_collections.append("jobs")
-            jobs_seeded = True
-
-        if await db.job_applications.count_documents({}) == 0:
-            jobs_cursor = await db.jobs.find({}, {"_id": 0}).to_list(2)
-            reference_jobs = jobs_cursor[:2]
-
-            if len(reference_jobs) < 2 and jobs_seeded:
-                reference_jobs = [job.model_dump() for job in sample_jobs]
-
-            if reference_jobs:
-                sample_applications = []
-                applicants = [
-                    {
-                        "name": "Aisha Khan",
-                        "email": "aisha.khan@example.com",
-                        "phone": "+1-555-0188",
-                        "resume_url": "https://res.cloudinary.com/demo/resume/aisha-khan.pdf",
-                        "cover_letter": "Excited about scaling enterprise cloud practices with Trine Solutions.",
-                        "linkedin_url": "https://www.linkedin.com/in/aishakhan-cloud",
-                        "portfolio_url": "https://aishakhan.dev"
-                    },
-                    {
-                        "name": "Mateo Silva",
-                        "email": "mateo.silva@example.com",
-                        "phone": "+1-555-0274",
-                        "resume_url": "https://res.cloudinary.com/demo/resume/mateo-silva.pdf",
-                        "cover_letter": "Data storytelling and production ML are my core strengths.",
-                        "linkedin_url": "https://www.linkedin.com/in/mateosilva",
-                        "portfolio_url": "https://mateo.ai"
-                    }
-                ]
-
-                for applicant, job in zip(applicants, reference_jobs):
-                    application = JobApplication(
-                        job_id=job["id"],
-                        job_title=job["title"],
-                        name=applicant["name"],
-                        email=applicant["email"],
-                        phone=applicant["phone"],
-                        resume_url=applicant["resume_url"],
-                        cover_letter=applicant["cover_letter"],
-                        linkedin_url=applicant["linkedin_url"],
-                        portfolio_url=applicant["portfolio_url"]
-                    )
-                    doc = application.model_dump()
-                    doc["applied_at"] = doc["applied_at"].isoformat()
-                    sample_applications.append(doc)
-
-                if sample_applications:
-                    await db.job_applications.insert_many(sample_applications)
-                    seeded_collections.append("job_applications")
-
-        if await db.testimonials.count_documents({}) == 0:
-            sample_testimonials = [
-                Testimonial(
-                    name="Samantha Lee",
-                    role="VP Technology",
-                    company="GlobalFin",
-                    content="Trine Solutions transformed our data operations. Their partnership mentality and execution excellence are unmatched.",
-                    avatar="https://images.unsplash.com/photo-1544723795-3fb6469f5b39?auto=format&fit=crop&w=200&q=80",
-                    rating=5
-                ),
-                Testimonial(
-                    name="David Chen",
-                    role="Head of Infrastructure",
-                    company="InnovateX",
-                    content="From strategy to delivery, the Trine team helped us launch a secure multi-cloud platform in record time.",
-                    avatar="https://images.unsplash.com/photo-1502764613149-7f1d229e230f?auto=format&fit=crop&w=200&q=80",
-                    rating=5
-                )
-            ]
-            await db.testimonials.insert_many([testimonial.model_dump() for testimonial in sample_testimonials])
-            seeded_collections.append("testimonials")
-
-        if await db.announcements.count_documents({}) == 0:
-            sample_announcements = [
-                Announcement(
-                    title="Trine Solutions named Azure Advanced Specialization Partner",
-                    content="Proud to be recognized for our cloud modernization expertise across regulated industries.",
-                    type="success",
-                    active=True
-                ),
-                Announcement(
-                    title="Join us at the CloudNative Summit 2025",
-                    content="Our CTO is speaking on secure platform engineering. Visit booth #218 for live demos.",
-                    type="info",
-                    active=True
-                )
-            ]
-            await db.announcements.insert_many([announcement.model_dump() for announcement in sample_announcements])
-            seeded_collections.append("announcements")
-
-        if await db.contacts.count_documents({}) == 0:
-            sample_contact = ContactForm(
-                name="Evelyn Baker",
-                email="evelyn.baker@enterpriseco.com",
-                company="Enterprise Co",
-                message="Interested in a discovery workshop focused on modernizing our compliance reporting workflows."
-            )
-            contact_doc = sample_contact.model_dump()
-            contact_doc["timestamp"] = contact_doc["timestamp"].isoformat()
-            await db.contacts.insert_one(contact_doc)
-            seeded_collections.append("contacts")
-
-        if seeded_collections:
-            logger.info(f"Seeded mock data for collections: {', '.join(seeded_collections)}")
-        else:
-            logger.info("Mock data already present; skipping seeding.")
-    except Exception as exc:
-        logger.error(f"Error seeding mock content: {exc}")
 
 # Include the routers in the main app
 app.include_router(api_router)
@@ -1864,6 +2280,39 @@ async def health_check():
             "database": "disconnected"
         }
 
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint(request: Request):
+        """Prometheus text exposition of this worker's HTTP, MongoDB and event-loop metrics"""
+        if METRICS_TOKEN and not secrets.compare_digest(
+            request.headers.get("authorization", ""), f"Bearer {METRICS_TOKEN}"
+        ):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        return Response(content=METRICS_REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if search_refresh_task is not None:
+        search_refresh_task.cancel()
+    if loop_lag_task is not None:
+        loop_lag_task.cancel()
+    announcement_expiry.stop()
+    slow_query_log.stop()
+    if upload_service is not None:
+        await upload_service.drain()
+    if client is not None:
+        client.close()
+    password_executor.shutdown(wait=False)
+
+# ===================== APP FACTORY =====================
+
+def create_app() -> FastAPI:
+    """Entry point for `uvicorn --factory server:create_app`.
+
+    Routes and middleware are registered when this module is imported; the
+    factory opens the database client, so a missing MONGO_URL fails here
+    instead of at import. `uvicorn server:app` still works and opens it at
+    startup.
+    """
+    init_database()
+    return app
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+from indexes import plan_indexes, plan_stages
+from metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_ENABLED = os.environ.get('SLOW_QUERY_ENABLED', 'true').lower() == 'true'
+# Commands taking at least this long (driver round trip) are recorded
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+# Entries kept; the oldest are dropped first
+SLOW_QUERY_BUFFER_SIZE = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', '200'))
+# Each query shape is explained at most once per this many seconds (0: never)
+SLOW_QUERY_EXPLAIN_SECONDS = float(os.environ.get('SLOW_QUERY_EXPLAIN_SECONDS', '300'))
+# Query shapes whose last explain is remembered; the least recently seen are dropped first
+SLOW_QUERY_PLAN_CACHE_SIZE = int(os.environ.get('SLOW_QUERY_PLAN_CACHE_SIZE', '500'))
+
+# The ASGI scope of the request being handled. Motor runs pymongo in a thread
+# pool with a copy of the caller's context, so listeners can read it.
+current_request: ContextVar[Optional[dict]] = ContextVar("current_request", default=None)
+
+# Command name -> fields that describe the query (filters are redacted)
+_QUERY_FIELDS = {
+    "find": ("filter", "sort", "projection", "limit", "skip", "hint"),
+    "findAndModify": ("query", "sort", "fields", "upsert"),
+    "count": ("query", "limit", "skip"),
+    "distinct": ("key", "query"),
+    "aggregate": ("pipeline",),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+_REDACTED_FIELDS = {"filter", "query", "q"}
+# Fields whose values vary per request (page size and offset, fields= selection)
+# without changing the plan; only their presence is part of the explain key
+_UNKEYED_FIELDS = {"limit", "skip", "projection", "fields", "statements"}
+# Keys the driver adds to a command that must not be sent inside explain
+_SESSION_KEYS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+
+def redact(value: Any) -> Any:
+    """Keep a filter's structure (field names and operators) but replace every
+    value with "?", so recorded shapes carry no user data."""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, dict) for item in value):
+            return [redact(item) for item in value]
+        return "?"
+    return "?"
+
+
+def _shape_statement(statement: dict) -> dict:
+    # One entry of an update/delete command's "updates"/"deletes" array
+    shape = {"q": redact(statement.get("q", {}))}
+    if "u" in statement:
+        update = statement["u"]
+        shape["u"] = sorted(update) if isinstance(update, dict) else "pipeline"
+    for key in ("multi", "upsert", "limit"):
+        if key in statement:
+            shape[key] = statement[key]
+    return shape
+
+
+def query_shape(command_name: str, command: dict) -> Dict[str, Any]:
+    shape: Dict[str, Any] = {}
+    for field in _QUERY_FIELDS.get(command_name, ()):
+        if field not in command:
+            continue
+        value = command[field]
+        if field in _REDACTED_FIELDS:
+            shape[field] = redact(value)
+        elif field == "pipeline":
+            shape[field] = [
+                {name: redact(body) if name == "$match" else body for name, body in stage.items()} for stage in value
+            ]
+        elif field in ("updates", "deletes"):
+            shape[field] = [_shape_statement(statement) for statement in value[:1]]
+            if len(value) > 1:
+                shape["statements"] = len(value)
+        else:
+            shape[field] = value
+    return shape
+
+
+def _shape_key(collection: str, command_name: str, shape: dict) -> str:
+    keyed = {field: "?" if field in _UNKEYED_FIELDS else value for field, value in shape.items()}
+    return f"{collection}.{command_name}:{keyed!r}"
+
+
+def _explainable(command: dict) -> dict:
+    return {key: value for key, value in command.items() if not key.startswith("$") and key not in _SESSION_KEYS}
+
+
+class RequestContextMiddleware:
+    """Makes the current request's scope visible to the slow-query recorder
+    (pure ASGI)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_request.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
+
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """pymongo command listener keeping the slowest recent commands.
+
+    Commands over SLOW_QUERY_MS are stored in a ring buffer with their
+    redacted query shape, collection, duration and originating route. For
+    find/aggregate/count/distinct and write commands, an explain (queryPlanner
+    verbosity, so writes are not executed) is run once per query shape per
+    SLOW_QUERY_EXPLAIN_SECONDS and attached, showing the winning plan's stages
+    and indexes. Listener callbacks run on driver threads and must not issue
+    commands themselves, so explains are scheduled on the event loop.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, capacity: int = SLOW_QUERY_BUFFER_SIZE,
+                 explain_seconds: float = SLOW_QUERY_EXPLAIN_SECONDS, plan_capacity: int = SLOW_QUERY_PLAN_CACHE_SIZE):
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self.explain_seconds = explain_seconds
+        self.plan_capacity = plan_capacity
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=capacity)
+        self._pending: Dict[Tuple[object, int], tuple] = {}
+        # shape key -> (explained at, plan summary or None while running), least recently seen first
+        self._plans: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        # shape key -> entries recorded while its explain was running; dropped with the key
+        self._waiting: Dict[str, List[dict]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._db = None
+
+    def start(self, db) -> None:
+        """Enable explains; call from the running event loop at startup."""
+        self._db = db
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        self._loop = None
+
+    # ---- pymongo listener callbacks (driver threads) ----
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in _QUERY_FIELDS and event.command_name not in ("getMore", "insert"):
+            return
+        scope = current_request.get()
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.command, scope)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event, None)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event, str(event.failure.get("errmsg", "")) or "failed")
+
+    def _finished(self, event, error: Optional[str]) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        command, scope = pending
+        name = event.command_name
+        target = command.get("collection") if name == "getMore" else command.get(name)
+        collection = target if isinstance(target, str) else None
+        shape = query_shape(name, command)
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "collection": collection,
+            "command": name,
+            "duration_ms": round(duration_ms, 2),
+            "route": f"{scope['method']} {route_template(scope)}" if scope else None,
+            "shape": shape,
+            "plan": None,
+        }
+        if error is not None:
+            entry["error"] = error
+        if name == "insert":
+            entry["documents"] = len(command.get("documents", ()))
+        with self._lock:
+            self._entries.append(entry)
+        if name in _QUERY_FIELDS and collection:
+            self._attach_plan(entry, _shape_key(collection, name, shape), _explainable(command))
+
+    # ---- explain sampling ----
+
+    def _attach_plan(self, entry: dict, key: str, command: dict) -> None:
+        if self.explain_seconds <= 0 or self._loop is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None and now - cached[0] < self.explain_seconds:
+                self._plans.move_to_end(key)
+                if cached[1] is None:
+                    self._waiting.setdefault(key, []).append(entry)
+                else:
+                    entry["plan"] = cached[1]
+                return
+            self._remember(key, (now, None))
+        try:
+            self._loop.call_soon_threadsafe(self._schedule_explain, entry, key, command)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    def _schedule_explain(self, entry: dict, key: str, command: dict) -> None:
+        asyncio.ensure_future(self._explain(entry, key, command))
+
+    async def _explain(self, entry: dict, key: str, command: dict) -> None:
+        try:
+            explained = await self._db.command({"explain": command, "verbosity": "queryPlanner"})
+            winning = explained["queryPlanner"]["winningPlan"]
+            stages = [stage for stage in plan_stages(winning) if stage]
+            plan = {"stages": stages, "indexes": plan_indexes(winning), "collscan": "COLLSCAN" in stages}
+        except (PyMongoError, KeyError) as e:
+            logger.warning(f"Could not explain slow {entry['command']} on {entry['collection']}: {e}")
+            plan = {"error": str(e)}
+        with self._lock:
+            self._remember(key, (time.monotonic(), plan))
+            for waiting in [entry] + self._waiting.pop(key, []):
+                waiting["plan"] = plan
+
+    def _remember(self, key: str, value: Tuple[float, Optional[dict]]) -> None:
+        # Caller holds self._lock
+        self._plans[key] = value
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.plan_capacity:
+            evicted, _ = self._plans.popitem(last=False)
+            self._waiting.pop(evicted, None)
+
+    # ---- reading ----
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Recorded commands, newest first."""
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries)]
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+            self._waiting.clear()
@@ -0,0 +1,833 @@
+import heapq
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany, DeleteOne, IndexModel, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+logger = logging.getLogger(__name__)
+
+# "mongo" connects Motor to MONGO_URL. "memory" keeps every collection in
+# this process (nothing is persisted), so the request path can be profiled,
+# benchmarked and tested without a MongoDB server.
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+STORAGE_BACKENDS = ("mongo", "memory")
+
+
+def open_database(backend: str, mongo_url: Optional[str], db_name: str, event_listeners: Sequence = ()):
+    """Return ``(client, db)`` for ``backend``.
+
+    Both backends expose the same subset of the Motor API (collections by
+    attribute or key, ``find``/``find_one``, the write and ``find_one_and_*``
+    methods, ``count_documents``, ``bulk_write``, ``create_indexes`` and the
+    ``ping`` command), so handlers do not know which one they are using.
+    ``event_listeners`` are pymongo monitoring listeners for the Motor client;
+    the memory backend sends no commands, so it has nothing to report.
+    """
+    if backend == "memory":
+        logger.info("Using the in-memory storage backend; data is not persisted")
+        client = MemoryClient()
+        return client, client[db_name]
+    if backend != "mongo":
+        raise ValueError(f"STORAGE_BACKEND must be one of: {', '.join(STORAGE_BACKENDS)}")
+    if not mongo_url:
+        logger.error("Required database connection environment variable is not set")
+        raise ValueError("Database connection configuration is missing")
+    client = AsyncIOMotorClient(mongo_url, event_listeners=list(event_listeners))
+    return client, client[db_name]
+
+
+# ===================== DOCUMENT HELPERS =====================
+
+def _clone(value):
+    """Copy a document the way a BSON round trip would: containers are new,
+    tuples become lists and datetimes become naive UTC with millisecond
+    precision (what Motor returns by default)."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clone(v) for v in value]
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def _lookup(value, parts: List[str]) -> List[Any]:
+    """Values at a dotted path; arrays along the way are traversed."""
+    if not parts:
+        return [value]
+    if isinstance(value, dict):
+        if parts[0] not in value:
+            return []
+        return _lookup(value[parts[0]], parts[1:])
+    if isinstance(value, list):
+        if parts[0].isdigit():
+            index = int(parts[0])
+            return _lookup(value[index], parts[1:]) if index < len(value) else []
+        found = []
+        for item in value:
+            if isinstance(item, dict):
+                found.extend(_lookup(item, parts))
+        return found
+    return []
+
+
+def _candidates(doc: dict, field: str) -> List[Any]:
+    """What a condition on ``field`` is tested against: each value found,
+    plus the elements of any array value."""
+    found = []
+    for value in _lookup(doc, field.split(".")):
+        found.append(value)
+        if isinstance(value, list):
+            found.extend(value)
+    return found
+
+
+def _type_rank(value) -> int:
+    # BSON comparison order; values only compare within the same rank
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def _bson_type(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -2 ** 31 <= value < 2 ** 31 else "long"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, bytes):
+        return "binData"
+    return type(value).__name__
+
+
+_TYPE_CODES = {1: "double", 2: "string", 3: "object", 4: "array", 5: "binData", 7: "objectId",
+               8: "bool", 9: "date", 10: "null", 16: "int", 18: "long"}
+_NUMBER_TYPES = {"int", "long", "double"}
+
+
+def _fold_strings(collation: Optional[dict]):
+    """Case folding for a collation of strength 1 or 2 (case-insensitive)."""
+    if collation and collation.get("strength", 3) <= 2:
+        return str.casefold
+    return None
+
+
+class _Matcher:
+    """Evaluates a MongoDB query document against stored documents."""
+
+    def __init__(self, query: Optional[dict], collation: Optional[dict] = None):
+        self.query = _clone(query or {})
+        self.fold = _fold_strings(collation)
+
+    def __call__(self, doc: dict) -> bool:
+        return self._match(doc, self.query)
+
+    def _norm(self, value):
+        return self.fold(value) if self.fold is not None and isinstance(value, str) else value
+
+    def _match(self, doc: dict, query: dict) -> bool:
+        for key, condition in query.items():
+            if key == "$and":
+                if not all(self._match(doc, sub) for sub in condition):
+                    return False
+            elif key == "$or":
+                if not any(self._match(doc, sub) for sub in condition):
+                    return False
+            elif key == "$nor":
+                if any(self._match(doc, sub) for sub in condition):
+                    return False
+            elif key.startswith("$"):
+                raise OperationFailure(f"Query operator {key} is not supported by the memory storage backend")
+            elif not self._field(doc, key, condition):
+                return False
+        return True
+
+    def _field(self, doc: dict, field: str, condition) -> bool:
+        values = _candidates(doc, field)
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            return all(self._operator(values, op, arg, condition) for op, arg in condition.items())
+        return self._equals(values, condition)
+
+    def _equals(self, values: List[Any], expected) -> bool:
+        if isinstance(expected, re.Pattern):
+            return any(isinstance(v, str) and expected.search(v) for v in values)
+        if expected is None and not values:
+            return True
+        expected = self._norm(expected)
+        return any(self._norm(v) == expected and _type_rank(v) == _type_rank(expected) for v in values)
+
+    def _compare(self, values: List[Any], bound, test) -> bool:
+        bound = self._norm(bound)
+        rank = _type_rank(bound)
+        return any(_type_rank(v) == rank and rank not in (4, 5) and test(self._norm(v), bound) for v in values)
+
+    def _operator(self, values: List[Any], op: str, arg, condition: dict) -> bool:
+        if op == "$eq":
+            return self._equals(values, arg)
+        if op == "$ne":
+            return not self._equals(values, arg)
+        if op == "$gt":
+            return self._compare(values, arg, lambda v, b: v > b)
+        if op == "$gte":
+            return self._compare(values, arg, lambda v, b: v >= b)
+        if op == "$lt":
+            return self._compare(values, arg, lambda v, b: v < b)
+        if op == "$lte":
+            return self._compare(values, arg, lambda v, b: v <= b)
+        if op == "$in":
+            return any(self._equals(values, item) for item in arg)
+        if op == "$nin":
+            return not any(self._equals(values, item) for item in arg)
+        if op == "$exists":
+            return bool(values) == bool(arg)
+        if op == "$type":
+            wanted = {_TYPE_CODES.get(t, t) for t in (arg if isinstance(arg, list) else [arg])}
+            if "number" in wanted:
+                wanted |= _NUMBER_TYPES
+            return any(_bson_type(v) in wanted for v in values)
+        if op == "$regex":
+            flags = 0
+            for option in condition.get("$options", ""):
+                flags |= {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}.get(option, 0)
+            pattern = arg if isinstance(arg, re.Pattern) else re.compile(arg, flags)
+            return self._equals(values, pattern)
+        if op == "$options":
+            return True
+        if op == "$not":
+            return not all(self._operator(values, sub, sub_arg, arg) for sub, sub_arg in arg.items())
+        if op == "$size":
+            return any(isinstance(v, list) and len(v) == arg for v in values)
+        raise OperationFailure(f"Query operator {op} is not supported by the memory storage backend")
+
+
+def _sort_key(field: str, fold):
+    parts = field.split(".")
+    nested = len(parts) > 1
+
+    def key(doc):
+        if nested:
+            found = _lookup(doc, parts)
+            value = found[0] if found else None
+        else:
+            value = doc.get(field)
+        kind = type(value)
+        # Common cases first; this runs once per document per sort
+        if kind is str:
+            return (3, fold(value) if fold is not None else value)
+        if kind is datetime:
+            return (9, value)
+        rank = _type_rank(value)
+        return (rank, value if rank in (2, 7, 8, 9) else repr(value) if rank != 1 else 0)
+
+    return key
+
+
+def _sort_spec(key_or_list, direction=None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(field, order) for field, order in key_or_list]
+
+
+def _sort(docs: List[dict], spec: List[Tuple[str, int]], fold=None, keep: int = 0) -> List[dict]:
+    """Sort ``docs`` by ``spec``; with ``keep`` only the first ``keep`` are returned."""
+    directions = {direction < 0 for _, direction in spec}
+    if len(directions) == 1:
+        keys = [_sort_key(field, fold) for field, _ in spec]
+        composite = (lambda doc: tuple(key(doc) for key in keys)) if len(keys) > 1 else keys[0]
+        descending = directions.pop()
+        if keep and keep < len(docs):
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            return pick(keep, docs, key=composite)
+        docs.sort(key=composite, reverse=descending)
+    else:
+        # Stable sorts from the least to the most significant key
+        for field, direction in reversed(spec):
+            docs.sort(key=_sort_key(field, fold), reverse=direction < 0)
+    return docs[:keep] if keep else docs
+
+
+def _set_path(doc: dict, path: str, value) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: dict, path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _get_path(doc: dict, path: str, default=None):
+    found = _lookup(doc, path.split("."))
+    return found[0] if found else default
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return _clone(doc)
+    keep_id = bool(projection.get("_id", 1))
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    included = [k for k, v in fields.items() if v]
+    excluded = [k for k, v in fields.items() if not v]
+    if included and excluded:
+        raise OperationFailure("Cannot do exclusion on a field in an inclusion projection")
+    if included:
+        # Fields come back in stored order, as from the server
+        top = {path.split(".", 1)[0] for path in included}
+        out = {k: v for k, v in doc.items() if k in top or (k == "_id" and keep_id)}
+        for path in included:
+            if "." in path:
+                parent = path.split(".", 1)[0]
+                if isinstance(out.get(parent), dict) and not any(p == parent for p in included):
+                    out[parent] = _project(out[parent], {path.split(".", 1)[1]: 1, "_id": 1})
+        return _clone(out)
+    out = _clone(doc)
+    if not keep_id:
+        out.pop("_id", None)
+    for path in excluded:
+        _unset_path(out, path)
+    return out
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool) -> None:
+    if not update or not all(op.startswith("$") for op in update):
+        raise ValueError("update only works with $ operators")
+    for op, fields in update.items():
+        fields = _clone(fields)
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            for path, value in fields.items():
+                _set_path(doc, path, value)
+        elif op == "$setOnInsert":
+            continue
+        elif op == "$unset":
+            for path in fields:
+                _unset_path(doc, path)
+        elif op == "$inc":
+            for path, amount in fields.items():
+                _set_path(doc, path, _get_path(doc, path, 0) + amount)
+        elif op in ("$push", "$addToSet"):
+            for path, value in fields.items():
+                items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                current = _get_path(doc, path)
+                current = list(current) if isinstance(current, list) else []
+                for item in items:
+                    if op == "$push" or item not in current:
+                        current.append(item)
+                _set_path(doc, path, current)
+        elif op == "$pull":
+            for path, value in fields.items():
+                current = _get_path(doc, path)
+                if isinstance(current, list):
+                    _set_path(doc, path, [item for item in current if item != value])
+        else:
+            raise OperationFailure(f"Update operator {op} is not supported by the memory storage backend")
+
+
+def _upsert_seed(query: dict) -> dict:
+    """Fields an upsert copies from the equality conditions of its filter."""
+    seed: Dict[str, Any] = {}
+    for key, condition in query.items():
+        if key == "$and":
+            for sub in condition:
+                seed.update(_upsert_seed(sub))
+        elif key.startswith("$"):
+            continue
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                seed[key] = condition["$eq"]
+        elif not isinstance(condition, re.Pattern):
+            seed[key] = condition
+    doc: Dict[str, Any] = {}
+    for path, value in seed.items():
+        _set_path(doc, path, _clone(value))
+    return doc
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return ("dict", tuple((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("list", tuple(_hashable(v) for v in value))
+    return (_type_rank(value), value)
+
+
+# ===================== IN-MEMORY BACKEND =====================
+
+class _UniqueIndex:
+    def __init__(self, collection_name: str, spec: dict):
+        self.collection_name = collection_name
+        self.name = spec["name"]
+        self.fields = list(spec["key"].keys())
+        self.sparse = spec.get("sparse", False)
+        self.partial = _Matcher(spec["partialFilterExpression"]) if spec.get("partialFilterExpression") else None
+        self.fold = _fold_strings(spec.get("collation"))
+        self.entries: Dict[Any, Any] = {}
+
+    def key(self, doc: dict):
+        if self.partial is not None and not self.partial(doc):
+            return None
+        values = [_lookup(doc, field.split(".")) for field in self.fields]
+        if self.sparse and not any(values):
+            return None
+        key = []
+        for found in values:
+            value = found[0] if found else None
+            if self.fold is not None and isinstance(value, str):
+                value = self.fold(value)
+            key.append(_hashable(value))
+        return tuple(key)
+
+    def check(self, doc: dict) -> None:
+        key = self.key(doc)
+        if key is not None and self.entries.get(key, doc["_id"]) != doc["_id"]:
+            dup = ", ".join(f"{field}: {_get_path(doc, field)!r}" for field in self.fields)
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.collection_name} index: {self.name} dup key: {{ {dup} }}",
+                11000,
+            )
+
+    def add(self, doc: dict) -> None:
+        key = self.key(doc)
+        if key is not None:
+            self.entries[key] = doc["_id"]
+
+    def remove(self, doc: dict) -> None:
+        key = self.key(doc)
+        if key is not None and self.entries.get(key) == doc["_id"]:
+            del self.entries[key]
+
+
+class MemoryCursor:
+    """Motor-style cursor over a MemoryCollection; evaluated on first read."""
+
+    def __init__(self, collection: "MemoryCollection", query: Optional[dict], projection: Optional[dict],
+                 collation: Optional[dict] = None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._collation = collation
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None) -> "MemoryCursor":
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, count: int) -> "MemoryCursor":
+        return self
+
+    def _results(self, length: Optional[int] = None) -> List[dict]:
+        limit = min(n for n in (self._limit, length, float("inf")) if n)
+        keep = 0 if limit == float("inf") else self._skip + int(limit)
+        docs = self._collection._select(self._query, self._sort, self._collation, keep)[self._skip:]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        return self._results(length)
+
+    async def __aiter__(self):
+        for doc in self._results():
+            yield doc
+
+
+class MemoryCollection:
+    """In-process collection with MongoDB query, sort, projection and update
+    semantics for the operators the app uses.
+
+    Unique indexes (including partial and collated ones) are enforced; other
+    indexes are recorded but only change performance on a real server, and
+    TTL indexes do not expire documents.
+    """
+
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._docs: Dict[Any, dict] = {}
+        self._indexes: Dict[str, dict] = {"_id_": {"key": {"_id": 1}, "name": "_id_"}}
+        self._unique: List[_UniqueIndex] = []
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.database.name}.{self.name}"
+
+    # ---- reads ----
+
+    def _select(self, query: Optional[dict], sort=None, collation: Optional[dict] = None,
+                keep: int = 0) -> List[dict]:
+        match = _Matcher(query, collation)
+        if sort:
+            docs = [doc for doc in self._docs.values() if match(doc)]
+            return _sort(docs, sort, _fold_strings(collation), keep)
+        docs = []
+        for doc in self._docs.values():
+            if match(doc):
+                docs.append(doc)
+                if len(docs) == keep:
+                    break
+        return docs
+
+    def _first(self, query, sort=None, collation=None) -> Optional[dict]:
+        if sort:
+            docs = self._select(query, _sort_spec(sort), collation)
+            return docs[0] if docs else None
+        match = _Matcher(query, collation)
+        return next((doc for doc in self._docs.values() if match(doc)), None)
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, *, sort=None,
+             skip: int = 0, limit: int = 0, collation: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection, collation)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None, *, sort=None,
+                       collation: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        doc = self._first(filter, sort, collation)
+        return None if doc is None else _project(doc, projection)
+
+    async def count_documents(self, filter: dict, *, collation: Optional[dict] = None, skip: int = 0,
+                              limit: int = 0, **kwargs) -> int:
+        count = max(len(self._select(filter, collation=collation)) - skip, 0)
+        return min(count, limit) if limit else count
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        return len(self._docs)
+
+    # ---- writes ----
+
+    def _store(self, old: Optional[dict], new: dict) -> None:
+        """Put ``new`` in place of ``old`` (None for an insert), keeping the
+        unique indexes consistent; raises DuplicateKeyError without changes."""
+        if old is None and new["_id"] in self._docs:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.full_name} index: _id_ dup key: {{ _id: {new['_id']!r} }}",
+                11000,
+            )
+        if old is not None:
+            for index in self._unique:
+                index.remove(old)
+        try:
+            for index in self._unique:
+                index.check(new)
+        except DuplicateKeyError:
+            if old is not None:
+                for index in self._unique:
+                    index.add(old)
+            raise
+        for index in self._unique:
+            index.add(new)
+        self._docs[new["_id"]] = new
+
+    def _insert(self, document: dict):
+        if "_id" not in document:
+            # Like pymongo, the caller's document receives the generated _id
+            document["_id"] = ObjectId()
+        self._store(None, _clone(document))
+        return document["_id"]
+
+    def _update(self, doc: dict, update: dict) -> Tuple[dict, bool]:
+        new = _clone(doc)
+        _apply_update(new, update, inserting=False)
+        if new.get("_id") != doc["_id"]:
+            raise OperationFailure("Performing an update on the path '_id' would modify the immutable field '_id'", 66)
+        if new == doc:
+            return doc, False
+        self._store(doc, new)
+        return new, True
+
+    def _upsert(self, query: dict, update: dict) -> dict:
+        new = _upsert_seed(query)
+        _apply_update(new, update, inserting=True)
+        new.setdefault("_id", ObjectId())
+        self._store(None, new)
+        return new
+
+    def _update_docs(self, query: dict, update: dict, upsert: bool, many: bool,
+                     collation: Optional[dict]) -> dict:
+        targets = self._select(query, collation=collation)
+        if not many:
+            targets = targets[:1]
+        if not targets and upsert:
+            doc = self._upsert(query, update)
+            return {"n": 1, "nModified": 0, "upserted": doc["_id"]}
+        modified = 0
+        for doc in targets:
+            _, changed = self._update(doc, update)
+            modified += changed
+        return {"n": len(targets), "nModified": modified}
+
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True, **kwargs) -> InsertManyResult:
+        documents = list(documents)
+        ids, errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": [], "nInserted": len(ids),
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+        return InsertManyResult(ids, True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, *,
+                         collation: Optional[dict] = None, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update_docs(filter, update, upsert, False, collation), True)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, *,
+                          collation: Optional[dict] = None, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update_docs(filter, update, upsert, True, collation), True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, *,
+                          collation: Optional[dict] = None, **kwargs) -> UpdateResult:
+        doc = self._first(filter, collation=collation)
+        if doc is None:
+            if not upsert:
+                return UpdateResult({"n": 0, "nModified": 0}, True)
+            new = {**_upsert_seed(filter), **_clone(replacement)}
+            new.setdefault("_id", ObjectId())
+            self._store(None, new)
+            return UpdateResult({"n": 1, "nModified": 0, "upserted": new["_id"]}, True)
+        new = {"_id": doc["_id"], **_clone(replacement)}
+        changed = new != doc
+        if changed:
+            self._store(doc, new)
+        return UpdateResult({"n": 1, "nModified": int(changed)}, True)
+
+    async def find_one_and_update(self, filter: dict, update: dict, projection: Optional[dict] = None, sort=None,
+                                  upsert: bool = False, return_document: bool = ReturnDocument.BEFORE, *,
+                                  collation: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        doc = self._first(filter, sort, collation)
+        if doc is None:
+            if not upsert:
+                return None
+            new = self._upsert(filter, update)
+            return _project(new, projection) if return_document == ReturnDocument.AFTER else None
+        new, _ = self._update(doc, update)
+        return _project(new if return_document == ReturnDocument.AFTER else doc, projection)
+
+    async def find_one_and_delete(self, filter: dict, projection: Optional[dict] = None, sort=None, *,
+                                  collation: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        doc = self._first(filter, sort, collation)
+        if doc is None:
+            return None
+        self._remove(doc)
+        return _project(doc, projection)
+
+    def _remove(self, doc: dict) -> None:
+        for index in self._unique:
+            index.remove(doc)
+        del self._docs[doc["_id"]]
+
+    def _delete(self, query: dict, many: bool, collation: Optional[dict] = None) -> int:
+        targets = self._select(query, collation=collation)
+        if not many:
+            targets = targets[:1]
+        for doc in targets:
+            self._remove(doc)
+        return len(targets)
+
+    async def delete_one(self, filter: dict, *, collation: Optional[dict] = None, **kwargs) -> DeleteResult:
+        return DeleteResult({"n": self._delete(filter, False, collation)}, True)
+
+    async def delete_many(self, filter: dict, *, collation: Optional[dict] = None, **kwargs) -> DeleteResult:
+        return DeleteResult({"n": self._delete(filter, True, collation)}, True)
+
+    async def bulk_write(self, requests: list, ordered: bool = True, **kwargs) -> BulkWriteResult:
+        result = {"writeErrors": [], "writeConcernErrors": [], "nInserted": 0, "nUpserted": 0,
+                  "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []}
+        for index, request in enumerate(requests):
+            try:
+                self._bulk_op(request, index, result)
+            except (DuplicateKeyError, OperationFailure) as e:
+                result["writeErrors"].append({"index": index, "code": e.code, "errmsg": str(e)})
+                if ordered:
+                    break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    def _bulk_op(self, request, index: int, result: dict) -> None:
+        collation = getattr(request, "_collation", None)
+        if isinstance(request, InsertOne):
+            self._insert(request._doc)
+            result["nInserted"] += 1
+        elif isinstance(request, (UpdateOne, UpdateMany)):
+            outcome = self._update_docs(request._filter, request._doc, bool(request._upsert),
+                                        isinstance(request, UpdateMany), collation)
+            self._count_update(outcome, index, result)
+        elif isinstance(request, ReplaceOne):
+            doc = self._first(request._filter, collation=collation)
+            if doc is None and request._upsert:
+                new = {**_upsert_seed(request._filter), **_clone(request._doc)}
+                new.setdefault("_id", ObjectId())
+                self._store(None, new)
+                self._count_update({"n": 1, "nModified": 0, "upserted": new["_id"]}, index, result)
+            elif doc is not None:
+                new = {"_id": doc["_id"], **_clone(request._doc)}
+                if new != doc:
+                    self._store(doc, new)
+                self._count_update({"n": 1, "nModified": int(new != doc)}, index, result)
+        elif isinstance(request, (DeleteOne, DeleteMany)):
+            result["nRemoved"] += self._delete(request._filter, isinstance(request, DeleteMany), collation)
+        else:
+            raise TypeError(f"{request!r} is not a valid request")
+
+    @staticmethod
+    def _count_update(outcome: dict, index: int, result: dict) -> None:
+        if "upserted" in outcome:
+            result["nUpserted"] += 1
+            result["upserted"].append({"index": index, "_id": outcome["upserted"]})
+        else:
+            result["nMatched"] += outcome["n"]
+            result["nModified"] += outcome["nModified"]
+
+    # ---- indexes ----
+
+    async def create_indexes(self, indexes: List[IndexModel], **kwargs) -> List[str]:
+        names = []
+        for model in indexes:
+            spec = dict(model.document)
+            name = spec["name"]
+            existing = self._indexes.get(name)
+            if existing is not None:
+                if existing != spec:
+                    raise OperationFailure(f"An existing index has the same name as the requested index: {name}", 86)
+                names.append(name)
+                continue
+            if spec.get("unique"):
+                index = _UniqueIndex(self.full_name, spec)
+                try:
+                    for doc in self._docs.values():
+                        index.check(doc)
+                        index.add(doc)
+                except DuplicateKeyError as e:
+                    raise OperationFailure(str(e), 11000)
+                self._unique.append(index)
+            self._indexes[name] = spec
+            names.append(name)
+        return names
+
+    async def create_index(self, keys, **kwargs) -> str:
+        return (await self.create_indexes([IndexModel(keys, **kwargs)]))[0]
+
+    async def index_information(self) -> Dict[str, dict]:
+        return {name: {**spec, "key": list(spec["key"].items())} for name, spec in self._indexes.items()}
+
+    async def drop(self) -> None:
+        self.database._collections.pop(self.name, None)
+
+
+class MemoryDatabase:
+    """Collections by attribute or key, created on first use."""
+
+    def __init__(self, name: str, client: Optional["MemoryClient"] = None):
+        self.name = name
+        # The owning client, like Motor's AsyncIOMotorDatabase.client
+        self.client = client
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = MemoryCollection(self, name)
+        return collection
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    async def list_collection_names(self, **kwargs) -> List[str]:
+        return [name for name, collection in self._collections.items() if collection._docs]
+
+    async def drop_collection(self, name: str, **kwargs) -> None:
+        self._collections.pop(name, None)
+
+    async def command(self, command, **kwargs) -> dict:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == "ping":
+            return {"ok": 1.0}
+        raise OperationFailure(f"Command {name} is not supported by the memory storage backend")
+
+
+class MemoryClient:
+    """Stands in for AsyncIOMotorClient when STORAGE_BACKEND=memory."""
+
+    def __init__(self):
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        database = self._databases.get(name)
+        if database is None:
+            database = self._databases[name] = MemoryDatabase(name, self)
+        return database
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        return self[name]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,53 @@
+"""Shared fixtures: the app on the in-memory storage backend (storage.py).
+
+server reads its configuration when imported, so the environment is set
+before the import below.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["UPLOAD_BACKEND"] = "local"
+os.environ["UPLOAD_LOCAL_DIR"] = tempfile.mkdtemp(prefix="trine-uploads-")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("PROFILING_ENABLED", "false")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+from indexes import ensure_indexes  # noqa: E402
+from storage import MemoryClient  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """A fresh in-memory database with the index registry applied, bound to the app."""
+    server.init_database(MemoryClient()[server.db_name])
+    await ensure_indexes(server.db)
+    return server.db
+
+
+@pytest.fixture
+async def api(db):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def admin_headers(db):
+    admin = server.AdminUser(email="admin@example.com", password_hash="unused", name="Admin")
+    await db.admin_users.insert_one(admin.model_dump())
+    token = server.create_access_token({"sub": admin.id, "ver": admin.token_version})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,80 @@
+import pytest
+
+import server
+from dashboard_stats import DashboardStats
+
+pytestmark = pytest.mark.anyio
+
+PARTNER = {"id": "p1", "name": "Acme", "logo_url": "https://example.com/acme.png", "website": None, "priority": 3}
+JOB = {"title": "Data engineer", "department": "Data", "location": "Remote", "type": "Full-time",
+       "salary": "Competitive", "description": "Pipelines"}
+POST = {"title": "First post", "excerpt": "Short", "content": "Long", "featured_image": "cover.png",
+        "author": "Ada", "category": "AI", "readTime": "3 min"}
+
+
+@pytest.fixture
+def reads(db, monkeypatch):
+    """Counts find_one calls on the partners collection."""
+    calls = []
+    find_one = db.partners.find_one
+
+    async def counting(*args, **kwargs):
+        calls.append(args)
+        return await find_one(*args, **kwargs)
+
+    monkeypatch.setattr(db.partners, "find_one", counting)
+    return calls
+
+
+async def test_partial_update_returns_the_stored_document_in_one_round_trip(api, db, admin_headers, reads):
+    await db.partners.insert_one(dict(PARTNER))
+    response = await api.put("/api/admin/partners/p1", headers=admin_headers, json={"priority": 1})
+    assert response.status_code == 200
+    assert response.json() == {**PARTNER, "priority": 1}
+    assert reads == []
+    assert (await db.partners.find_one({"id": "p1"}, {"_id": 0})) == {**PARTNER, "priority": 1}
+
+
+async def test_empty_update_reads_without_writing(api, db, admin_headers, reads):
+    await db.partners.insert_one(dict(PARTNER))
+    response = await api.put("/api/admin/partners/p1", headers=admin_headers, json={"website": None})
+    assert response.status_code == 200
+    assert response.json() == PARTNER
+    assert len(reads) == 1
+
+
+@pytest.mark.parametrize("path, body, detail", [
+    ("/api/admin/partners/missing", {"priority": 1}, "Partner not found"),
+    ("/api/admin/partners/missing", {}, "Partner not found"),
+    ("/api/admin/jobs/missing", JOB, "Job not found"),
+    ("/api/admin/blog/missing", POST, "Blog post not found"),
+])
+async def test_missing_documents_are_a_404(api, db, admin_headers, path, body, detail):
+    response = await api.put(path, headers=admin_headers, json=body)
+    assert response.status_code == 404
+    assert response.json()["detail"] == detail
+
+
+async def test_job_updates_refresh_counters_and_public_lists(api, db, admin_headers):
+    created = (await api.post("/api/admin/jobs", headers=admin_headers, json=JOB)).json()
+    assert [job["id"] for job in (await api.get("/api/jobs")).json()] == [created["id"]]
+    assert (await server.dashboard_stats.read())["active_jobs"] == 1
+
+    response = await api.put(f"/api/admin/jobs/{created['id']}", headers=admin_headers, json={**JOB, "active": False})
+    assert response.status_code == 200
+    assert response.json()["active"] is False
+    assert response.json()["id"] == created["id"]
+    assert (await api.get("/api/jobs")).json() == []
+    counters = await server.dashboard_stats.read()
+    assert counters == await DashboardStats(db).reconcile()
+    assert counters["active_jobs"] == 0
+
+
+async def test_blog_update_to_a_taken_slug_is_a_400(api, db, admin_headers):
+    first = (await api.post("/api/admin/blog", headers=admin_headers, json={**POST, "slug": "first"})).json()
+    await api.post("/api/admin/blog", headers=admin_headers, json={**POST, "title": "Second", "slug": "second"})
+
+    response = await api.put(f"/api/admin/blog/{first['id']}", headers=admin_headers, json={**POST, "slug": "second"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Slug already exists"
+    assert (await db.blog_posts.find_one({"id": first["id"]}))["slug"] == "first"
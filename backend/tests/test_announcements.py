@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from announcements import AnnouncementExpiry, migrate_announcement_dates, parse_expiry, visible_announcements_query
+
+pytestmark = pytest.mark.anyio
+
+
+def _announcement(ann_id, expires_at=None, active=True):
+    return {"id": ann_id, "title": ann_id, "content": "", "type": "info", "active": active,
+            "created_at": datetime.now(timezone.utc), "expires_at": expires_at}
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+        self.boundaries = []
+
+    async def __call__(self, count, boundary):
+        self.calls.append(count)
+        self.boundaries.append(boundary)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-06-30", datetime(2025, 6, 30, tzinfo=timezone.utc)),
+    ("2025-06-30T12:00:00Z", datetime(2025, 6, 30, 12, tzinfo=timezone.utc)),
+    ("2025-06-30T14:00:00+02:00", datetime(2025, 6, 30, 12, tzinfo=timezone.utc)),
+    (datetime(2025, 6, 30, 12), datetime(2025, 6, 30, 12, tzinfo=timezone.utc)),
+    ("", None),
+    (None, None),
+])
+def test_parse_expiry_returns_aware_utc(value, expected):
+    parsed = parse_expiry(value)
+    assert parsed == expected
+    if parsed is not None:
+        assert parsed.tzinfo is not None
+
+
+def test_parse_expiry_rejects_garbage():
+    with pytest.raises(HTTPException) as error:
+        parse_expiry("next tuesday")
+    assert error.value.status_code == 400
+
+
+async def test_visible_query_hides_inactive_and_expired(db):
+    now = datetime.now(timezone.utc)
+    await db.announcements.insert_many([
+        _announcement("forever"),
+        _announcement("later", now + timedelta(hours=1)),
+        _announcement("expired", now - timedelta(seconds=1)),
+        _announcement("inactive", active=False),
+    ])
+    visible = await db.announcements.find(visible_announcements_query(now), {"_id": 0}).to_list(10)
+    assert {doc["id"] for doc in visible} == {"forever", "later"}
+
+
+async def test_migration_converts_string_dates(db):
+    await db.announcements.insert_many([
+        {**_announcement("old"), "created_at": "2024-01-01T00:00:00", "expires_at": "2024-02-01"},
+        {**_announcement("broken"), "expires_at": "soon"},
+        _announcement("current"),
+    ])
+    assert await migrate_announcement_dates(db) == 2
+    old = await db.announcements.find_one({"id": "old"})
+    # Stored as BSON dates, which read back as naive UTC
+    assert old["created_at"] == datetime(2024, 1, 1)
+    assert old["expires_at"] == datetime(2024, 2, 1)
+    assert (await db.announcements.find_one({"id": "broken"}))["expires_at"] is None
+    assert await migrate_announcement_dates(db) == 0
+
+
+async def test_expire_due_archives_only_expired_rows(db):
+    now = datetime.now(timezone.utc)
+    await db.announcements.insert_many([
+        _announcement("expired", now - timedelta(minutes=1)),
+        _announcement("later", now + timedelta(hours=1)),
+        _announcement("forever"),
+    ])
+    recorder = _Recorder()
+    expiry = AnnouncementExpiry(db, recorder)
+    assert await expiry.expire_due() == 1
+    assert recorder.calls == [1]
+
+    expired = await db.announcements.find_one({"id": "expired"})
+    assert expired["active"] is False
+    assert expired["archived_at"] is not None
+    assert (await db.announcements.find_one({"id": "later"}))["active"] is True
+
+    # Nothing left to archive and no expiry was scheduled: no callback
+    assert await expiry.expire_due() == 0
+    assert recorder.calls == [1]
+
+
+async def test_expire_due_notifies_when_another_worker_archived_first(db):
+    now = datetime.now(timezone.utc)
+    await db.announcements.insert_one(_announcement("expired", now - timedelta(seconds=1)))
+    first, second = _Recorder(), _Recorder()
+    other_worker = AnnouncementExpiry(db, first)
+    this_worker = AnnouncementExpiry(db, second)
+    this_worker.next_expiry = now - timedelta(seconds=1)
+
+    assert await other_worker.expire_due() == 1
+    assert await this_worker.expire_due() == 0
+    # This worker's caches still hold the row, so it invalidates anyway
+    assert second.calls == [0]
+    assert second.boundaries == [this_worker.next_expiry]
+    assert first.boundaries == [None]
+
+
+async def test_workers_at_the_same_boundary_bump_the_version_once(db):
+    versions = server.content_versions
+    boundary = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db.announcements.insert_one(_announcement("expired", boundary))
+    start = await versions.bump("announcements")
+
+    # The worker that archived the row bumps the version; the others find it
+    # already bumped since the boundary and only pick up the new version
+    await server.on_announcements_expired(1, None)
+    for _ in range(3):
+        await server.on_announcements_expired(0, boundary)
+    assert (await db.content_versions.find_one({"_id": "announcements"}))["version"] == start + 1
+    assert versions.current(("announcements",)) == (start + 1,)
+
+    # If the archiving worker died before bumping it, the first of the others does
+    await db.content_versions.update_one({"_id": "announcements"},
+                                         {"$set": {"updated_at": boundary - timedelta(seconds=1)}})
+    await server.on_announcements_expired(0, boundary)
+    await server.on_announcements_expired(0, boundary)
+    assert (await db.content_versions.find_one({"_id": "announcements"}))["version"] == start + 2
+
+
+async def test_next_expiry_and_cache_ttl(db):
+    now = datetime.now(timezone.utc)
+    await db.announcements.insert_many([
+        _announcement("soon", now + timedelta(seconds=10)),
+        _announcement("later", now + timedelta(hours=1)),
+        _announcement("hidden", now + timedelta(seconds=1), active=False),
+    ])
+    expiry = AnnouncementExpiry(db, _Recorder())
+    assert expiry.cache_ttl(60) == 60
+    expiry.next_expiry = await expiry._next_expiry()
+    assert abs((expiry.next_expiry - (now + timedelta(seconds=10))).total_seconds()) < 0.01
+    assert 0 < expiry.cache_ttl(60) <= 10
+    assert expiry.cache_ttl(5) == 5
+    expiry.next_expiry = now - timedelta(seconds=1)
+    assert expiry.cache_ttl(60) <= 0
+
+
+async def test_expiry_drops_the_cached_public_list(api, db, monkeypatch):
+    monkeypatch.setattr(server.announcement_expiry, "next_expiry", None)
+    now = datetime.now(timezone.utc)
+    await db.announcements.insert_many([
+        _announcement("stays"),
+        _announcement("goes", now + timedelta(hours=1)),
+    ])
+    response = await api.get("/api/announcements")
+    assert {ann["id"] for ann in response.json()} == {"stays", "goes"}
+
+    # Expire it behind the cache's back, as the clock passing expires_at would
+    await db.announcements.update_one({"id": "goes"}, {"$set": {"expires_at": now - timedelta(seconds=1)}})
+    assert {ann["id"] for ann in (await api.get("/api/announcements")).json()} == {"stays", "goes"}
+
+    assert await server.announcement_expiry.expire_due() == 1
+    assert [ann["id"] for ann in (await api.get("/api/announcements")).json()] == ["stays"]
+
+
+async def test_public_announcements_hide_the_archive_stamp(api, db, admin_headers):
+    await db.announcements.insert_one({**_announcement("shown"), "archived_at": None})
+    assert "archived_at" not in (await api.get("/api/announcements")).json()[0]
+    assert "archived_at" not in (await api.get("/api/announcements?view=full")).json()[0]
+    admin = (await api.get("/api/admin/announcements", headers=admin_headers)).json()
+    assert "archived_at" in admin[0]
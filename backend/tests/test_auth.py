@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+PROTECTED = "/api/admin/dashboard/stats"
+
+
+def _bearer(user_id, version):
+    return {"Authorization": f"Bearer {server.create_access_token({'sub': user_id, 'ver': version})}"}
+
+
+@pytest.fixture
+async def admin(db):
+    # Minimum bcrypt cost keeps the login tests fast
+    password_hash = bcrypt.hashpw(b"s3cret-pass", bcrypt.gensalt(rounds=4)).decode()
+    user = server.AdminUser(email="ops@example.com", password_hash=password_hash, name="Ops")
+    await db.admin_users.insert_one(user.model_dump())
+    return user
+
+
+@pytest.fixture
+def user_lookups(db, monkeypatch):
+    """Counts admin_users.find_one calls."""
+    calls = []
+    find_one = db.admin_users.find_one
+
+    async def counting(*args, **kwargs):
+        calls.append(args)
+        return await find_one(*args, **kwargs)
+
+    monkeypatch.setattr(db.admin_users, "find_one", counting)
+    return calls
+
+
+async def test_principals_are_cached_between_requests(api, admin, user_lookups):
+    headers = _bearer(admin.id, 0)
+    for _ in range(3):
+        assert (await api.get(PROTECTED, headers=headers)).status_code == 200
+    assert len(user_lookups) == 1
+
+
+async def test_revoking_sessions_rejects_old_tokens_at_once(api, db, admin, user_lookups):
+    old = _bearer(admin.id, 0)
+    assert (await api.get(PROTECTED, headers=old)).status_code == 200
+
+    assert (await api.post(f"/api/admin/users/{admin.id}/revoke-sessions", headers=old)).status_code == 200
+    assert (await db.admin_users.find_one({"id": admin.id}))["token_version"] == 1
+    response = await api.get(PROTECTED, headers=old)
+    assert response.status_code == 401
+    assert (await api.get(PROTECTED, headers=_bearer(admin.id, 1))).status_code == 200
+
+
+async def test_a_bumped_version_from_another_worker_replaces_the_cached_principal(api, db, admin):
+    old = _bearer(admin.id, 0)
+    assert (await api.get(PROTECTED, headers=old)).status_code == 200
+    # Another worker revoked the sessions: this worker's cache is not told
+    await db.admin_users.update_one({"id": admin.id}, {"$inc": {"token_version": 1}})
+    assert (await api.get(PROTECTED, headers=old)).status_code == 200
+
+    # The first token carrying the new version misses the cache and reloads the user
+    assert (await api.get(PROTECTED, headers=_bearer(admin.id, 1))).status_code == 200
+    assert (await api.get(PROTECTED, headers=old)).status_code == 401
+
+
+async def test_old_tokens_expire_from_the_cache_with_its_ttl(api, db, admin, monkeypatch):
+    monkeypatch.setattr(server.principal_cache, "ttl", 0.05)
+    old = _bearer(admin.id, 0)
+    assert (await api.get(PROTECTED, headers=old)).status_code == 200
+    await db.admin_users.update_one({"id": admin.id}, {"$inc": {"token_version": 1}})
+    assert (await api.get(PROTECTED, headers=old)).status_code == 200
+    await asyncio.sleep(0.06)
+    assert (await api.get(PROTECTED, headers=old)).status_code == 401
+
+
+async def test_disabled_and_unknown_users_are_refused(api, db, admin):
+    await db.admin_users.update_one({"id": admin.id}, {"$set": {"is_active": False}})
+    response = await api.get(PROTECTED, headers=_bearer(admin.id, 0))
+    assert response.status_code == 403
+    assert (await api.get(PROTECTED, headers=_bearer("nobody", 0))).status_code == 401
+    assert (await api.get(PROTECTED, headers={"Authorization": "Bearer not-a-jwt"})).status_code == 401
+
+
+async def test_login_issues_a_token_for_the_current_version(api, db, admin):
+    await db.admin_users.update_one({"id": admin.id}, {"$set": {"token_version": 4}})
+    response = await api.post("/api/admin/login", json={"email": "OPS@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert (await api.get(PROTECTED, headers=headers)).status_code == 200
+
+    wrong = await api.post("/api/admin/login", json={"email": "ops@example.com", "password": "nope"})
+    assert wrong.status_code == 401
+
+
+async def test_password_jobs_past_the_pending_cap_get_a_503(monkeypatch):
+    monkeypatch.setattr(server, "PASSWORD_HASH_MAX_PENDING", 2)
+    release = threading.Event()
+    blocked = [asyncio.ensure_future(server._run_password_job(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    try:
+        with pytest.raises(HTTPException) as error:
+            await server.verify_password_async("pw", "unused")
+    finally:
+        release.set()
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "1"}
+    assert await asyncio.gather(*blocked) == [True, True]
+    assert server._password_jobs_pending == 0
+
+
+async def test_login_during_a_hashing_backlog_is_a_503(api, admin, monkeypatch):
+    monkeypatch.setattr(server, "_password_jobs_pending", server.PASSWORD_HASH_MAX_PENDING)
+    response = await api.post("/api/admin/login", json={"email": "ops@example.com", "password": "s3cret-pass"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+async def test_password_checks_run_off_the_event_loop(admin):
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def check(password, hashed):
+        seen.append(threading.current_thread().name)
+        assert threading.get_ident() != loop_thread
+        return server.verify_password(password, hashed)
+
+    assert await server._run_password_job(check, "s3cret-pass", admin.password_hash)
+    assert seen[0].startswith("bcrypt")
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+import server
+from bulk import BULK_MAX_ITEMS, bulk_delete
+from dashboard_stats import DashboardStats
+
+pytestmark = pytest.mark.anyio
+
+
+def _contact(contact_id, read=False):
+    return {"id": contact_id, "name": contact_id, "email": f"{contact_id}@example.com", "message": "", "read": read}
+
+
+def _statuses(body):
+    return {item["id"]: item["status"] for item in body["results"]}
+
+
+async def _counters_match_a_recount(db):
+    counters = await server.dashboard_stats.read()
+    recount = await DashboardStats(db).reconcile()
+    assert counters == recount
+    return counters
+
+
+async def test_bulk_delete_reports_each_item_and_adjusts_counters(api, db, admin_headers):
+    await db.contacts.insert_many([_contact("unread"), _contact("read", read=True), _contact("kept")])
+    assert (await server.dashboard_stats.read())["unread_contacts"] == 2
+
+    response = await api.post("/api/admin/contacts/bulk-delete", headers=admin_headers,
+                              json={"ids": ["unread", "missing", "read", "unread"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["results"]] == ["unread", "missing", "read"]
+    assert _statuses(body) == {"unread": "deleted", "missing": "not_found", "read": "deleted"}
+    assert body["deleted"] == 2
+    assert await db.contacts.count_documents({}) == 1
+
+    counters = await _counters_match_a_recount(db)
+    assert (counters["total_contacts"], counters["unread_contacts"]) == (1, 1)
+
+
+async def test_overlapping_bulk_deletes_count_each_document_once(api, db, admin_headers):
+    await db.subscribers.insert_many([{"id": f"s{n}", "email": f"s{n}@example.com", "active": True}
+                                      for n in range(6)])
+    assert (await server.dashboard_stats.read())["subscribers"] == 6
+
+    responses = await asyncio.gather(*(
+        api.post("/api/admin/subscribers/bulk-delete", headers=admin_headers, json={"ids": ids})
+        for ids in (["s0", "s1", "s2", "s3"], ["s2", "s3", "s4"])
+    ))
+    deleted = [item["id"] for response in responses for item in response.json()["results"]
+               if item["status"] == "deleted"]
+    assert sorted(deleted) == ["s0", "s1", "s2", "s3", "s4"]
+    assert sum(response.json()["deleted"] for response in responses) == 5
+    assert (await _counters_match_a_recount(db))["subscribers"] == 1
+
+
+async def test_bulk_delete_returns_only_documents_it_removed(db):
+    await db.job_applications.insert_many([{"id": "a", "status": "new"}, {"id": "b", "status": "reviewing"}])
+    projection = {"_id": 0, "id": 1, "status": 1}
+    first, second = await asyncio.gather(bulk_delete(db.job_applications, ["a", "b"], projection),
+                                         bulk_delete(db.job_applications, ["a", "b"], projection))
+    removed = first[1] + second[1]
+    assert sorted(removed, key=lambda doc: doc["id"]) == [{"id": "a", "status": "new"},
+                                                          {"id": "b", "status": "reviewing"}]
+    assert first[0]["deleted"] + second[0]["deleted"] == 2
+
+
+@pytest.mark.parametrize("payload", [{"ids": []}, {"ids": "c1"}, {"ids": [1, {"id": "c1"}]}, {},
+                                     {"ids": [f"c{n}" for n in range(BULK_MAX_ITEMS + 1)]}])
+async def test_invalid_id_lists_are_rejected(api, db, admin_headers, payload):
+    await db.contacts.insert_one(_contact("c1"))
+    response = await api.post("/api/admin/contacts/bulk-delete", headers=admin_headers, json=payload)
+    assert response.status_code == 422
+    assert await db.contacts.count_documents({}) == 1
+
+
+async def test_bulk_status_reports_unchanged_and_recounts(api, db, admin_headers):
+    await db.job_applications.insert_many([{"id": "new", "status": "new"}, {"id": "done", "status": "rejected"}])
+    assert (await server.dashboard_stats.read())["new_applications"] == 1
+
+    response = await api.post("/api/admin/job-applications/bulk-status", headers=admin_headers,
+                              json={"ids": ["new", "done", "missing"], "status": "rejected"})
+    assert response.status_code == 200
+    assert _statuses(response.json()) == {"new": "updated", "done": "unchanged", "missing": "not_found"}
+    assert response.json()["modified"] == 1
+    assert (await _counters_match_a_recount(db))["new_applications"] == 0
+
+    response = await api.post("/api/admin/job-applications/bulk-status", headers=admin_headers,
+                              json={"ids": ["new"], "status": "archived"})
+    assert response.status_code == 400
+
+
+async def test_bulk_endpoints_require_a_token(api, db):
+    response = await api.post("/api/admin/contacts/bulk-delete", json={"ids": ["c1"]})
+    assert response.status_code == 403
@@ -0,0 +1,92 @@
+import pytest
+
+from cors import CORSLayer
+
+pytestmark = pytest.mark.anyio
+
+ALLOWED = "https://app.example.com"
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json"), (b"vary", b"Accept-Encoding")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _call(layer, method="GET", headers=None):
+    scope = {"type": "http", "method": method, "path": "/api/partners",
+             "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await layer(scope, receive, send)
+    start = messages[0]
+    response_headers = {}
+    for name, value in start["headers"]:
+        assert name.decode() not in response_headers, f"duplicate {name!r} header"
+        response_headers[name.decode()] = value.decode()
+    return start["status"], response_headers
+
+
+def _layer(origins=(ALLOWED,), allow_credentials=True):
+    return CORSLayer(_ok_app, origins=origins, allow_credentials=allow_credentials)
+
+
+async def test_preflight_is_answered_without_the_app():
+    called = False
+
+    async def app(scope, receive, send):
+        nonlocal called
+        called = True
+
+    layer = CORSLayer(app, origins=[ALLOWED])
+    status, headers = await _call(layer, "OPTIONS", {"Origin": ALLOWED, "Access-Control-Request-Method": "PUT"})
+    assert status == 200
+    assert not called
+    assert headers["access-control-allow-origin"] == ALLOWED
+    assert headers["access-control-allow-credentials"] == "true"
+    assert headers["access-control-max-age"] == "7200"
+    assert "PUT" in headers["access-control-allow-methods"]
+    assert "X-Profile" in headers["access-control-allow-headers"]
+
+    status, headers = await _call(layer, "OPTIONS", {"Origin": "https://evil.example",
+                                                     "Access-Control-Request-Method": "PUT"})
+    assert status == 400
+    assert "access-control-allow-origin" not in headers
+
+
+async def test_allowed_origin_is_echoed_and_varies():
+    status, headers = await _call(_layer(), headers={"Origin": ALLOWED})
+    assert status == 200
+    assert headers["access-control-allow-origin"] == ALLOWED
+    assert "ETag" in headers["access-control-expose-headers"]
+    assert headers["vary"] == "Accept-Encoding, Origin"
+
+
+@pytest.mark.parametrize("request_headers", [{}, {"Origin": "https://evil.example"}])
+async def test_responses_without_a_grant_still_vary_by_origin(request_headers):
+    # A shared cache must not hand this response to an allowed origin
+    status, headers = await _call(_layer(), headers=request_headers)
+    assert status == 200
+    assert "access-control-allow-origin" not in headers
+    assert headers["vary"] == "Accept-Encoding, Origin"
+
+
+async def test_literal_wildcard_is_sent_on_every_response():
+    layer = _layer(origins=["*"], allow_credentials=False)
+    for request_headers in ({}, {"Origin": ALLOWED}):
+        _, headers = await _call(layer, headers=request_headers)
+        assert headers["access-control-allow-origin"] == "*"
+        assert headers["vary"] == "Accept-Encoding"
+        assert "access-control-allow-credentials" not in headers
+
+
+async def test_wildcard_with_credentials_echoes_the_origin():
+    _, headers = await _call(_layer(origins=["*"]), headers={"Origin": "https://any.example"})
+    assert headers["access-control-allow-origin"] == "https://any.example"
+    assert headers["vary"] == "Accept-Encoding, Origin"
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+from dashboard_stats import STATS_DOC_ID, DashboardStats
+
+pytestmark = pytest.mark.anyio
+
+JOB = {"title": "Engineer", "department": "R&D", "location": "Remote", "type": "Full-time",
+       "salary": "-", "description": "Build things"}
+CONTACT = {"name": "Ann", "email": "ann@example.com", "company": "Acme", "message": "Hello"}
+
+
+async def _counters(db) -> dict:
+    return (await db.dashboard_stats.find_one({"_id": STATS_DOC_ID}))["counters"]
+
+
+async def _assert_consistent(db) -> dict:
+    counters = await _counters(db)
+    assert counters == await DashboardStats(db).reconcile()
+    return counters
+
+
+async def test_first_read_builds_the_counters(db):
+    await db.jobs.insert_many([{"id": "1", "active": True}, {"id": "2", "active": False}])
+    counters = await DashboardStats(db).read()
+    assert counters["total_jobs"] == 2
+    assert counters["active_jobs"] == 1
+    assert counters["subscribers"] == 0
+
+
+async def test_deltas_match_only_the_counters_a_document_falls_in(db):
+    stats = DashboardStats(db)
+    await stats.reconcile()
+    await stats.record_insert("contacts", {"id": "c1", "read": False})
+    await stats.record_insert("contacts", {"id": "c2", "read": True})
+    await stats.record_delete_many("contacts", [{"id": "c1", "read": False}, {"id": "c2", "read": True}])
+    await stats.record_insert("job_applications", {"id": "a1", "status": "new"})
+    counters = await _counters(db)
+    assert (counters["total_contacts"], counters["unread_contacts"]) == (0, 0)
+    assert (counters["total_applications"], counters["new_applications"]) == (1, 1)
+
+
+async def test_deltas_without_a_stats_document_defer_to_reconcile(db):
+    stats = DashboardStats(db)
+    await stats.record_insert("partners", {"id": "p1"})
+    assert await db.dashboard_stats.find_one({"_id": STATS_DOC_ID}) is None
+    await db.partners.insert_one({"id": "p1"})
+    assert (await stats.read())["partners"] == 1
+
+
+async def test_stale_counters_are_reconciled_in_the_background(db):
+    stats = DashboardStats(db, reconcile_seconds=60)
+    await stats.reconcile()
+    # A write made outside the API, which no delta accounts for
+    await db.subscribers.insert_one({"id": "s1", "email": "s@example.com", "active": True})
+    await db.dashboard_stats.update_one(
+        {"_id": STATS_DOC_ID}, {"$set": {"reconciled_at": datetime.now(timezone.utc) - timedelta(minutes=5)}}
+    )
+    assert (await stats.read())["subscribers"] == 0
+    await stats._reconciling
+    assert (await stats.read())["subscribers"] == 1
+
+
+async def test_admin_writes_keep_the_counters_exact(api, db, admin_headers):
+    assert (await api.get("/api/admin/dashboard/stats", headers=admin_headers)).json()["total_jobs"] == 0
+
+    job = (await api.post("/api/admin/jobs", json=JOB, headers=admin_headers)).json()
+    await api.post("/api/admin/jobs", json={**JOB, "active": False}, headers=admin_headers)
+    counters = await _assert_consistent(db)
+    assert (counters["total_jobs"], counters["active_jobs"]) == (2, 1)
+
+    response = await api.put(f"/api/admin/jobs/{job['id']}", json={**JOB, "active": False},
+                             headers=admin_headers)
+    assert response.status_code == 200
+    assert (await _assert_consistent(db))["active_jobs"] == 0
+
+    assert (await api.delete(f"/api/admin/jobs/{job['id']}", headers=admin_headers)).status_code == 200
+    assert (await _assert_consistent(db))["total_jobs"] == 1
+
+    contacts = [(await api.post("/api/contact", json=CONTACT)).json() for _ in range(3)]
+    await api.put(f"/api/admin/contacts/{contacts[0]['id']}/read", headers=admin_headers)
+    counters = await _assert_consistent(db)
+    assert (counters["total_contacts"], counters["unread_contacts"]) == (3, 2)
+
+    response = await api.post("/api/admin/contacts/bulk-delete",
+                              json={"ids": [c["id"] for c in contacts[:2]]}, headers=admin_headers)
+    assert response.status_code == 200
+    counters = await _assert_consistent(db)
+    assert (counters["total_contacts"], counters["unread_contacts"]) == (1, 1)
+
+    stats = await api.get("/api/admin/dashboard/stats", headers=admin_headers)
+    assert stats.json() == counters
+    assert server.dashboard_stats.db is db
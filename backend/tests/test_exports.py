@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import exports
+from exports import _csv_cell, _stream, date_range_query
+
+pytestmark = pytest.mark.anyio
+
+CONTACTS = [
+    {"id": "bson", "name": "Ada", "email": "ada@example.com", "company": "Analytical", "message": "Hi",
+     "timestamp": datetime(2024, 5, 2, 12), "read": False},
+    # Written by an older release with an ISO string timestamp
+    {"id": "string", "name": "Grace", "email": "grace@example.com", "company": "Navy", "message": "Hello",
+     "timestamp": "2024-05-03T09:00:00+00:00", "read": True},
+    {"id": "before", "name": "Alan", "email": "alan@example.com", "company": "NPL", "message": "Hey",
+     "timestamp": "2024-04-30T23:59:59+00:00", "read": False},
+    {"id": "after", "name": "Edsger", "email": "edsger@example.com", "company": "TU", "message": "Yo",
+     "timestamp": datetime(2024, 5, 10), "read": False},
+]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.parametrize("value, cell", [
+    ("=HYPERLINK(\"http://evil\")", "'=HYPERLINK(\"http://evil\")"),
+    ("+1 555", "'+1 555"),
+    ("-2+3", "'-2+3"),
+    ("@SUM(A1)", "'@SUM(A1)"),
+    ("\tindent", "'\tindent"),
+    ("plain text", "plain text"),
+    (["=a", "b"], "'=a; b"),
+    (True, "true"),
+    (None, ""),
+    (datetime(2024, 5, 2, 12), "2024-05-02T12:00:00+00:00"),
+])
+def test_csv_cells_neutralize_formulas(value, cell):
+    assert _csv_cell(value) == cell
+
+
+async def test_csv_export_escapes_cells_from_public_forms(api, db, admin_headers):
+    await db.contacts.insert_one({**CONTACTS[0], "name": "=cmd|' /C calc'!A0"})
+    response = await api.get("/api/admin/contacts/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"].startswith('attachment; filename="contacts_')
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "name", "email", "company", "message", "timestamp", "read"]
+    assert rows[1][1] == "'=cmd|' /C calc'!A0"
+    assert rows[1][5:] == ["2024-05-02T12:00:00+00:00", "false"]
+
+
+def test_date_range_query_matches_dates_and_strings():
+    since = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert date_range_query("timestamp", since, None) == {"$or": [
+        {"timestamp": {"$gte": since}},
+        {"timestamp": {"$gte": "2024-05-01T00:00:00+00:00"}},
+    ]}
+    assert date_range_query("timestamp", None, None) == {}
+
+
+async def test_date_range_selects_mixed_stored_values(db):
+    await db.contacts.insert_many([dict(doc) for doc in CONTACTS])
+    # A naive bound is taken as UTC
+    query = date_range_query("timestamp", datetime(2024, 5, 1), datetime(2024, 5, 5, tzinfo=timezone.utc))
+    found = await db.contacts.find(query, {"_id": 0, "id": 1}).to_list(10)
+    assert sorted(doc["id"] for doc in found) == ["bson", "string"]
+
+
+async def test_export_filters_by_range_over_http(api, db, admin_headers):
+    await db.contacts.insert_many([dict(doc) for doc in CONTACTS])
+    response = await api.get("/api/admin/contacts/export", headers=admin_headers,
+                             params={"format": "ndjson", "since": "2024-05-01T00:00:00Z", "until": "2024-05-05"})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    # Newest first, with BSON dates sorting after strings as in MongoDB
+    assert [row["id"] for row in rows] == ["bson", "string"]
+    assert rows[0]["timestamp"] == "2024-05-02T12:00:00+00:00"
+
+
+async def test_ndjson_streams_one_chunk_per_batch(monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    docs = [{"id": str(n), "extra": "dropped"} for n in range(5)]
+    chunks = [chunk async for chunk in _stream(_aiter(docs), ["id", "missing"], "ndjson")]
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": str(n), "missing": None} for n in range(5)]
+
+
+async def test_csv_streams_the_header_then_batches(monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    chunks = [chunk async for chunk in _stream(_aiter([{"id": str(n)} for n in range(3)]), ["id"], "csv")]
+    assert chunks == [b"id\r\n0\r\n1\r\n", b"2\r\n"]
+
+
+async def test_unknown_format_is_a_400(api, db, admin_headers):
+    response = await api.get("/api/admin/contacts/export", headers=admin_headers, params={"format": "xlsx"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "json"])
+def test_ndjson_dates_carry_their_utc_offset(monkeypatch, encoder):
+    if encoder == "json":
+        monkeypatch.setattr(exports, "orjson", None)
+    row = {"naive": datetime(2024, 5, 2, 12), "aware": datetime(2024, 5, 2, 14, tzinfo=timezone.utc)}
+    assert json.loads(exports._ndjson_line(row)) == {"naive": "2024-05-02T12:00:00+00:00",
+                                                     "aware": "2024-05-02T14:00:00+00:00"}
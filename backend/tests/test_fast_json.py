@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+import fast_json
+import server
+from fast_json import document_response, shape_documents
+
+pytestmark = pytest.mark.anyio
+
+CONTACTS = [
+    # As stored by the API: a BSON date, read back naive
+    {"id": "c1", "name": "Ada", "email": "ada@example.com", "company": "Analytical", "message": "Hi",
+     "timestamp": datetime(2024, 5, 1, 9, 30), "read": False},
+    # Written by an older release: ISO string timestamp, no read flag, a stray field
+    {"id": "c2", "name": "Grace", "email": "grace@example.com", "company": "Navy", "message": "Hello",
+     "timestamp": "2024-05-02T10:00:00+00:00", "legacy": 1},
+    {"id": "c3", "name": "Alan", "email": "alan@example.com", "company": "NPL", "message": "Hey",
+     "timestamp": datetime(2024, 5, 3, 8, tzinfo=timezone.utc), "read": True},
+]
+
+POST = {"id": "p1", "slug": "p1", "title": "Post", "excerpt": "Short", "content": "Long", "image": "cover.png",
+        "author": "Ada", "category": "AI", "readTime": "3 min"}
+
+
+def _standard(model, docs) -> list:
+    """What FastAPI returns for response_model=List[model]: validated, then dumped by alias."""
+    adapter = TypeAdapter(List[model])
+    return json.loads(adapter.dump_json(adapter.validate_python(docs), by_alias=True))
+
+
+def _body(response) -> list:
+    return json.loads(response.body)
+
+
+@pytest.fixture(params=["orjson", "fallback"])
+def fast(request, monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON", True)
+    if request.param == "fallback":
+        monkeypatch.setattr(fast_json, "orjson", None)
+
+
+@pytest.mark.parametrize("model, docs", [(server.ContactForm, CONTACTS), (server.BlogPost, [POST])])
+def test_fast_path_matches_the_validated_output(fast, model, docs):
+    assert _body(document_response(model, docs)) == _standard(model, docs)
+
+
+def test_stored_ids_and_unknown_keys_are_dropped(fast):
+    body = _body(document_response(server.ContactForm, [{**CONTACTS[0], "_id": ObjectId()}]))
+    assert set(body[0]) == set(server.ContactForm.model_fields)
+
+
+def test_missing_defaults_are_filled_per_document():
+    shaped = shape_documents(server.BlogPost, [POST, {**POST, "id": "p2"}])
+    assert shaped[0]["tags"] == []
+    assert shaped[0]["tags"] is not shaped[1]["tags"]
+    assert shaped[0]["image"] == "cover.png"
+    assert "featured_image" not in shaped[0]
+
+
+def test_fields_select_response_keys_even_with_fast_json_off():
+    assert not fast_json.FAST_JSON
+    assert document_response(server.ContactForm, CONTACTS) is CONTACTS
+
+    body = _body(document_response(server.ContactForm, CONTACTS, fields=("id", "timestamp")))
+    assert body == [{key: doc[key] for key in ("id", "timestamp")} for doc in _standard(server.ContactForm, CONTACTS)]
+    body = _body(document_response(server.BlogPost, [POST], fields=("id", "image")))
+    assert body == [{"id": "p1", "image": "cover.png"}]
+
+
+async def test_routes_serve_the_same_json_either_way(api, db, admin_headers, monkeypatch):
+    await db.contacts.insert_many([dict(doc) for doc in CONTACTS])
+    standard = await api.get("/api/admin/contacts", headers=admin_headers)
+    monkeypatch.setattr(fast_json, "FAST_JSON", True)
+    fast = await api.get("/api/admin/contacts", headers=admin_headers)
+    assert fast.status_code == standard.status_code == 200
+    assert fast.json() == standard.json()
+    assert fast.headers["x-total-count"] == standard.headers["x-total-count"]
@@ -0,0 +1,140 @@
+import pytest
+
+import server
+from caching import ContentVersions, etag_matches, make_etag
+
+pytestmark = pytest.mark.anyio
+
+PARTNER = {"id": "p1", "name": "Acme", "logo_url": "https://example.com/acme.png", "priority": 1}
+
+
+@pytest.fixture
+def handler_calls(monkeypatch):
+    """Records the collections read through cached_find by route handlers."""
+    calls = []
+    original = server.cached_find
+
+    async def recording(collection, *args, **kwargs):
+        calls.append(collection)
+        return await original(collection, *args, **kwargs)
+
+    monkeypatch.setattr(server, "cached_find", recording)
+    return calls
+
+
+def test_etag_depends_on_route_versions_and_build():
+    assert make_etag("/api/team?", (1, 2)) == make_etag("/api/team?", (1, 2))
+    assert make_etag("/api/team?", (1, 2)) != make_etag("/api/team?", (1, 3))
+    assert make_etag("/api/team?", (1,)) != make_etag("/api/partners?", (1,))
+    assert make_etag("/api/team?", (1,), "build-a") != make_etag("/api/team?", (1,), "build-b")
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"zzz", "abc"', True),
+    ("*", True),
+    ('"zzz"', False),
+    ("", False),
+])
+def test_etag_matching_is_weak(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+async def test_revalidation_is_answered_without_the_handler(api, db, handler_calls):
+    await db.partners.insert_one(dict(PARTNER))
+    first = await api.get("/api/partners")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=300, stale-while-revalidate=3600"
+    etag = first.headers["etag"]
+
+    server.http_body_cache.clear()
+    handler_calls.clear()
+    revalidated = await api.get("/api/partners", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+    assert handler_calls == []
+
+
+async def test_a_new_build_invalidates_validators_and_cached_bodies(api, db, handler_calls, monkeypatch):
+    await db.partners.insert_one(dict(PARTNER))
+    etag = (await api.get("/api/partners")).headers["etag"]
+
+    monkeypatch.setattr(server, "BUILD_ID", "next-deploy")
+    handler_calls.clear()
+    response = await api.get("/api/partners", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert handler_calls == ["partners"]
+
+
+async def test_repeat_requests_are_served_from_the_body_cache(api, db, handler_calls):
+    await db.partners.insert_one(dict(PARTNER))
+    first = await api.get("/api/partners")
+    second = await api.get("/api/partners")
+    assert second.content == first.content
+    assert handler_calls == ["partners"]
+
+
+async def test_admin_write_changes_validators(api, db, admin_headers):
+    first = await api.get("/api/partners")
+    assert first.json() == []
+    assert "last-modified" not in first.headers
+
+    created = await api.post("/api/admin/partners", json={"name": "Acme", "logo_url": "https://example.com/a.png"},
+                             headers=admin_headers)
+    assert created.status_code == 200
+    after = await api.get("/api/partners", headers={"If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200
+    assert [partner["name"] for partner in after.json()] == ["Acme"]
+    assert after.headers["etag"] != first.headers["etag"]
+
+    unchanged = await api.get("/api/partners", headers={"If-Modified-Since": after.headers["last-modified"]})
+    assert unchanged.status_code == 304
+
+
+async def test_validators_survive_a_restart(api, db):
+    await server.content_versions.bump("partners")
+    etag = (await api.get("/api/partners")).headers["etag"]
+    # A new worker: no local versions and no cached bodies
+    server.content_versions.clear()
+    server.http_body_cache.clear()
+    assert (await api.get("/api/partners", headers={"If-None-Match": etag})).status_code == 304
+
+
+async def test_writes_on_another_worker_are_noticed(api, db, monkeypatch):
+    await db.partners.insert_one(dict(PARTNER))
+    monkeypatch.setattr(server.content_versions, "refresh_seconds", 0)
+    first = await api.get("/api/partners")
+
+    # Another worker edits the partner and bumps the persisted version
+    await db.partners.update_one({"id": "p1"}, {"$set": {"name": "Renamed"}})
+    await ContentVersions(db).bump("partners")
+
+    after = await api.get("/api/partners", headers={"If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()[0]["name"] == "Renamed"
+
+
+async def test_error_fallback_is_not_cached(api, db, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(server, "cached_find", failing)
+    fallback = await api.get("/api/partners")
+    assert fallback.status_code == 200
+    assert fallback.json() == []
+    assert fallback.headers["cache-control"] == "no-store"
+    assert "etag" not in fallback.headers
+    assert len(server.http_body_cache) == 0
+
+    monkeypatch.undo()
+    await db.partners.insert_one(dict(PARTNER))
+    assert [partner["id"] for partner in (await api.get("/api/partners")).json()] == ["p1"]
+
+
+async def test_uncached_routes_get_no_validators(api, db, admin_headers):
+    response = await api.get("/api/admin/partners", headers=admin_headers)
+    assert response.status_code == 200
+    assert "etag" not in response.headers
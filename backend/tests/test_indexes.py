@@ -0,0 +1,81 @@
+import pytest
+from pymongo.errors import OperationFailure
+
+from indexes import INDEX_REGISTRY, ROUTE_QUERIES, ensure_indexes, index_usage_report, plan_indexes, plan_stages
+from storage import MemoryClient
+
+pytestmark = pytest.mark.anyio
+
+COLLSCAN = {"stage": "COLLSCAN"}
+INDEXED = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "timestamp_id"}}
+
+
+class _ExplainingDatabase:
+    """Answers explain commands with the winning plan chosen by ``plan_for``."""
+
+    def __init__(self, plan_for):
+        self.plan_for = plan_for
+        self.commands = []
+
+    async def command(self, command):
+        self.commands.append(command)
+        plan = self.plan_for(command["explain"])
+        if isinstance(plan, Exception):
+            raise plan
+        return {"queryPlanner": {"winningPlan": plan}}
+
+
+def _by_route(report):
+    return {entry["route"]: entry for entry in report}
+
+
+def test_plan_helpers_walk_nested_stages():
+    plan = {"stage": "SORT_MERGE", "inputStages": [INDEXED, {"stage": "SHARDING_FILTER", "inputStage": COLLSCAN}]}
+    assert plan_stages(plan) == ["SORT_MERGE", "FETCH", "IXSCAN", "SHARDING_FILTER", "COLLSCAN"]
+    assert plan_indexes(plan) == ["timestamp_id"]
+
+
+async def test_report_flags_unexpected_collection_scans():
+    db = _ExplainingDatabase(lambda find: COLLSCAN if find["find"] in ("services", "contacts") else INDEXED)
+    report = _by_route(await index_usage_report(db))
+    assert len(report) == len(ROUTE_QUERIES)
+
+    # Listing a whole small collection is expected to scan it
+    services = report["GET /api/services"]
+    assert (services["collscan"], services["expected"]) == (True, True)
+    # A filtered lookup scanning, or a paginated list, is what the report exists to catch
+    by_id = report["GET /api/services/{service_id}"]
+    assert (by_id["collscan"], by_id["expected"]) == (True, False)
+    contacts = report["GET /api/admin/contacts"]
+    assert (contacts["collscan"], contacts["expected"]) == (True, False)
+
+    jobs = report["GET /api/jobs"]
+    assert (jobs["collscan"], jobs["stages"]) == (False, ["FETCH", "IXSCAN"])
+
+
+async def test_report_explains_with_sort_and_collation():
+    db = _ExplainingDatabase(lambda find: INDEXED)
+    await index_usage_report(db)
+    subscribe = next(c["explain"] for c in db.commands if c["explain"].get("collation"))
+    assert subscribe["find"] == "subscribers"
+    assert all(command["verbosity"] == "queryPlanner" for command in db.commands)
+    assert {"find": "contacts", "filter": {}, "sort": {"timestamp": -1, "id": -1}} in [c["explain"] for c in db.commands]
+
+
+async def test_failed_explains_are_reported_per_route():
+    report = await index_usage_report(MemoryClient()["test"])
+    assert all("not supported" in entry["error"] for entry in report)
+
+    db = _ExplainingDatabase(lambda find: OperationFailure("boom") if find["find"] == "jobs" else INDEXED)
+    report = await index_usage_report(db)
+    assert [entry["route"] for entry in report if "error" in entry] == [
+        query["route"] for query in ROUTE_QUERIES if query["collection"] == "jobs"]
+
+
+async def test_ensure_indexes_skips_an_index_it_cannot_build():
+    db = MemoryClient()["test"]
+    await db.subscribers.insert_many([{"id": "a", "email": "Ada@example.com"}, {"id": "b", "email": "ada@EXAMPLE.com"}])
+    created = await ensure_indexes(db)
+    assert "email_unique" not in created["subscribers"]
+    assert "subscribed_at_id" in created["subscribers"]
+    assert set(created) == set(INDEX_REGISTRY)
@@ -0,0 +1,105 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from metrics import Counter, Histogram, MetricsMiddleware, Registry, http_requests_total
+
+pytestmark = pytest.mark.anyio
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Metrics settings are read when server is imported, so each configuration
+# is checked in a fresh interpreter.
+PROBE = """
+import asyncio, json
+import httpx
+import server
+
+async def probe():
+    server.init_database()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await client.get("/api/services/s1")
+        results = {}
+        for name, headers in [("none", {}), ("wrong", {"Authorization": "Bearer wrong"}),
+                              ("right", {"Authorization": "Bearer scrape-token"})]:
+            response = await client.get("/metrics", headers=headers)
+            results[name] = [response.status_code, response.headers.get("content-type"), response.text]
+        return results
+
+print(json.dumps(asyncio.run(probe())))
+"""
+
+
+def _probe(**settings) -> dict:
+    env = {**os.environ, "STORAGE_BACKEND": "memory", "UPLOAD_BACKEND": "local", "METRICS_ENABLED": "true",
+           "METRICS_TOKEN": "", "METRICS_ALLOW_ANONYMOUS": "false", **settings}
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND, env=env, capture_output=True, text=True,
+                            check=True, timeout=60).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_metrics_require_the_token():
+    results = _probe(METRICS_TOKEN="scrape-token")
+    assert results["none"][0] == 401
+    assert results["wrong"][0] == 401
+    status, content_type, body = results["right"]
+    assert status == 200
+    assert content_type == "text/plain; version=0.0.4; charset=utf-8"
+    assert 'http_requests_total{method="GET",route="/api/services/{service_id}",status="404"} 1' in body
+
+
+def test_metrics_are_off_without_a_token_unless_anonymous_is_allowed():
+    assert {name: result[0] for name, result in _probe().items()} == {"none": 404, "wrong": 404, "right": 404}
+    anonymous = _probe(METRICS_ALLOW_ANONYMOUS="true")
+    assert anonymous["none"][0] == 200
+    assert "# TYPE http_request_duration_seconds histogram" in anonymous["none"][2]
+
+
+async def test_disabled_metrics_serve_no_endpoint(api):
+    assert (await api.get("/metrics")).status_code == 404
+
+
+async def test_middleware_labels_requests_by_route_template():
+    async def item(request):
+        return PlainTextResponse("ok", status_code=201)
+
+    app = MetricsMiddleware(Starlette(routes=[Route("/items/{item_id}", item)]))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for item_id in ("a", "b"):
+            await client.get(f"/items/{item_id}")
+        await client.get("/nowhere")
+    rendered = "\n".join(http_requests_total.render())
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="201"} 2' in rendered
+    assert 'route="unmatched",status="404"' in rendered
+    assert "/items/a" not in rendered
+
+
+def test_histograms_render_cumulative_buckets():
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    errors = registry.register(Counter("errors_total", "Errors.", ("route",)))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, "/a")
+    errors.inc('/say "hi"')
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+        "# HELP errors_total Errors.",
+        "# TYPE errors_total counter",
+        'errors_total{route="/say \\"hi\\""} 1',
+    ]
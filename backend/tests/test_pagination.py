@@ -0,0 +1,155 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+
+import pagination
+from pagination import decode_cursor, encode_cursor, keyset_filter, paginate
+from storage import MemoryClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    datetime(2024, 5, 1, 12, 30),
+    "2024-05-01T12:30:00",
+    42,
+    None,
+])
+def test_cursor_round_trips_value_and_type(value):
+    decoded, doc_id = decode_cursor(encode_cursor(value, "doc-1"))
+    assert decoded == value
+    assert type(decoded) is type(value)
+    assert doc_id == "doc-1"
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("a" * 7, "id?&/")
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'{"v": 1}').decode(),
+    base64.urlsafe_b64encode(b'{"t": "d", "v": "yesterday", "id": "x"}').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_keyset_filter_after_null_stays_among_nulls():
+    assert keyset_filter("at", None, "m") == {"at": None, "id": {"$lt": "m"}}
+
+
+def test_keyset_filter_after_date_includes_lower_types():
+    date = datetime(2024, 1, 1)
+    assert keyset_filter("at", date, "m") == {"$or": [
+        {"at": {"$lt": date}},
+        {"at": date, "id": {"$lt": "m"}},
+        {"at": {"$type": "string"}},
+        {"at": None},
+    ]}
+
+
+def test_keyset_filter_after_string_skips_the_date_bracket():
+    clauses = keyset_filter("at", "2024-01-01", "m")["$or"]
+    assert {"at": {"$type": "string"}} not in clauses
+    assert clauses[-1] == {"at": None}
+
+
+async def _walk(collection, query, limit):
+    pages, after = [], None
+    while True:
+        response = Response()
+        docs = await paginate(collection, query, "at", limit, after, response)
+        pages.append((docs, dict(response.headers)))
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            return pages
+
+
+async def test_paginate_visits_mixed_type_rows_once_in_order():
+    collection = MemoryClient()["test"]["rows"]
+    base = datetime(2024, 1, 1)
+    docs = (
+        [{"id": f"d{i}", "at": base + timedelta(days=i % 3), "kind": "a"} for i in range(7)]
+        + [{"id": f"s{i}", "at": "2023-12-0" + str(i % 2 + 1), "kind": "b"} for i in range(3)]
+        + [{"id": "n1", "at": None, "kind": "a"}, {"id": "n2", "kind": "b"}]
+    )
+    await collection.insert_many([dict(doc) for doc in docs])
+    expected = await collection.find({}, {"_id": 0}).sort([("at", -1), ("id", -1)]).to_list(None)
+
+    pages = await _walk(collection, {}, 3)
+    seen = [doc["id"] for page, _ in pages for doc in page]
+    assert seen == [doc["id"] for doc in expected]
+    assert all(len(page) == 3 for page, _ in pages[:-1])
+    first_headers = pages[0][1]
+    assert first_headers["x-total-count"] == "12"
+    assert first_headers["x-total-count-estimated"] == "true"
+    assert all("x-total-count" not in headers for _, headers in pages[1:])
+
+
+async def test_paginate_filtered_counts_exactly_and_ends_without_cursor():
+    collection = MemoryClient()["test"]["rows"]
+    await collection.insert_many([{"id": f"r{i}", "at": i, "kind": "a" if i % 2 else "b"} for i in range(5)])
+    pages = await _walk(collection, {"kind": "a"}, 2)
+    assert [doc["id"] for page, _ in pages for doc in page] == ["r3", "r1"]
+    assert len(pages) == 1
+    assert pages[0][1]["x-total-count"] == "2"
+    assert pages[0][1]["x-total-count-estimated"] == "false"
+
+
+async def test_admin_contacts_page_through_cursor(api, db, admin_headers):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        await db.contacts.insert_one({"id": f"c{i}", "name": "N", "email": "n@example.com", "company": "Acme",
+                                      "message": "m", "timestamp": base + timedelta(hours=i), "read": i < 2})
+    first = await api.get("/api/admin/contacts", params={"limit": 2}, headers=admin_headers)
+    assert first.status_code == 200
+    assert [c["id"] for c in first.json()] == ["c4", "c3"]
+    assert first.headers["x-total-count"] == "5"
+    second = await api.get("/api/admin/contacts", params={"limit": 2, "after": first.headers["x-next-cursor"]},
+                           headers=admin_headers)
+    assert [c["id"] for c in second.json()] == ["c2", "c1"]
+
+    unread = await api.get("/api/admin/contacts", params={"read": "false"}, headers=admin_headers)
+    assert [c["id"] for c in unread.json()] == ["c4", "c3", "c2"]
+    assert "x-next-cursor" not in unread.headers
+
+    bad = await api.get("/api/admin/contacts", params={"after": "garbage"}, headers=admin_headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    base64.urlsafe_b64encode(b'{"t": "d", "v": "2024-13-45", "id": "x"}').decode(),
+    base64.urlsafe_b64encode(b'{"t": "d", "v": 5, "id": "x"}').decode(),
+])
+async def test_admin_lists_reject_undecodable_cursors(api, db, admin_headers, cursor):
+    for path in ("/api/admin/contacts", "/api/admin/subscribers", "/api/admin/job-applications"):
+        response = await api.get(path, params={"after": cursor}, headers=admin_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+async def test_admin_list_totals_are_flagged_estimated_past_the_count_limit(api, db, admin_headers, monkeypatch):
+    monkeypatch.setattr(pagination, "PAGINATION_COUNT_LIMIT", 3)
+    await db.contacts.insert_many([{"id": f"c{i}", "name": "N", "email": "n@example.com", "company": "Acme",
+                                    "message": "m", "timestamp": datetime(2024, 1, 1 + i), "read": i < 2}
+                                   for i in range(6)])
+    unread = await api.get("/api/admin/contacts", params={"read": "false", "limit": 1}, headers=admin_headers)
+    assert (unread.headers["x-total-count"], unread.headers["x-total-count-estimated"]) == ("3", "true")
+
+    read = await api.get("/api/admin/contacts", params={"read": "true"}, headers=admin_headers)
+    assert (read.headers["x-total-count"], read.headers["x-total-count-estimated"]) == ("2", "false")
+
+    # Unfiltered totals come from the collection metadata and are always estimates
+    everything = await api.get("/api/admin/contacts", headers=admin_headers)
+    assert (everything.headers["x-total-count"], everything.headers["x-total-count-estimated"]) == ("6", "true")
@@ -0,0 +1,108 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from profiling import MongoProfileListener, ProfileStore, ProfilingMiddleware, top_functions
+
+pytestmark = pytest.mark.anyio
+
+PROFILE = {"X-Profile": "1"}
+
+
+async def _allow(scope):
+    return True
+
+
+async def _deny(scope):
+    return False
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+
+class _GatedApp:
+    """Answers once ``gate`` is set, so requests can be held in flight together."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope, receive, send):
+        self.started += 1
+        await self.gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def test_only_one_request_is_profiled_at_a_time():
+    app, store = _GatedApp(), ProfileStore()
+    middleware = ProfilingMiddleware(app, store, _allow)
+    async with _client(middleware) as client:
+        requests = [asyncio.ensure_future(client.get(f"/item/{n}", headers=PROFILE)) for n in range(3)]
+        while app.started < 3:
+            await asyncio.sleep(0)
+        app.gate.set()
+        responses = await asyncio.gather(*requests)
+
+    profiled = [response for response in responses if "x-profile-id" in response.headers]
+    assert len(profiled) == 1
+    assert [summary["id"] for summary in store.summaries()] == [profiled[0].headers["x-profile-id"]]
+    # The slot is free again once the profiled request has finished
+    async with _client(middleware) as client:
+        assert "x-profile-id" in (await client.get("/again", headers=PROFILE)).headers
+    assert len(store.summaries()) == 2
+
+
+async def test_the_header_needs_an_authorized_request():
+    store = ProfileStore()
+    async with _client(ProfilingMiddleware(_ok, store, _deny)) as client:
+        response = await client.get("/item", headers=PROFILE)
+    assert response.status_code == 204
+    assert "x-profile-id" not in response.headers
+    async with _client(ProfilingMiddleware(_ok, store, _allow)) as client:
+        assert "x-profile-id" not in (await client.get("/item", headers={"X-Profile": "0"})).headers
+    assert store.summaries() == []
+
+
+async def test_sampled_profiles_record_a_summary_and_stats():
+    store = ProfileStore()
+    async with _client(ProfilingMiddleware(_ok, store, _deny, sample_rate=1.0)) as client:
+        response = await client.get("/item?x=1")
+    summary, = store.summaries()
+    assert summary["id"] == response.headers["x-profile-id"]
+    assert (summary["trigger"], summary["method"], summary["path"], summary["status"]) == ("sample", "GET", "/item", 204)
+    assert summary["wall_ms"] >= summary["cpu_ms"] >= 0
+    _, stats_data = store.get(summary["id"])
+    assert top_functions(stats_data, limit=5)
+
+
+async def test_mongo_time_is_added_to_the_profiled_request():
+    listener = MongoProfileListener()
+
+    async def querying_app(scope, receive, send):
+        listener.succeeded(SimpleNamespace(duration_micros=1500))
+        listener.failed(SimpleNamespace(duration_micros=500))
+        await _ok(scope, receive, send)
+
+    store = ProfileStore()
+    async with _client(ProfilingMiddleware(querying_app, store, _allow)) as client:
+        await client.get("/item", headers=PROFILE)
+        await client.get("/unprofiled")
+    summary, = store.summaries()
+    assert (summary["mongo_commands"], summary["mongo_ms"]) == (2, 2.0)
+
+
+def test_the_store_keeps_the_newest_profiles():
+    store = ProfileStore(capacity=2)
+    for n in range(3):
+        store.add({"id": str(n)}, b"")
+    assert [summary["id"] for summary in store.summaries()] == ["2", "1"]
+    assert store.get("0") is None
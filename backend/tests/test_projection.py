@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+import server
+from projection import mongo_projection, select_fields
+
+pytestmark = pytest.mark.anyio
+
+SERVICE = {"id": "s1", "title": "Cloud", "description": "Migrations", "icon": "cloud", "capabilities": ["a"],
+           "tools": ["b"], "image": "cloud.png", "fullDescription": "Long form copy"}
+
+
+def test_fields_win_over_view_and_always_keep_the_id():
+    assert select_fields(server.BlogPost, "title, image,title", "summary") == ("id", "title", "image")
+    assert select_fields(server.BlogPost, None, None) is None
+    assert select_fields(server.BlogPost, None, "full") is None
+
+
+def test_summary_defaults_to_every_field():
+    assert select_fields(server.Service, None, "summary", ("title",)) == ("id", "title")
+    assert select_fields(server.Subscriber, None, "summary") == tuple(server.Subscriber.model_fields)
+
+
+@pytest.mark.parametrize("fields, view", [("title,nope", None), (None, "compact")])
+def test_unknown_fields_and_views_are_rejected(fields, view):
+    with pytest.raises(HTTPException) as error:
+        select_fields(server.Service, fields, view)
+    assert error.value.status_code == 400
+
+
+def test_aliased_fields_load_under_both_names():
+    assert mongo_projection(server.BlogPost, ("id", "image"), "published_date") == {
+        "_id": 0, "id": 1, "image": 1, "featured_image": 1, "published_date": 1}
+    assert mongo_projection(server.BlogPost, None) == {"_id": 0}
+
+
+async def test_unknown_fields_are_a_400(api, db):
+    response = await api.get("/api/services", params={"fields": "title,secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unknown field(s): secret. Available: ")
+    assert (await api.get("/api/services", params={"view": "tiny"})).status_code == 400
+
+
+async def test_summary_view_serves_the_list_page_fields(api, db):
+    await db.services.insert_one(dict(SERVICE))
+    response = await api.get("/api/services", params={"view": "summary"})
+    assert response.status_code == 200
+    assert response.json() == [{key: SERVICE[key] for key in server.SUMMARY_FIELDS[server.Service]}]
+
+    full = (await api.get("/api/services")).json()[0]
+    assert full["fullDescription"] == "Long form copy"
+    assert (await api.get("/api/services", params={"fields": "title"})).json() == [{"id": "s1", "title": "Cloud"}]
+
+
+async def test_summary_view_of_default_content(api, db):
+    posts = (await api.get("/api/blog", params={"view": "summary"})).json()
+    assert posts
+    assert all(list(post) == list(server.SUMMARY_FIELDS[server.BlogPost]) for post in posts)
@@ -0,0 +1,80 @@
+import pytest
+
+import caching
+import server
+from caching import ResponseCache, query_key
+
+pytestmark = pytest.mark.anyio
+
+MEMBER = {"id": "m1", "name": "Ada", "position": "CTO", "bio": "", "image": "ada.png"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache(ttl=10)
+    cache.set("team", "all", ["a"])
+    cache.set("team", "short", ["b"], ttl=1)
+    clock[0] += 5
+    assert cache.get("team", "all") == ["a"]
+    assert cache.get("team", "short") is None
+    clock[0] += 5
+    assert cache.get("team", "all") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.set("team", "a", 1)
+    cache.set("team", "b", 2)
+    cache.get("team", "a")
+    cache.set("team", "c", 3)
+    assert cache.get("team", "b") is None
+    assert (cache.get("team", "a"), cache.get("team", "c")) == (1, 3)
+
+
+def test_invalidate_drops_only_that_collection():
+    cache = ResponseCache(ttl=60)
+    cache.set("team", "a", 1)
+    cache.set("team", "b", 2)
+    cache.set("partners", "a", 3)
+    cache.invalidate("team")
+    assert len(cache) == 1
+    assert cache.get("partners", "a") == 3
+
+
+def test_a_zero_ttl_disables_caching():
+    cache = ResponseCache(ttl=0)
+    cache.set("team", "a", 1)
+    assert len(cache) == 0
+
+
+def test_query_keys_ignore_dict_order():
+    assert query_key({"a": 1, "b": 2}, [("x", 1)], 10) == query_key({"b": 2, "a": 1}, [("x", 1)], 10)
+    assert query_key({"a": 1}, limit=10) != query_key({"a": 1}, limit=20)
+    assert query_key({}, projection={"_id": 0}) != query_key({})
+
+
+async def test_cached_find_reads_through_until_a_write(db):
+    await db.team_members.insert_one(dict(MEMBER))
+    first = await server.cached_find("team_members", {})
+    await db.team_members.update_one({"id": "m1"}, {"$set": {"name": "Changed behind the cache"}})
+    assert await server.cached_find("team_members", {}) == first
+
+    await server.invalidate_content("team_members")
+    assert (await server.cached_find("team_members", {}))[0]["name"] == "Changed behind the cache"
+
+
+async def test_admin_writes_invalidate_the_public_list(api, db, admin_headers):
+    await db.team_members.insert_one(dict(MEMBER))
+    assert (await api.get("/api/team")).json()[0]["name"] == "Ada"
+
+    edit = {key: value for key, value in MEMBER.items() if key != "id"}
+    response = await api.put("/api/admin/team/m1", headers=admin_headers, json={**edit, "name": "Ada Lovelace"})
+    assert response.status_code == 200
+    assert (await api.get("/api/team")).json()[0]["name"] == "Ada Lovelace"
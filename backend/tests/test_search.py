@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+import search
+import server
+from search import SearchIndex, make_snippet, rebuild_index, tokenize
+
+pytestmark = pytest.mark.anyio
+
+
+def _post(doc_id, title="", content="", **fields):
+    return {"id": doc_id, "slug": doc_id, "title": title, "content": content, **fields}
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("The Cloud-Native migration of a Data Platform") == ["cloud", "native", "migration",
+                                                                          "data", "platform"]
+
+
+def test_weighted_field_outranks_body_mention():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("body", "Quarterly update", "we moved everything to kubernetes"))
+    index.index_document("blog_posts", _post("title", "Kubernetes in practice", "lessons from the field"))
+    total, results = index.search("kubernetes")
+    assert total == 2
+    assert _ids(results) == ["title", "body"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_rare_terms_weigh_more_than_common_ones():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("common", content="cloud cloud"))
+    index.index_document("blog_posts", _post("rare", content="terraform"))
+    for n in range(5):
+        index.index_document("blog_posts", _post(f"filler-{n}", content="cloud"))
+    _, results = index.search("cloud terraform")
+    assert results[0]["id"] == "rare"
+
+
+def test_shorter_documents_rank_higher_for_the_same_frequency():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("short", content="observability"))
+    index.index_document("blog_posts", _post("long", content="observability " + "padding words " * 40))
+    assert _ids(index.search("observability")[1]) == ["short", "long"]
+
+
+def test_last_term_matches_as_a_prefix():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("p", content="serverless architecture"))
+    assert _ids(index.search("server")[1]) == ["p"]
+    # Only the last term expands, and short prefixes never do
+    assert index.search("server platform")[0] == 0
+    assert index.search("se")[0] == 0
+
+
+def test_types_restrict_results_and_limit_keeps_the_total():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("post", "Data platform"))
+    index.index_document("jobs", {"id": "job", "title": "Data engineer", "active": True})
+    index.index_document("jobs", {"id": "job-2", "title": "Data analyst", "active": True})
+    assert set(_ids(index.search("data", types=["job"])[1])) == {"job", "job-2"}
+    total, results = index.search("data", limit=1)
+    assert (total, len(results)) == (3, 1)
+
+
+def test_documents_that_stop_qualifying_are_removed():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("p", "Edge computing"))
+    index.index_document("jobs", {"id": "j", "title": "Edge engineer", "active": True})
+    index.index_document("blog_posts", _post("p", "Edge computing", published=False))
+    index.index_document("jobs", {"id": "j", "title": "Edge engineer", "active": False})
+    assert index.search("edge") == (0, [])
+    assert len(index) == 0
+
+
+def test_replacing_a_document_drops_its_old_terms():
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("p", "Legacy mainframe"))
+    index.index_document("blog_posts", _post("p", "Modern platform"))
+    assert index.search("mainframe")[0] == 0
+    assert _ids(index.search("modern")[1]) == ["p"]
+    index.remove_document("blog_posts", "p")
+    assert index.search("modern")[0] == 0
+
+
+def test_first_real_document_replaces_fallback_content():
+    index = SearchIndex()
+    index.replace_collection("services", [{"id": "default", "title": "Cloud consulting"}], fallback=True)
+    assert _ids(index.search("cloud")[1]) == ["default"]
+    index.index_document("services", {"id": "real", "title": "Cloud migration"})
+    assert _ids(index.search("cloud")[1]) == ["real"]
+
+
+def test_snippet_highlights_matched_terms():
+    snippet, highlights = make_snippet(["no match here", "Intro. We tuned Postgres and postgresql replicas."],
+                                       ["postgres"])
+    assert snippet == "Intro. We tuned Postgres and postgresql replicas."
+    assert [snippet[start:end] for start, end in highlights] == ["Postgres", "postgres"]
+
+
+async def test_rebuild_uses_fallbacks_only_for_empty_collections(db):
+    await db.blog_posts.insert_one(_post("draft", "Hidden draft", published=False))
+    fallbacks = {
+        "blog_posts": [_post("default-post", "Default post")],
+        "services": [{"id": "default-service", "title": "Default service"}],
+    }
+    index = SearchIndex()
+    await rebuild_index(index, db, fallbacks)
+    assert index.ready
+    # blog_posts holds a (hidden) document, so its defaults are not served
+    assert _ids(index.search("default")[1]) == ["default-service"]
+    assert index.search("hidden")[0] == 0
+
+
+async def test_search_endpoint_follows_admin_writes(api, admin_headers, monkeypatch):
+    monkeypatch.setattr(server, "search_index", SearchIndex())
+    job = {"title": "Site reliability engineer", "department": "Platform", "location": "Remote",
+           "type": "Full-time", "salary": "Competitive", "description": "Keep the lights on"}
+    created = (await api.post("/api/admin/jobs", json=job, headers=admin_headers)).json()
+
+    response = await api.get("/api/search", params={"q": "reliability", "type": "job"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["results"][0]["id"] == created["id"]
+    assert body["results"][0]["type"] == "job"
+
+    await api.delete(f"/api/admin/jobs/{created['id']}", headers=admin_headers)
+    assert (await api.get("/api/search", params={"q": "reliability", "type": "job"})).json()["total"] == 0
+
+    response = await api.get("/api/search", params={"q": "x", "type": "podcast"})
+    assert response.status_code == 400
+
+
+async def test_concurrent_rebuilds_share_one_load(db, monkeypatch):
+    loads = []
+    load_sources = search.load_sources
+
+    async def counting_load(*args):
+        loads.append(1)
+        return await load_sources(*args)
+
+    monkeypatch.setattr(search, "load_sources", counting_load)
+    index = SearchIndex()
+    await asyncio.gather(*(rebuild_index(index, db) for _ in range(5)))
+    assert len(loads) == 1
+    assert index.ready
+
+
+async def test_writes_during_a_rebuild_are_replayed(db, monkeypatch):
+    await db.blog_posts.insert_one(_post("stored", "Stored post"))
+    index = SearchIndex()
+    index.index_document("blog_posts", _post("gone", "Gone post"))
+    load_sources = search.load_sources
+
+    async def load_then_write(*args):
+        sources = await load_sources(*args)
+        # Admin writes landing while the new index is being built
+        index.index_document("blog_posts", _post("new", "New post"))
+        index.remove_document("blog_posts", "stored")
+        return sources
+
+    monkeypatch.setattr(search, "load_sources", load_then_write)
+    await rebuild_index(index, db)
+    assert _ids(index.search("post")[1]) == ["new"]
+
+
+async def test_stale_marks_during_a_rebuild_run_it_again(db, monkeypatch):
+    index = SearchIndex()
+    loads = []
+    load_sources = search.load_sources
+
+    async def load_once_stale(*args):
+        loads.append(1)
+        if len(loads) == 1:
+            index.stale = True
+        return await load_sources(*args)
+
+    monkeypatch.setattr(search, "load_sources", load_once_stale)
+    await rebuild_index(index, db)
+    assert len(loads) == 2
+    assert not index.stale
+
+
+async def test_truncated_collections_are_logged(db, monkeypatch, caplog):
+    monkeypatch.setattr(search, "SEARCH_MAX_DOCUMENTS", 2)
+    await db.blog_posts.insert_many([_post(f"p{n}", f"Post {n}") for n in range(3)])
+    index = SearchIndex()
+    await rebuild_index(index, db)
+    assert index.search("post")[0] == 2
+    assert "only the first 2 documents of blog_posts" in caplog.text
+
+
+async def test_other_workers_writes_mark_the_index_stale(db, monkeypatch):
+    monkeypatch.setattr(server, "search_index", SearchIndex())
+    server.on_content_changed("testimonials")
+    assert not server.search_index.stale
+    server.on_content_changed("jobs")
+    assert server.search_index.stale
@@ -0,0 +1,65 @@
+import pytest
+
+from dashboard_stats import DashboardStats
+from seeding import DATASETS, MOCK_SERVICES, SERVICE_CATALOG, SeedRefused, mock_content, seed_database
+
+pytestmark = pytest.mark.anyio
+
+
+def _plans(plans):
+    return {plan.seed.collection: plan for plan in plans}
+
+
+async def test_first_run_inserts_and_rerun_changes_nothing(db):
+    plans = _plans(await seed_database(db, mock_content()))
+    assert len(plans["services"].inserts) == len(MOCK_SERVICES)
+    application = await db.job_applications.find_one({"job_title": "Lead Cloud Architect"})
+    job = await db.jobs.find_one({"title": "Lead Cloud Architect"})
+    assert application["job_id"] == job["id"]
+
+    again = await seed_database(db, mock_content())
+    assert not any(plan.changed for plan in again)
+    assert (await DashboardStats(db).read())["services"] == len(MOCK_SERVICES)
+
+
+async def test_rerun_keeps_admin_edits_and_fills_missing_fields(db):
+    await seed_database(db, DATASETS["services"]())
+    await db.services.update_one({"id": "1"}, {"$set": {"title": "Edited by an admin"}, "$unset": {"icon": ""}})
+
+    services, = await seed_database(db, DATASETS["services"]())
+    assert services.updates == [(SERVICE_CATALOG[0], {"icon": SERVICE_CATALOG[0]["icon"]})]
+    assert services.kept == [(SERVICE_CATALOG[0], ["title"])]
+    stored = await db.services.find_one({"id": "1"})
+    assert (stored["title"], stored["icon"]) == ("Edited by an admin", SERVICE_CATALOG[0]["icon"])
+
+
+async def test_overwrite_resets_edited_fields(db):
+    await seed_database(db, DATASETS["services"]())
+    await db.services.update_one({"id": "1"}, {"$set": {"title": "Edited by an admin"}})
+
+    dry, = await seed_database(db, DATASETS["services"](), dry_run=True, overwrite=True)
+    assert dry.updates == [(SERVICE_CATALOG[0], {"title": SERVICE_CATALOG[0]["title"]})]
+    assert (await db.services.find_one({"id": "1"}))["title"] == "Edited by an admin"
+
+    await seed_database(db, DATASETS["services"](), overwrite=True)
+    assert (await db.services.find_one({"id": "1"}))["title"] == SERVICE_CATALOG[0]["title"]
+
+
+async def test_demo_content_is_refused_for_collections_with_other_data(db):
+    await db.partners.insert_one({"id": "real", "name": "A real partner"})
+    with pytest.raises(SeedRefused) as error:
+        await seed_database(db, mock_content())
+    assert error.value.collections == ["partners"]
+    # Refused before anything was written
+    assert await db.blog_posts.count_documents({}) == 0
+
+    await seed_database(db, mock_content(), force=True)
+    assert await db.partners.count_documents({}) == 3
+
+
+async def test_services_and_mock_datasets_share_one_key(db):
+    await seed_database(db, DATASETS["services"]() + mock_content())
+    assert await db.services.count_documents({}) == len(SERVICE_CATALOG) + len(MOCK_SERVICES)
+    plans = await seed_database(db, DATASETS["services"]() + mock_content())
+    assert not any(plan.changed for plan in plans)
+    assert await db.services.count_documents({}) == len(SERVICE_CATALOG) + len(MOCK_SERVICES)
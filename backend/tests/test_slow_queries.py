@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from slow_queries import SlowQueryRecorder, _shape_key, current_request, query_shape, redact
+
+pytestmark = pytest.mark.anyio
+
+_request_ids = itertools.count()
+
+INDEXED = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "email_unique"}}
+
+
+class _ExplainingDatabase:
+    def __init__(self):
+        self.explained = []
+
+    async def command(self, command):
+        self.explained.append(command["explain"])
+        return {"queryPlanner": {"winningPlan": INDEXED}}
+
+
+def _run(recorder, name, command, duration_ms, failure=None):
+    """Feed one command through the listener callbacks as the driver would."""
+    request_id = next(_request_ids)
+    recorder.started(SimpleNamespace(command_name=name, command=command, connection_id=("db", 27017),
+                                     request_id=request_id))
+    event = SimpleNamespace(command_name=name, connection_id=("db", 27017), request_id=request_id,
+                            duration_micros=int(duration_ms * 1000), failure=failure)
+    if failure is None:
+        recorder.succeeded(event)
+    else:
+        recorder.failed(event)
+
+
+def test_redaction_keeps_structure_but_no_values():
+    query = {"email": "ada@example.com", "$or": [{"age": {"$gt": 30}}, {"tags": {"$in": ["a", "b"]}}],
+             "ids": ["x", "y"]}
+    assert redact(query) == {"email": "?", "$or": [{"age": {"$gt": "?"}}, {"tags": {"$in": "?"}}], "ids": "?"}
+
+
+def test_shapes_redact_filters_and_summarize_writes():
+    find = {"find": "subscribers", "filter": {"email": "ada@example.com"}, "sort": {"subscribed_at": -1},
+            "limit": 10, "projection": {"_id": 0}, "lsid": {"id": "session"}}
+    assert query_shape("find", find) == {"filter": {"email": "?"}, "sort": {"subscribed_at": -1}, "limit": 10,
+                                         "projection": {"_id": 0}}
+
+    update = {"update": "contacts", "updates": [{"q": {"id": "c1"}, "u": {"$set": {"read": True}}, "multi": False},
+                                                {"q": {"id": "c2"}, "u": {"$set": {"read": True}}}]}
+    assert query_shape("update", update) == {"updates": [{"q": {"id": "?"}, "u": ["$set"], "multi": False}],
+                                             "statements": 2}
+
+    pipeline = {"aggregate": "jobs", "pipeline": [{"$match": {"department": "Data"}}, {"$limit": 5}]}
+    assert query_shape("aggregate", pipeline) == {"pipeline": [{"$match": {"department": "?"}}, {"$limit": 5}]}
+
+
+def test_shape_keys_ignore_page_size_and_field_selection():
+    first = query_shape("find", {"find": "blog_posts", "filter": {"id": "a"}, "limit": 10, "skip": 0,
+                                 "projection": {"_id": 0}})
+    second = query_shape("find", {"find": "blog_posts", "filter": {"id": "b"}, "limit": 50, "skip": 50,
+                                  "projection": {"title": 1}})
+    third = query_shape("find", {"find": "blog_posts", "filter": {"slug": "b"}})
+    assert _shape_key("blog_posts", "find", first) == _shape_key("blog_posts", "find", second)
+    assert _shape_key("blog_posts", "find", first) != _shape_key("blog_posts", "find", third)
+    assert _shape_key("blog_posts", "find", first) != _shape_key("jobs", "find", first)
+
+
+def test_only_slow_commands_are_recorded_with_their_route():
+    recorder = SlowQueryRecorder(threshold_ms=50, explain_seconds=0)
+    scope = {"type": "http", "method": "GET", "path": "/api/admin/subscribers",
+             "route": SimpleNamespace(path="/api/admin/subscribers")}
+    token = current_request.set(scope)
+    try:
+        _run(recorder, "find", {"find": "subscribers", "filter": {"email": "ada@example.com"}}, 10)
+        _run(recorder, "find", {"find": "subscribers", "filter": {"email": "grace@example.com"}}, 80)
+    finally:
+        current_request.reset(token)
+    _run(recorder, "insert", {"insert": "contacts", "documents": [{"id": 1}, {"id": 2}]}, 60)
+    _run(recorder, "delete", {"delete": "contacts", "deletes": [{"q": {"id": "c1"}, "limit": 1}]}, 70,
+         failure={"errmsg": "not primary"})
+    _run(recorder, "hello", {"hello": 1}, 500)
+
+    failed, insert, find = recorder.entries()
+    assert (find["collection"], find["command"], find["duration_ms"]) == ("subscribers", "find", 80)
+    assert find["route"] == "GET /api/admin/subscribers"
+    assert find["shape"] == {"filter": {"email": "?"}}
+    assert "grace" not in repr(recorder.entries())
+    assert (insert["documents"], insert["route"]) == (2, None)
+    assert failed["error"] == "not primary"
+    assert [entry["command"] for entry in recorder.entries(limit=1)] == ["delete"]
+
+
+def test_the_buffer_keeps_the_newest_entries():
+    recorder = SlowQueryRecorder(threshold_ms=0, capacity=2, explain_seconds=0)
+    for n in range(3):
+        _run(recorder, "find", {"find": f"c{n}", "filter": {}}, 1)
+    assert [entry["collection"] for entry in recorder.entries()] == ["c2", "c1"]
+
+
+async def test_each_shape_is_explained_once_and_shared():
+    recorder = SlowQueryRecorder(threshold_ms=0, explain_seconds=300)
+    db = _ExplainingDatabase()
+    recorder.start(db)
+    for email in ("ada@example.com", "grace@example.com"):
+        command = {"find": "subscribers", "filter": {"email": email}, "lsid": {"id": "s"}, "$db": "trine"}
+        await asyncio.to_thread(_run, recorder, "find", command, 5)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert db.explained == [{"find": "subscribers", "filter": {"email": "ada@example.com"}}]
+    plans = [entry["plan"] for entry in recorder.entries()]
+    assert plans == [{"stages": ["FETCH", "IXSCAN"], "indexes": ["email_unique"], "collscan": False}] * 2
+    recorder.stop()
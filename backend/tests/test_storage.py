@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo import IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from storage import MemoryClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def collection():
+    return MemoryClient()["test"]["items"]
+
+
+async def test_sort_orders_bson_types_like_mongo(collection):
+    date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await collection.insert_many([
+        {"id": "a", "at": "2024-06-01"},
+        {"id": "b", "at": date},
+        {"id": "c"},
+        {"id": "d", "at": None},
+    ])
+    docs = await collection.find({}, {"_id": 0, "id": 1}).sort([("at", -1), ("id", -1)]).to_list(None)
+    # Dates sort above strings, which sort above null/missing
+    assert [doc["id"] for doc in docs] == ["b", "a", "d", "c"]
+
+
+async def test_partial_unique_index_is_enforced(collection):
+    await collection.create_indexes([
+        IndexModel([("slug", 1)], unique=True, partialFilterExpression={"slug": {"$type": "string"}}),
+    ])
+    await collection.insert_one({"id": "1", "slug": "hello"})
+    await collection.insert_one({"id": "2", "slug": None})
+    await collection.insert_one({"id": "3", "slug": None})
+    with pytest.raises(DuplicateKeyError):
+        await collection.insert_one({"id": "4", "slug": "hello"})
+    with pytest.raises(DuplicateKeyError):
+        await collection.update_one({"id": "2"}, {"$set": {"slug": "hello"}})
+    assert await collection.count_documents({}) == 3
+
+
+async def test_upsert_seeds_equality_fields_and_set_on_insert(collection):
+    update = {"$set": {"active": True}, "$setOnInsert": {"id": "new"}, "$inc": {"hits": 1}}
+    await collection.update_one({"email": "a@example.com"}, update, upsert=True)
+    await collection.update_one({"email": "a@example.com"}, update, upsert=True)
+    doc = await collection.find_one({"email": "a@example.com"}, {"_id": 0})
+    assert doc == {"email": "a@example.com", "active": True, "id": "new", "hits": 2}
+
+
+async def test_find_one_and_update_returns_projected_document(collection):
+    await collection.insert_one({"id": "1", "title": "Old", "body": "text"})
+    before = await collection.find_one_and_update({"id": "1"}, {"$set": {"title": "New"}}, projection={"_id": 0, "title": 1})
+    after = await collection.find_one_and_update({"id": "1"}, {"$set": {"title": "Newer"}}, projection={"_id": 0, "title": 1},
+                                                 return_document=ReturnDocument.AFTER)
+    assert before == {"title": "Old"}
+    assert after == {"title": "Newer"}
+    assert await collection.find_one_and_update({"id": "missing"}, {"$set": {"title": "x"}}) is None
+
+
+async def test_returned_documents_are_copies(collection):
+    await collection.insert_one({"id": "1", "tags": ["a"]})
+    doc = await collection.find_one({"id": "1"})
+    doc["tags"].append("b")
+    assert (await collection.find_one({"id": "1"}))["tags"] == ["a"]
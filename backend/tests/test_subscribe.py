@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+import server
+from dashboard_stats import DashboardStats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _subscribe(api, email):
+    return await api.post("/api/newsletter/subscribe", json={"email": email})
+
+
+async def _subscriber_count(api, admin_headers):
+    return (await api.get("/api/admin/dashboard/stats", headers=admin_headers)).json()["subscribers"]
+
+
+async def test_new_email_is_stored_normalized(api, db, admin_headers):
+    assert await _subscriber_count(api, admin_headers) == 0
+    response = await _subscribe(api, "  Ada@Example.COM ")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["email"] == "ada@example.com"
+    assert body["active"] is True
+
+    stored = await db.subscribers.find_one({"email": "ada@example.com"}, {"_id": 0})
+    assert stored["id"] == body["id"]
+    assert await _subscriber_count(api, admin_headers) == 1
+
+
+async def test_active_duplicate_is_rejected_in_any_case(api, db):
+    assert (await _subscribe(api, "ada@example.com")).status_code == 200
+    response = await _subscribe(api, "ADA@example.com")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already subscribed"
+    assert await db.subscribers.count_documents({}) == 1
+
+
+async def test_inactive_subscriber_is_reactivated_in_place(api, db, admin_headers):
+    # Written by an older release: mixed case and a string timestamp
+    await db.subscribers.insert_one({"id": "legacy", "email": "Ada@Example.com",
+                                     "subscribed_at": "2024-01-01T00:00:00+00:00", "active": False})
+    before = await _subscriber_count(api, admin_headers)
+
+    response = await _subscribe(api, "ada@example.com")
+    assert response.status_code == 200
+    assert response.json()["id"] == "legacy"
+    assert response.json()["active"] is True
+
+    stored = await db.subscribers.find_one({"id": "legacy"})
+    assert stored["active"] is True
+    assert stored["email"] == "Ada@Example.com"
+    assert await db.subscribers.count_documents({}) == 1
+    assert await _subscriber_count(api, admin_headers) == before
+    assert (await _subscribe(api, "ada@example.com")).status_code == 400
+
+
+async def test_concurrent_subscribes_store_one_document(api, db):
+    responses = await asyncio.gather(*(_subscribe(api, "grace@example.com") for _ in range(5)))
+    assert sorted(response.status_code for response in responses) == [200, 400, 400, 400, 400]
+    assert await db.subscribers.count_documents({}) == 1
+    counters = await server.dashboard_stats.read()
+    assert counters["subscribers"] == (await DashboardStats(db).reconcile())["subscribers"] == 1
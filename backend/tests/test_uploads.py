@@ -0,0 +1,192 @@
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+import server
+from uploads import (
+    LocalUploadBackend, UploadBackend, UploadGuardMiddleware, check_upload_size, fail_stale_uploads, spool_upload,
+    upload_contents,
+)
+
+pytestmark = pytest.mark.anyio
+
+RESUME_FORM = {"job_id": "job-1", "job_title": "Engineer", "name": "Ada Lovelace", "email": "ada@example.com",
+               "phone": "555-0100"}
+
+
+def _upload(data: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=size, filename="file.pdf",
+                      headers=Headers({"content-type": "application/pdf"}))
+
+
+async def _echo_app(scope, receive, send):
+    """Reads the whole body and answers with its length."""
+    received = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise RuntimeError("client disconnected")
+        received += len(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(received).encode()})
+
+
+async def _call(middleware, chunks, content_length=None):
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "method": "POST", "path": "/upload", "headers": headers}
+    pending = list(chunks)
+    messages = []
+
+    async def receive():
+        body = pending.pop(0) if pending else b""
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+
+async def test_guard_rejects_by_content_length_without_reading():
+    read = False
+
+    async def app(scope, receive, send):
+        nonlocal read
+        read = True
+
+    guard = UploadGuardMiddleware(app, {"/upload": 100})
+    status, _ = await _call(guard, [b"x" * 200], content_length=200)
+    assert status == 413
+    assert not read
+    assert guard.inflight == 0
+
+
+async def test_guard_counts_streamed_bodies():
+    guard = UploadGuardMiddleware(_echo_app, {"/upload": 100})
+    assert await _call(guard, [b"x" * 60, b"x" * 30]) == (200, b"90")
+
+    status, body = await _call(guard, [b"x" * 60, b"x" * 60, b"x" * 60])
+    assert status == 413
+    assert b"File size must be less than" in body
+    assert guard.inflight == 0
+
+
+async def test_guard_caps_bytes_in_flight():
+    guard = UploadGuardMiddleware(_echo_app, {"/upload": 100}, max_inflight=150)
+    guard.inflight = 100
+    status, _ = await _call(guard, [b"x" * 80], content_length=80)
+    assert status == 503
+    assert await _call(guard, [b"x" * 40], content_length=40) == (200, b"40")
+    assert guard.inflight == 100
+
+
+def test_check_upload_size_falls_back_to_the_file_length():
+    check_upload_size(_upload(b"x" * 10), 10)
+    with pytest.raises(HTTPException) as error:
+        check_upload_size(_upload(b"x" * 11), 10)
+    assert error.value.status_code == 413
+    # A reported size is trusted as is
+    with pytest.raises(HTTPException):
+        check_upload_size(_upload(b"x", size=2 * 1024 * 1024), 1024 * 1024)
+
+
+async def test_contents_are_rewound_and_spools_are_copies():
+    upload = _upload(b"resume bytes")
+    upload.file.read()
+    assert upload_contents(upload, 100).read() == b"resume bytes"
+
+    spooled = await spool_upload(upload, 100)
+    upload.file.close()
+    assert spooled.read() == b"resume bytes"
+    spooled.close()
+
+
+async def test_oversized_resume_is_rejected_before_storing(api, db, monkeypatch):
+    monkeypatch.setattr(server, "RESUME_MAX_BYTES", 10)
+    response = await api.post("/api/jobs/apply", data=RESUME_FORM,
+                              files={"resume": ("cv.pdf", b"x" * 11, "application/pdf")})
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("File size must be less than")
+    assert await db.job_applications.count_documents({}) == 0
+
+
+async def test_resume_is_stored_in_sync_mode(api, db):
+    response = await api.post("/api/jobs/apply", data=RESUME_FORM,
+                              files={"resume": ("cv.pdf", b"%PDF resume", "application/pdf")})
+    assert response.status_code == 200
+    application = await db.job_applications.find_one({"id": response.json()["application_id"]})
+    assert application["resume_status"] == "uploaded"
+    stored = Path(server.upload_service.backend.root) / "resumes" / application["resume_url"].rsplit("/", 1)[1]
+    assert stored.read_bytes() == b"%PDF resume"
+
+
+async def test_resume_finishes_in_the_background_in_deferred_mode(api, db, monkeypatch):
+    monkeypatch.setattr(server.upload_service, "deferred", True)
+    response = await api.post("/api/jobs/apply", data=RESUME_FORM,
+                              files={"resume": ("cv.pdf", b"%PDF deferred", "application/pdf")})
+    assert response.status_code == 200
+    await asyncio.gather(*server.upload_service._background)
+    application = await db.job_applications.find_one({"id": response.json()["application_id"]})
+    assert application["resume_status"] == "uploaded"
+    assert not application["resume_url"].startswith("pending_upload:")
+
+
+async def test_deferred_image_upload_can_be_polled(api, admin_headers):
+    response = await api.post("/api/admin/upload-image", params={"defer": "true", "folder": "logos"},
+                              files={"file": ("logo.png", b"\x89PNG", "image/png")}, headers=admin_headers)
+    assert response.status_code == 202
+    upload_id = response.json()["upload_id"]
+
+    await asyncio.gather(*server.upload_service._background)
+    upload = (await api.get(f"/api/admin/uploads/{upload_id}", headers=admin_headers)).json()
+    assert upload["status"] == "uploaded"
+    assert upload["public_id"].startswith("logos/")
+
+
+async def test_stale_pending_uploads_are_failed(db):
+    now = datetime.now(timezone.utc)
+    old, recent = now - timedelta(hours=1), now - timedelta(seconds=30)
+    await db.uploads.insert_many([
+        {"id": "old", "status": "pending", "created_at": old},
+        {"id": "recent", "status": "pending", "created_at": recent},
+        {"id": "done", "status": "uploaded", "created_at": old},
+    ])
+    await db.job_applications.insert_many([
+        {"id": "old", "resume_status": "pending", "applied_at": old},
+        {"id": "recent", "resume_status": "pending", "applied_at": recent},
+    ])
+    assert await fail_stale_uploads(db, max_age_seconds=600) == (1, 1)
+    assert (await db.uploads.find_one({"id": "old"}))["status"] == "failed"
+    assert (await db.uploads.find_one({"id": "recent"}))["status"] == "pending"
+    assert (await db.uploads.find_one({"id": "done"}))["status"] == "uploaded"
+    assert (await db.job_applications.find_one({"id": "recent"}))["resume_status"] == "pending"
+    assert await fail_stale_uploads(db, max_age_seconds=600) == (0, 0)
+
+
+@pytest.mark.parametrize("folder", ["../outside", "logos/../../outside", "/etc", "", "logos//x", ".hidden", "a\\b"])
+async def test_image_folders_cannot_leave_the_upload_root(api, admin_headers, folder):
+    response = await api.post("/api/admin/upload-image", params={"folder": folder},
+                              files={"file": ("logo.png", b"\x89PNG", "image/png")}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid upload folder"
+
+
+def test_local_backend_refuses_paths_outside_its_root(tmp_path):
+    backend = LocalUploadBackend(str(tmp_path / "root"))
+    with pytest.raises(ValueError):
+        backend.upload(b"x", "../outside", "image")
+    assert not (tmp_path / "outside").exists()
+    assert backend.upload(b"x", "blog/covers", "image", "cover.png")["public_id"] == "blog/covers/cover.png"
+
+
+def test_upload_backends_must_implement_upload():
+    with pytest.raises(TypeError):
+        UploadBackend()
@@ -0,0 +1,338 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Dict, Optional, Set, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS', '4'))
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', str(5 * 1024 * 1024)))
+IMAGE_MAX_BYTES = int(os.environ.get('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+# Deferred uploads are copied out of the request so they outlive it; the copy
+# stays in memory up to this size and spills to a temp file beyond it
+UPLOAD_SPOOL_MAX_MEMORY = int(os.environ.get('UPLOAD_SPOOL_MAX_MEMORY', str(1024 * 1024)))
+# Cap on request bytes being received by upload routes across the process
+UPLOAD_MAX_INFLIGHT_BYTES = int(os.environ.get('UPLOAD_MAX_INFLIGHT_BYTES', str(64 * 1024 * 1024)))
+# Allowance for the non-file form fields in a multipart body
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# "sync" waits for the upload before responding; "deferred" stores the record
+# as pending and finishes the upload in the background.
+UPLOAD_MODE = os.environ.get('UPLOAD_MODE', 'sync').lower()
+# Deferred uploads still pending after this many seconds are assumed lost to a
+# crash or redeploy and marked failed at startup
+UPLOAD_STALE_SECONDS = int(os.environ.get('UPLOAD_STALE_SECONDS', '900'))
+
+# One folder path segment: no leading dot, so never "." or ".."
+_FOLDER_SEGMENT_RE = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]*$')
+
+
+def check_upload_folder(folder: str) -> str:
+    """Validate an upload folder taken from a request ("partners",
+    "blog/covers"): relative, made of letters, digits, "_", "-" and ".",
+    with no "." or ".." segments. Raises 400 otherwise."""
+    segments = folder.split("/")
+    if not all(_FOLDER_SEGMENT_RE.match(segment) for segment in segments):
+        raise HTTPException(status_code=400, detail="Invalid upload folder")
+    return folder
+
+
+class UploadBackend(ABC):
+    """Blocking upload backend. Called from the UploadService worker pool."""
+
+    name = "base"
+
+    @abstractmethod
+    def upload(self, data, folder: str, resource_type: str, public_id: Optional[str] = None) -> dict:
+        """Store ``data`` (bytes or a binary file object) and return a
+        Cloudinary-style result with at least ``secure_url`` and ``public_id``."""
+
+
+class CloudinaryUploadBackend(UploadBackend):
+    """Uploads to Cloudinary. The SDK is imported and configured on the first
+    upload, so processes that never upload don't pay for it at startup."""
+
+    name = "cloudinary"
+
+    def __init__(self, config: Dict[str, str]):
+        self.config = config
+        self._configured = False
+        self._lock = threading.Lock()
+
+    def _configure(self) -> None:
+        with self._lock:
+            if not self._configured:
+                import cloudinary
+
+                cloudinary.config(**self.config, secure=True)
+                self._configured = True
+
+    def upload(self, data, folder: str, resource_type: str, public_id: Optional[str] = None) -> dict:
+        if not self._configured:
+            self._configure()
+        import cloudinary.uploader
+
+        options = {"folder": folder, "resource_type": resource_type}
+        if public_id:
+            options["public_id"] = public_id
+        return cloudinary.uploader.upload(data, **options)
+
+
+class LocalUploadBackend(UploadBackend):
+    """Writes uploads under a local directory; stands in for Cloudinary in
+    tests and benchmarks."""
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: Optional[str] = None):
+        self.root = Path(root)
+        self.base_url = (base_url or self.root.resolve().as_uri()).rstrip("/")
+
+    def upload(self, data, folder: str, resource_type: str, public_id: Optional[str] = None) -> dict:
+        public_id = re.sub(r'[^A-Za-z0-9_.-]', '_', public_id or uuid.uuid4().hex).lstrip(".") or uuid.uuid4().hex
+        root = self.root.resolve()
+        target = (root / folder / public_id).resolve()
+        if not target.is_relative_to(root):
+            raise ValueError(f"Upload folder {folder!r} is outside the upload directory")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as out:
+            if isinstance(data, (bytes, bytearray)):
+                out.write(data)
+            else:
+                while True:
+                    chunk = data.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+        return {
+            "secure_url": f"{self.base_url}/{folder}/{public_id}",
+            "public_id": f"{folder}/{public_id}",
+            "format": target.suffix.lstrip(".") or None,
+            "width": None,
+            "height": None,
+            "bytes": target.stat().st_size,
+        }
+
+
+class UploadService:
+    """Runs blocking backend uploads on a bounded pool off the event loop."""
+
+    def __init__(self, backend: UploadBackend, max_workers: int = UPLOAD_WORKERS, mode: str = UPLOAD_MODE):
+        self.backend = backend
+        self.deferred = mode == "deferred"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+        self._background: Set[asyncio.Task] = set()
+
+    async def upload(self, data, folder: str, resource_type: str, public_id: Optional[str] = None) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: self.backend.upload(data, folder, resource_type, public_id)
+        )
+
+    def run_in_background(self, job: Awaitable) -> None:
+        """Schedule a deferred upload job, keeping a reference until it finishes."""
+        task = asyncio.ensure_future(job)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @property
+    def pending(self) -> int:
+        return len(self._background)
+
+    async def drain(self, timeout: float = 30) -> None:
+        """Wait for background uploads to finish (used on shutdown)."""
+        if self._background:
+            await asyncio.wait(list(self._background), timeout=timeout)
+        self._executor.shutdown(wait=False)
+
+
+async def fail_stale_uploads(db, max_age_seconds: int = UPLOAD_STALE_SECONDS) -> Tuple[int, int]:
+    """Mark deferred uploads pending for over ``max_age_seconds`` as failed.
+
+    Background jobs only live in the worker that accepted the upload, so a
+    crash or redeploy leaves their records pending for good; the bytes are
+    gone and the file has to be uploaded again. Called at startup. The age
+    cutoff spares uploads that other, still running workers are finishing.
+    Returns the (image uploads, resumes) marked failed.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    images = await db.uploads.update_many(
+        {"status": "pending", "created_at": {"$lt": cutoff}},
+        {"$set": {"status": "failed", "error": "Interrupted by a server restart"}},
+    )
+    resumes = await db.job_applications.update_many(
+        {"resume_status": "pending", "applied_at": {"$lt": cutoff}},
+        {"$set": {"resume_status": "failed"}},
+    )
+    if images.modified_count or resumes.modified_count:
+        logger.warning(f"Marked {images.modified_count} image upload(s) and {resumes.modified_count} "
+                       f"resume upload(s) left pending by a previous run as failed")
+    return images.modified_count, resumes.modified_count
+
+
+def build_upload_service(cloudinary_config: Optional[Dict[str, str]]) -> Optional[UploadService]:
+    """Pick the upload backend from UPLOAD_BACKEND (cloudinary or local).
+
+    ``cloudinary_config`` holds the cloud_name/api_key/api_secret settings, or
+    is None when Cloudinary is not configured. Returns None when no backend is available, in which case callers keep
+    their placeholder behaviour.
+    """
+    backend_name = os.environ.get('UPLOAD_BACKEND', 'cloudinary').lower()
+    if backend_name == "local":
+        backend = LocalUploadBackend(
+            os.environ.get('UPLOAD_LOCAL_DIR', str(Path(__file__).parent / 'uploads')),
+            os.environ.get('UPLOAD_LOCAL_BASE_URL'),
+        )
+    elif backend_name == "cloudinary" and cloudinary_config:
+        backend = CloudinaryUploadBackend(cloudinary_config)
+    else:
+        return None
+    logger.info(f"Upload backend: {backend.name} ({'deferred' if UPLOAD_MODE == 'deferred' else 'sync'} mode)")
+    return UploadService(backend)
+
+
+# ===================== STREAMING LIMITS =====================
+
+def _format_size(num_bytes: int) -> str:
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):g}MB"
+    return f"{num_bytes // 1024}KB"
+
+
+class UploadTooLarge(HTTPException):
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"File size must be less than {_format_size(limit)}")
+
+
+def check_upload_size(upload: UploadFile, max_bytes: int) -> None:
+    """Reject a parsed upload larger than ``max_bytes``. The multipart parser
+    counts each file's bytes as it spools them, within the body limit that
+    UploadGuardMiddleware enforced."""
+    size = upload.size
+    if size is None:
+        size = upload.file.seek(0, os.SEEK_END)
+    if size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+
+def upload_contents(upload: UploadFile, max_bytes: int):
+    """The upload's own spooled file, size-checked and rewound, for uploads
+    finished within the request. The framework closes it after the response."""
+    check_upload_size(upload, max_bytes)
+    upload.file.seek(0)
+    return upload.file
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int):
+    """Size-check an upload and copy it into a SpooledTemporaryFile owned by the
+    caller, for deferred uploads that outlive the request. The caller closes it."""
+    check_upload_size(upload, max_bytes)
+    await upload.seek(0)
+    spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+class UploadGuardMiddleware:
+    """Bounds request bodies on upload routes before the multipart parser runs.
+
+    Requests whose Content-Length exceeds the route limit are rejected with 413
+    without reading the body; bodies without one are counted as they stream
+    and aborted once they cross it. Bytes in flight across all upload
+    requests are capped at ``max_inflight`` (503 once exhausted).
+    """
+
+    def __init__(self, app, limits: Dict[str, int], max_inflight: int = UPLOAD_MAX_INFLIGHT_BYTES):
+        self.app = app
+        self.limits = limits
+        self.max_inflight = max_inflight
+        self.inflight = 0
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    pass
+                break
+        if content_length is not None and content_length > limit:
+            await self._reject(send, 413, UploadTooLarge(limit - MULTIPART_OVERHEAD_BYTES).detail)
+            return
+
+        reserved = content_length if content_length is not None else limit
+        if self.inflight + reserved > self.max_inflight:
+            await self._reject(send, 503, "Server is busy processing uploads, please retry shortly",
+                               [(b"retry-after", b"2")])
+            return
+        self.inflight += reserved
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Stop feeding the parser; the app sees a client disconnect
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded and not response_started:
+                # Replace whatever error the app produces with a 413
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        finally:
+            self.inflight -= reserved
+        if exceeded and not response_started:
+            await self._reject(send, 413, UploadTooLarge(limit - MULTIPART_OVERHEAD_BYTES).detail)
+
+    @staticmethod
+    async def _reject(send, status_code: int, detail: str, extra_headers=None):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status_code,
+                    "headers": headers + (extra_headers or [])})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,35 @@
+import { useState } from 'react';
+import { Loader2 } from 'lucide-react';
+
+/**
+ * LoadMoreButton - Fetches the next page of an admin list; hidden on the last page
+ */
+const LoadMoreButton = ({ nextCursor, onLoadMore, className = '' }) => {
+  const [loading, setLoading] = useState(false);
+
+  if (!nextCursor) return null;
+
+  const handleClick = async () => {
+    setLoading(true);
+    try {
+      await onLoadMore(nextCursor);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className={`flex justify-center ${className}`}>
+      <button
+        onClick={handleClick}
+        disabled={loading}
+        className="flex items-center space-x-2 px-6 py-3 rounded-xl border border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-800 hover:border-orange-500 transition-colors font-medium disabled:opacity-50"
+      >
+        {loading && <Loader2 className="w-4 h-4 animate-spin" />}
+        <span>{loading ? 'Loading...' : 'Load more'}</span>
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
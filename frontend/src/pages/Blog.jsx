@@ -22,7 +22,7 @@ const Blog = () => {
 
   const fetchBlogPosts = async () => {
     try {
-      const response = await axios.get(`${BACKEND_URL}/api/blog`);
+      const response = await axios.get(`${BACKEND_URL}/api/blog`, { params: { view: 'summary' } });
       setBlogPosts(response.data);
       setLoading(false);
     } catch (error) {
@@ -133,7 +133,7 @@ const BlogDetail = () => {
       
       try {
         setRelatedLoading(true);
-        const response = await axios.get(`${BACKEND_URL}/api/blog`);
+        const response = await axios.get(`${BACKEND_URL}/api/blog`, { params: { view: 'summary' } });
         const allPosts = response.data;
         const filtered = filterRelatedPosts(allPosts, post);
         setRelatedPosts(filtered);
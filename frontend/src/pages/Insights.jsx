@@ -68,7 +68,7 @@ const Insights = () => {
   useEffect(() => {
     const fetchBlogPosts = async () => {
       try {
-        const response = await axios.get(`${API}/blog`);
+        const response = await axios.get(`${API}/blog`, { params: { view: 'summary' } });
         const posts = response.data.length > 0 ? response.data : mockBlogPosts;
         setBlogPosts(posts);
         setFilteredPosts(posts);
@@ -4,6 +4,8 @@ import axios from 'axios';
 import { Plus, Edit2, Trash2, X, Save, Eye, EyeOff, Upload, Loader2, FileText, Calendar, User, Tag, Search, Filter } from 'lucide-react';
 import { toast } from 'sonner';
 import AdminLayout from './AdminLayout';
+import LoadMoreButton from '../../components/LoadMoreButton';
+import { fetchAdminPage } from '../../utils/adminPagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api/admin`;
@@ -16,6 +18,7 @@ const AdminBlog = () => {
   const [editingPost, setEditingPost] = useState(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [categoryFilter, setCategoryFilter] = useState('all');
+  const [nextCursor, setNextCursor] = useState(null);
   // Note: 'image' field in formData is mapped to 'featured_image' when submitting to the backend
   const [formData, setFormData] = useState({
     title: '',
@@ -43,12 +46,11 @@ const AdminBlog = () => {
     fetchPosts();
   }, [token, navigate]);
 
-  const fetchPosts = async () => {
+  const fetchPosts = async (after = null) => {
     try {
-      const response = await axios.get(`${API}/blog`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setPosts(response.data);
+      const page = await fetchAdminPage(`${API}/blog`, token, after);
+      setPosts(current => (after ? [...current, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
       setLoading(false);
     } catch (error) {
       console.error('Error fetching posts:', error);
@@ -418,6 +420,8 @@ const AdminBlog = () => {
           </div>
         )}
 
+        {!loading && <LoadMoreButton nextCursor={nextCursor} onLoadMore={fetchPosts} className="mt-8" />}
+
         {/* Modal */}
         {showModal && (
           <div className="fixed inset-0 bg-black/60 backdrop-blur-sm z-50 flex items-center justify-center p-4 animate-fade-in">
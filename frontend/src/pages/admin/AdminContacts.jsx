@@ -4,6 +4,8 @@ import axios from 'axios';
 import { Trash2, Mail, CheckCircle, Circle, Building2, Calendar } from 'lucide-react';
 import { toast } from 'sonner';
 import AdminLayout from './AdminLayout';
+import LoadMoreButton from '../../components/LoadMoreButton';
+import { fetchAdminPage } from '../../utils/adminPagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api/admin`;
@@ -13,6 +15,7 @@ const AdminContacts = () => {
   const [contacts, setContacts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedContact, setSelectedContact] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
 
   const token = localStorage.getItem('adminToken');
 
@@ -24,12 +27,11 @@ const AdminContacts = () => {
     fetchContacts();
   }, [token, navigate]);
 
-  const fetchContacts = async () => {
+  const fetchContacts = async (after = null) => {
     try {
-      const response = await axios.get(`${API}/contacts`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setContacts(response.data);
+      const page = await fetchAdminPage(`${API}/contacts`, token, after);
+      setContacts(current => (after ? [...current, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
       setLoading(false);
     } catch (error) {
       console.error('Error fetching contacts:', error);
@@ -145,6 +147,7 @@ const AdminContacts = () => {
                   <p className="text-sm text-gray-400 truncate mt-1">{contact.message}</p>
                 </div>
               ))}
+              <LoadMoreButton nextCursor={nextCursor} onLoadMore={fetchContacts} className="pt-2" />
             </div>
 
             {/* Message Detail */}
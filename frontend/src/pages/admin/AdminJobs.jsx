@@ -4,6 +4,8 @@ import axios from 'axios';
 import { Plus, Edit2, Trash2, X, Save, Eye, Briefcase, MapPin, Clock, DollarSign, Users, Search, Filter, CheckCircle, XCircle, FileText, Mail, Phone, ExternalLink, Download, Inbox, Target } from 'lucide-react';
 import { toast } from 'sonner';
 import AdminLayout from './AdminLayout';
+import LoadMoreButton from '../../components/LoadMoreButton';
+import { fetchAdminPage } from '../../utils/adminPagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 const API = `${BACKEND_URL}/api/admin`;
@@ -12,6 +14,7 @@ const AdminJobs = () => {
   const navigate = useNavigate();
   const [jobs, setJobs] = useState([]);
   const [applications, setApplications] = useState([]);
+  const [applicationsCursor, setApplicationsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
   const [showApplicationDetailModal, setShowApplicationDetailModal] = useState(false);
@@ -63,12 +66,11 @@ const AdminJobs = () => {
     }
   };
 
-  const fetchApplications = async () => {
+  const fetchApplications = async (after = null) => {
     try {
-      const response = await axios.get(`${API}/job-applications`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setApplications(response.data);
+      const page = await fetchAdminPage(`${API}/job-applications`, token, after);
+      setApplications(current => (after ? [...current, ...page.items] : page.items));
+      setApplicationsCursor(page.nextCursor);
     } catch (error) {
       console.error('Error fetching applications:', error);
       if (error.response?.status !== 401) {
@@ -701,6 +703,8 @@ const AdminJobs = () => {
                   <p className="text-gray-500 dark:text-gray-400">Applications will appear here once candidates apply for your job postings</p>
                 </div>
               )}
+
+              <LoadMoreButton nextCursor={applicationsCursor} onLoadMore={fetchApplications} />
             </div>
           </div>
         )}
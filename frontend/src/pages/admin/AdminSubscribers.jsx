@@ -1,9 +1,11 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { Trash2, Search, Mail, Copy, Check, Users } from 'lucide-react';
 import { toast } from 'sonner';
 import AdminLayout from './AdminLayout';
+import LoadMoreButton from '../../components/LoadMoreButton';
+import { fetchAdminPage } from '../../utils/adminPagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 const API = `${BACKEND_URL}/api/admin`;
@@ -14,15 +16,27 @@ const AdminSubscribers = () => {
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [copied, setCopied] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  // Set once a later page is loaded, so polling keeps those pages
+  const loadedMore = useRef(false);
 
   const token = localStorage.getItem('adminToken');
 
-  const fetchSubscribers = async () => {
+  const fetchSubscribers = async (after = null) => {
     try {
-      const response = await axios.get(`${API}/subscribers`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSubscribers(response.data);
+      const page = await fetchAdminPage(`${API}/subscribers`, token, after);
+      if (after) {
+        loadedMore.current = true;
+        setSubscribers(current => [...current, ...page.items]);
+        setNextCursor(page.nextCursor);
+      } else if (loadedMore.current) {
+        // Polling refreshes the first page in front of the pages loaded after it
+        const ids = new Set(page.items.map(sub => sub.id));
+        setSubscribers(current => [...page.items, ...current.filter(sub => !ids.has(sub.id))]);
+      } else {
+        setSubscribers(page.items);
+        setNextCursor(page.nextCursor);
+      }
       setLoading(false);
     } catch (error) {
       console.error('Error fetching subscribers:', error);
@@ -58,6 +72,7 @@ const AdminSubscribers = () => {
       await axios.delete(`${API}/subscribers/${id}`, {
         headers: { Authorization: `Bearer ${token}` }
       });
+      setSubscribers(current => current.filter(sub => sub.id !== id));
       toast.success('Subscriber removed successfully');
       fetchSubscribers();
     } catch (error) {
@@ -204,6 +219,8 @@ const AdminSubscribers = () => {
             </table>
           </div>
         </div>
+
+        {!loading && <LoadMoreButton nextCursor={nextCursor} onLoadMore={fetchSubscribers} className="mt-6" />}
       </div>
     </AdminLayout>
   );
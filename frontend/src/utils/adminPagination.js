@@ -0,0 +1,21 @@
+// Keyset pagination for the admin list endpoints
+import axios from 'axios';
+
+/**
+ * Fetches one page of an admin list endpoint
+ * @param {string} url - The list endpoint, e.g. `${API}/contacts`
+ * @param {string} token - The admin bearer token
+ * @param {string|null} after - Cursor of the page to fetch; null for the first page
+ * @returns {Promise<{items: Array, nextCursor: string|null}>} - The page, and the
+ *   cursor of the one after it (from X-Next-Cursor; null on the last page)
+ */
+export const fetchAdminPage = async (url, token, after = null) => {
+  const response = await axios.get(url, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: after ? { after } : undefined,
+  });
+  return {
+    items: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null,
+  };
+};